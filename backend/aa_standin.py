@@ -0,0 +1,482 @@
+"""
+Local stand-in for the AA (anumati-api) server.
+
+Serves every endpoint AAClient calls, from recorded fixtures and/or
+synthetic users (up to hundreds of thousands of transactions), with
+configurable latency, 5xx errors and 429s. Lets the client's caching,
+retries and fan-out be benchmarked and tested without Node, MongoDB or
+network access.
+
+Usage:
+    # Synthetic users, 100k transactions each, 20 ms latency, 2% errors, 1% 429s
+    python aa_standin.py --port 5001 --users 3 --transactions 100000 \\
+        --latency-ms 20 --error-rate 0.02 --rate-limit-rate 0.01
+
+    # Record responses from a real AA server, then replay them offline
+    python aa_standin.py --record data/aa_fixtures --upstream http://localhost:5000
+    python aa_standin.py --replay data/aa_fixtures
+
+Point the backend at it with AA_BASE_URL=http://127.0.0.1:5001.
+
+In-process use (benchmarks, test scripts):
+    with AAStandIn(SyntheticAAData(users=1, transactions=100_000), latency_ms=5) as server:
+        client = AAClient(base_url=server.base_url)
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+import httpx
+
+# Expense categories -> merchants used for synthetic transactions
+CATEGORY_MERCHANTS = {
+    "Food & Dining": ["Swiggy", "Zomato", "Cafe Coffee Day", "Starbucks", "Domino's"],
+    "Groceries": ["BigBasket", "Blinkit", "DMart", "Zepto"],
+    "Shopping": ["Amazon", "Flipkart", "Myntra", "Ajio"],
+    "Transport": ["Uber", "Ola", "Rapido", "IndianOil", "Mumbai Metro"],
+    "Utilities": ["Adani Electricity", "Airtel", "Jio", "Mahanagar Gas"],
+    "Entertainment": ["Netflix", "BookMyShow", "Spotify", "Hotstar"],
+    "Health": ["Apollo Pharmacy", "1mg", "Practo"],
+    "Rent": ["Landlord Transfer"],
+}
+CREDIT_SOURCES = {"Salary": ["Employer Payroll"], "Transfer": ["UPI Transfer", "NEFT Transfer"]}
+MODES = ["UPI", "CARD", "NETBANKING", "NEFT", "IMPS"]
+
+
+def _json_body(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _fixture_name(path: str, params: Dict[str, str]) -> str:
+    canonical = json.dumps(sorted(params.items()))
+    digest = hashlib.blake2b(canonical.encode(), digest_size=10).hexdigest()
+    return f"{re.sub(r'[^A-Za-z0-9]+', '_', path).strip('_')}-{digest}.json"
+
+
+# -------------------------------
+# DATA SOURCES
+# -------------------------------
+
+class SyntheticAAData:
+    """
+    Deterministic synthetic users in the AA API's response shapes
+    """
+
+    def __init__(self, users: int = 3, transactions: int = 2000, days: int = 365, seed: int = 42):
+        """
+        Args:
+            users: Number of users (ids "synthetic-user-0", ...)
+            transactions: Transactions per user
+            days: History covered by the transactions, ending today
+            seed: Random seed; the same seed yields the same data
+        """
+        self.user_ids = [f"synthetic-user-{i}" for i in range(users)]
+        self.transactions_per_user = transactions
+        self.days = days
+        self.seed = seed
+        self._transactions: Dict[str, Tuple[List[str], List[Dict[str, Any]]]] = {}
+        self._windows: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, user_id: str, salt: str) -> random.Random:
+        return random.Random(f"{self.seed}:{user_id}:{salt}")
+
+    def _accounts(self, user_id: str) -> List[Dict[str, Any]]:
+        rng = self._rng(user_id, "accounts")
+        banks = [("HDFC Bank", "HDFC0001234"), ("ICICI Bank", "ICIC0004321"), ("State Bank of India", "SBIN0000456")]
+        return [{
+            "id": f"{user_id}-acc-{i}",
+            "type": "DEPOSIT",
+            "accountType": "Savings",
+            "fipName": bank,
+            "ifscCode": ifsc,
+            "branch": "Andheri East",
+            "maskedAccNumber": f"XXXXXXXX{rng.randint(1000, 9999)}",
+            "openingDate": "2019-04-01",
+            "status": "Active",
+            "currentBalance": round(rng.uniform(20_000, 400_000), 2),
+        } for i, (bank, ifsc) in enumerate(banks[:2])]
+
+    def _transaction_index(self, user_id: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """(ascending date strings, transactions oldest first), generated once per user"""
+        with self._lock:
+            cached = self._transactions.get(user_id)
+            if cached is not None:
+                return cached
+
+            rng = self._rng(user_id, "transactions")
+            accounts = [a["id"] for a in self._accounts(user_id)]
+            balance = 150_000.0
+            end = datetime.now().replace(hour=23, minute=59, second=0, microsecond=0)
+            span = self.days * 86400
+            offsets = sorted(rng.randrange(span) for _ in range(self.transactions_per_user))
+            expense_categories = list(CATEGORY_MERCHANTS)
+
+            dates, txns = [], []
+            for n, offset in enumerate(offsets):
+                when = end - timedelta(seconds=span - offset)
+                if rng.random() < 0.08:
+                    category = rng.choice(list(CREDIT_SOURCES))
+                    merchant = rng.choice(CREDIT_SOURCES[category])
+                    txn_type, amount = "CREDIT", round(rng.uniform(5_000, 120_000), 2)
+                    balance += amount
+                else:
+                    category = rng.choice(expense_categories)
+                    merchant = rng.choice(CATEGORY_MERCHANTS[category])
+                    txn_type, amount = "DEBIT", round(rng.lognormvariate(6.5, 1.0), 2)
+                    balance -= amount
+                date = when.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+                dates.append(date)
+                txns.append({
+                    "id": f"{user_id}-txn-{n}",
+                    "accountId": rng.choice(accounts),
+                    "date": date,
+                    "type": txn_type,
+                    "amount": amount,
+                    "category": category,
+                    "mode": rng.choice(MODES),
+                    "merchantName": merchant,
+                    "narration": f"{txn_type} {merchant}",
+                    "referenceId": f"REF-{user_id}-{n:08d}",
+                    "currentBalance": round(balance, 2),
+                })
+            self._transactions[user_id] = (dates, txns)
+            return dates, txns
+
+    def _transaction_window(self, user_id: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """Filtered transactions (newest first) and totals, memoized per filter"""
+        key = (user_id, params.get("from"), params.get("to"), params.get("category"))
+        with self._lock:
+            window = self._windows.get(key)
+        if window is not None:
+            return window
+
+        dates, txns = self._transaction_index(user_id)
+        lo = bisect.bisect_left(dates, params["from"]) if params.get("from") else 0
+        hi = bisect.bisect_right(dates, params["to"] + "T99") if params.get("to") else len(dates)
+        selected = txns[lo:hi][::-1]
+        if params.get("category"):
+            selected = [t for t in selected if t["category"] == params["category"]]
+
+        credits = sum(t["amount"] for t in selected if t["type"] == "CREDIT")
+        debits = sum(t["amount"] for t in selected if t["type"] == "DEBIT")
+        breakdown: Dict[str, float] = {}
+        for t in selected:
+            if t["type"] == "DEBIT":
+                breakdown[t["category"]] = breakdown.get(t["category"], 0.0) + t["amount"]
+        window = {
+            "transactions": selected,
+            "totalCredits": round(credits, 2),
+            "totalDebits": round(debits, 2),
+            "netFlow": round(credits - debits, 2),
+            "categoryBreakdown": {k: round(v, 2) for k, v in breakdown.items()},
+        }
+        with self._lock:
+            if len(self._windows) > 256:
+                self._windows.clear()
+            self._windows[key] = window
+        return window
+
+    def respond(self, path: str, params: Dict[str, str]) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """(status, JSON body) for a request, or None if this source has no answer"""
+        if path == "/api/v1/auth/users":
+            users = [{"_id": uid, "name": f"Synthetic User {i}", "aaHandle": f"{uid}@anumati"}
+                     for i, uid in enumerate(self.user_ids)]
+            return 200, {"success": True, "data": {"count": len(users), "users": users}}
+
+        user_id = params.get("user_id")
+        if user_id not in self.user_ids:
+            return 404, {"success": False, "error": f"User {user_id} not found"}
+        rng = self._rng(user_id, path)
+
+        if path == "/api/v1/auth/profile":
+            i = self.user_ids.index(user_id)
+            data = {
+                "_id": user_id, "name": f"Synthetic User {i}", "age": 25 + i % 30,
+                "email": f"user{i}@example.com", "pan": f"ABCDE{1000 + i}F", "kycCompleted": True,
+                "mobile": f"98{i:08d}", "aaHandle": f"{user_id}@anumati", "dob": "1995-06-15",
+            }
+        elif path == "/api/v1/accounts":
+            accounts = self._accounts(user_id)
+            data = {"count": len(accounts), "accounts": accounts}
+        elif path == "/api/v1/aggregated/transactions":
+            window = self._transaction_window(user_id, params)
+            limit, offset = int(params.get("limit", 100)), int(params.get("offset", 0))
+            data = {
+                "total": len(window["transactions"]), "limit": limit, "offset": offset,
+                **{k: v for k, v in window.items() if k != "transactions"},
+                "transactions": window["transactions"][offset:offset + limit],
+            }
+        elif path == "/api/v1/aggregated/investments":
+            kinds = [("MUTUAL_FUNDS", "Parag Parikh Flexi Cap"), ("MUTUAL_FUNDS", "Axis Bluechip"),
+                     ("EQUITIES", "RELIANCE"), ("EQUITIES", "INFY"), ("FIXED_DEPOSITS", "HDFC FD"), ("PPF", "SBI PPF")]
+            investments = []
+            for n, (kind, name) in enumerate(kinds):
+                invested = round(rng.uniform(25_000, 300_000), 2)
+                returns = round(rng.uniform(-8, 25), 2)
+                investments.append({
+                    "id": f"{user_id}-inv-{n}", "type": kind, "schemeName": name, "provider": name.split()[0],
+                    "investedAmount": invested, "currentValue": round(invested * (1 + returns / 100), 2),
+                    "returnsPercentage": returns, "units": round(invested / 50, 3), "quantity": rng.randint(5, 200),
+                    "status": "ACTIVE",
+                })
+            data = {"count": len(investments), "investments": investments}
+        elif path == "/api/v1/aggregated/liabilities":
+            liabilities = [
+                {"id": f"{user_id}-loan-0", "type": "HOME_LOAN", "provider": "SBI", "outstandingAmount": 2_450_000,
+                 "interestRate": 8.5, "tenure": 240, "emiAmount": 24_500},
+                {"id": f"{user_id}-card-0", "type": "CREDIT_CARD", "provider": "HDFC",
+                 "outstandingAmount": round(rng.uniform(5_000, 60_000), 2), "interestRate": 42.0},
+            ]
+            data = {"count": len(liabilities), "liabilities": liabilities}
+        elif path == "/api/v1/aggregated/net-worth":
+            assets = sum(a["currentBalance"] for a in self._accounts(user_id))
+            liabilities = 2_450_000
+            data = {"netWorth": round(assets - liabilities, 2), "breakdown": {
+                "assets": {"total": round(assets, 2)}, "liabilities": {"total": liabilities}}}
+        elif path == "/api/v1/aggregated/monthly-spending":
+            months = int(params.get("months", 6))
+            window = self._transaction_window(user_id, {
+                "from": (datetime.now() - timedelta(days=31 * months)).strftime("%Y-%m-%d")})
+            by_month: Dict[str, float] = {}
+            for t in window["transactions"]:
+                if t["type"] == "DEBIT":
+                    by_month[t["date"][:7]] = by_month.get(t["date"][:7], 0.0) + t["amount"]
+            data = {"months": [{"month": m, "totalSpending": round(v, 2)} for m, v in sorted(by_month.items())]}
+        elif path == "/api/v1/aggregated/income-sources":
+            data = {"sources": [{"source": "Employer Payroll", "type": "SALARY",
+                                 "monthlyAverage": round(rng.uniform(60_000, 200_000), 2)}]}
+        else:
+            return None
+        return 200, {"success": True, "data": data}
+
+
+class FixtureStore:
+    """
+    Recorded responses on disk, one JSON file per (path, query params)
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def load(self, path: str, params: Dict[str, str]) -> Optional[Tuple[int, Any]]:
+        try:
+            with open(self.directory / _fixture_name(path, params)) as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return None
+        return stored["status"], stored["body"]
+
+    def save(self, path: str, params: Dict[str, str], status: int, body: Any):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / _fixture_name(path, params)
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"path": path, "params": params, "status": status, "body": body}, f)
+        os.replace(tmp, target)
+
+
+# -------------------------------
+# SERVER
+# -------------------------------
+
+class AAStandIn:
+    """
+    Threaded HTTP server answering AA requests with fault injection
+    """
+
+    def __init__(
+        self,
+        synthetic: Optional[SyntheticAAData] = None,
+        replay_dir: Optional[str] = None,
+        record_dir: Optional[str] = None,
+        upstream: Optional[str] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        """
+        Args:
+            synthetic: Synthetic data source (used when no fixture matches)
+            replay_dir: Directory of recorded fixtures to serve
+            record_dir: Forward requests to `upstream` and save the responses here
+            upstream: Real AA base URL (record mode)
+            latency_ms: Added delay per request
+            jitter_ms: Uniform random extra delay (0..jitter_ms)
+            error_rate: Fraction of requests answered with 503
+            rate_limit_rate: Fraction of requests answered with 429
+            retry_after: Retry-After seconds sent with 429s
+            seed: Seed for latency jitter and fault injection
+            host: Bind address
+            port: Bind port (0 picks a free one)
+        """
+        if record_dir and not upstream:
+            raise ValueError("Record mode needs an upstream AA base URL")
+        self.synthetic = synthetic
+        self.replay = FixtureStore(replay_dir) if replay_dir else None
+        self.recorder = FixtureStore(record_dir) if record_dir else None
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._upstream_http: Optional[httpx.Client] = None
+        self.stats = {"requests": 0, "injected_errors": 0, "injected_429s": 0,
+                      "replayed": 0, "synthesized": 0, "recorded": 0, "unmatched": 0}
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "AAStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="aa-standin")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._upstream_http is not None:
+            self._upstream_http.close()
+
+    def __enter__(self) -> "AAStandIn":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _fault(self) -> Tuple[float, Optional[str]]:
+        """(delay seconds, injected fault or None) for the next request"""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return delay, "rate_limit"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, "error"
+        return delay, None
+
+    def handle(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """(status, headers, body) for one request"""
+        delay, fault = self._fault()
+        if delay:
+            time.sleep(delay)
+        if fault == "rate_limit":
+            self._count("injected_429s")
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, _json_body({"success": False, "error": "Too many requests"})
+        if fault == "error":
+            self._count("injected_errors")
+            return 503, {}, _json_body({"success": False, "error": "Injected failure"})
+
+        if self.recorder is not None:
+            if self._upstream_http is None:
+                self._upstream_http = httpx.Client(timeout=30)
+            response = self._upstream_http.get(f"{self.upstream}{path}", params=params)
+            try:
+                body = response.json()
+            except ValueError:
+                return response.status_code, {}, response.content
+            self.recorder.save(path, params, response.status_code, body)
+            self._count("recorded")
+            return response.status_code, {}, _json_body(body)
+
+        if self.replay is not None:
+            stored = self.replay.load(path, params)
+            if stored is not None:
+                self._count("replayed")
+                return stored[0], {}, _json_body(stored[1])
+
+        if self.synthetic is not None:
+            answer = self.synthetic.respond(path, params)
+            if answer is not None:
+                self._count("synthesized")
+                return answer[0], {}, _json_body(answer[1])
+
+        self._count("unmatched")
+        return 404, {}, _json_body({"success": False, "error": f"No stand-in response for {path}"})
+
+    def _handler_class(self):
+        standin = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, headers, body = standin.handle(url.path, dict(parse_qsl(url.query)))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return _Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local AA stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--users", type=int, default=3, help="synthetic users")
+    parser.add_argument("--transactions", type=int, default=2000, help="transactions per synthetic user")
+    parser.add_argument("--days", type=int, default=365, help="history covered by synthetic transactions")
+    parser.add_argument("--replay", metavar="DIR", help="serve recorded fixtures from DIR")
+    parser.add_argument("--record", metavar="DIR", help="proxy to --upstream and record responses into DIR")
+    parser.add_argument("--upstream", help="real AA base URL for --record")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = AAStandIn(
+        synthetic=None if args.record else SyntheticAAData(args.users, args.transactions, args.days, args.seed),
+        replay_dir=args.replay, record_dir=args.record, upstream=args.upstream,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, seed=args.seed,
+        host=args.host, port=args.port
+    )
+    print(f"🧪 AA stand-in listening on {server.base_url}", flush=True)
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
@@ -7,24 +7,57 @@ from langchain_classic.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from agent.config import Config
 from agent.memory import MemoryManager
-from datetime import datetime
+from agent.fast_path import get_fast_path_router
+from agent.response_cache import get_response_cache
+from agent.data_version import get_data_version
+from agent.parallel_executor import ParallelAgentExecutor
+from agent.tool_cache import memoize_tool
+from agent.context_assembler import ContextAssembler
+from agent.memory_writer import get_memory_writer
+from agent.long_term_store import get_long_term_store
+from agent.notification_store import get_notification_store
+from agent.notification_hub import get_notification_hub
+from agent.user_manager import get_run_user_id, run_as_user
+import os
+
 
 class BaseAgent:
     """
     Base class for all financial agents.
     """
     
-    def __init__(self, tools, system_prompt, profile=None):
+    def __init__(self, tools, system_prompt, profile=None, enable_fast_path=True, enable_response_cache=True,
+                 enable_tool_cache=True):
         """
         Initialize the agent with specific tools and system prompt.
         """
+        # User whose data the agent answers for (updated by AgentManager on user switch)
+        self.user_id = "personal_user"
+        
+        # Deterministic answers for simple lookups (balance, spend, portfolio)
+        self.fast_path = get_fast_path_router() if enable_fast_path else None
+        
+        # Semantic cache of full agent answers, shared across agents (keyed per agent)
+        self.response_cache = get_response_cache() if enable_response_cache else None
+
         # Get LLM from config
         self.llm = Config.get_llm()
+        
+        # Data tools are memoized per user, shared with the other agents
+        if enable_tool_cache:
+            tools = [memoize_tool(t, self._current_user_id) for t in tools]
         self.tools = tools
         
         # Initialize Hybrid Memory Manager
         self.memory_manager = MemoryManager(profile)
         
+        # Keeps the prompt within a token budget (recent turns verbatim, older ones summarized);
+        # past conversations come from the per-user partitioned long-term store
+        self.context_assembler = ContextAssembler(long_term_store=get_long_term_store())
+        
+        # Memory writes happen after the response is returned
+        self.memory_writer = get_memory_writer()
+        
         # Create prompt for Tool Calling Agent
         prompt = ChatPromptTemplate.from_messages([
             ("system", f"""{system_prompt}
@@ -46,7 +79,8 @@ RELEVANT PAST CONVERSATIONS:
         )
         
         # Create agent executor
-        self.agent_executor = AgentExecutor(
+        # "parallel" (default) runs independent tool calls of one step concurrently
+        executor_kwargs = dict(
             agent=self.agent,
             tools=self.tools,
             verbose=True,
@@ -55,78 +89,157 @@ RELEVANT PAST CONVERSATIONS:
             max_execution_time=60,
             return_intermediate_steps=False
         )
+        if os.getenv("AGENT_TOOL_EXECUTION", "parallel").lower() == "parallel":
+            self.agent_executor = ParallelAgentExecutor(
+                tool_timeout=float(os.getenv("AGENT_TOOL_TIMEOUT_SECONDS", "20")),
+                **executor_kwargs
+            )
+        else:
+            self.agent_executor = AgentExecutor(**executor_kwargs)
         
-        # Message Queue for Proactive Notifications (available to all agents)
-        self.message_queue = []
+        # Proactive notifications, stored per user and shared by all agents
+        self.notifications = get_notification_store()
 
-    def chat(self, message: str) -> str:
+    def chat(self, message: str, use_cache: bool = True) -> str:
         """
         Process a user message and return the agent's response
+        
+        Args:
+            message: User message
+            use_cache: Set False to bypass the semantic response cache for this request
         """
         try:
-            # 1. Retrieve Context from Hybrid Memory
-            context = self.memory_manager.get_combined_context(message)
+            # 0. Answer simple data lookups without running the agent loop
+            if self.fast_path is not None:
+                fast_answer = self.fast_path.try_answer(message, self.user_id)
+                if fast_answer is not None:
+                    self._save_turn(message, fast_answer)
+                    return fast_answer
+            
+            # 0b. Serve a near-identical earlier question if the data hasn't changed
+            agent_id = type(self).__name__
+            use_response_cache = self.response_cache is not None and use_cache
+            if use_response_cache:
+                cached = self.response_cache.lookup(self.user_id, agent_id, message, get_data_version(self.user_id))
+                if cached is not None:
+                    self._save_turn(message, cached)
+                    return cached
+            
+            # 1. Retrieve Context from Hybrid Memory (token-budgeted)
+            # Wait for this session's deferred writes so we read our own previous turn
+            self.memory_writer.settle(self.memory_manager)
+            context = self.context_assembler.assemble(self.user_id, message, self.memory_manager)
             
             # 2. Invoke Agent with Input + Context
             inputs = {"input": message, **context}
             response = self.agent_executor.invoke(inputs)
-            output = response.get("output", "I apologize, but I encountered an error processing your request.")
+            output = self._extract_output(response)
             
-            # Handle list output (common with Gemini/Tool Calling)
-            if isinstance(output, list):
-                # Extract text from content blocks
-                text_parts = []
-                for item in output:
-                    if isinstance(item, dict) and 'text' in item:
-                        text_parts.append(item['text'])
-                    elif isinstance(item, str):
-                        text_parts.append(item)
-                output = "".join(text_parts)
+            # 3. Save Context (Short-term & Long-term), off the response path
+            self._save_turn(message, output)
             
-            # 3. Save Context (Short-term & Long-term)
-            self.memory_manager.save_context({"input": message}, {"output": output})
+            if use_response_cache:
+                # The run's own tool calls refresh the user's data, so read the version afterwards
+                self.response_cache.store(self.user_id, agent_id, message, output, get_data_version(self.user_id))
             
             return output
         except Exception as e:
             return f"I apologize, but I encountered an error: {str(e)}"
 
-    def trigger_proactive_message(self, prompt: str, topic: str = "Notification"):
+    def _save_turn(self, message: str, output: str):
+        """Queue the turn for write-behind persistence to short & long-term memory"""
+        self.memory_writer.submit(self.memory_manager, {"input": message}, {"output": output}, user_id=self.user_id)
+
+    def _current_user_id(self) -> str:
+        """User the current run is working for (isolated runs override the active user)"""
+        return get_run_user_id() or self.user_id
+
+    @staticmethod
+    def _extract_output(response: dict) -> str:
+        output = response.get("output", "I apologize, but I encountered an error processing your request.")
+        
+        # Handle list output (common with Gemini/Tool Calling)
+        if isinstance(output, list):
+            # Extract text from content blocks
+            text_parts = []
+            for item in output:
+                if isinstance(item, dict) and 'text' in item:
+                    text_parts.append(item['text'])
+                elif isinstance(item, str):
+                    text_parts.append(item)
+            output = "".join(text_parts)
+        return output
+
+    def run_isolated(self, prompt: str, user_id: str = None, profile_context: str = None) -> str:
+        """
+        Run the agent on a system prompt without touching conversation memory:
+        no chat history or past conversations go in, nothing is saved out.
+        
+        Args:
+            prompt: System-generated instruction (e.g. a proactive check)
+            user_id: User to run for (defaults to the active user)
+            profile_context: Pre-rendered profile; fetched for user_id if omitted
+        """
+        user_id = user_id or self.user_id
+        if profile_context is None:
+            if user_id == self.user_id:
+                profile_context = self.memory_manager.static_memory.get_profile_context()
+            else:
+                from agent.memory import StaticUserProfileMemory
+                profile_context = StaticUserProfileMemory(user_id=user_id).get_profile_context()
+        
+        inputs = {
+            "input": prompt,
+            "static_profile": profile_context,
+            "long_term_history": "",
+            "chat_history": []
+        }
+        with run_as_user(user_id):
+            return self._extract_output(self.agent_executor.invoke(inputs))
+
+    def generate_proactive_message(self, prompt: str, topic: str = "Notification", user_id: str = None,
+                                   agent_id: str = None):
+        """
+        Run a proactive check in an isolated context (the user's chat history is
+        left untouched) and store the result in the user's notifications.
+        Errors propagate to the caller.
+        
+        Returns:
+            The queued message, or None if no alert was generated
+        """
+        user_id = user_id or self.user_id
+        response = self.run_isolated(prompt, user_id=user_id)
+        
+        # Check for "NO_ALERT" signal
+        if "NO_ALERT" in response:
+            return None
+
+        message = self.notifications.add(user_id, topic, response, agent_id=agent_id or type(self).__name__)
+        # Push to connected clients right away
+        get_notification_hub().publish(message)
+        return message
+
+    def trigger_proactive_message(self, prompt: str, topic: str = "Notification", user_id: str = None):
         """
         Triggers the agent to generate a message based on a system prompt.
-        Stores the result in the message queue for the frontend to poll.
+        Stores the result in the user's notifications for the frontend to poll.
         """
         print(f"⚡ Triggering proactive message: {topic}")
         try:
-            # Use the chat method but with the system prompt
-            response = self.chat(prompt)
-            
-            # Check for "NO_ALERT" signal
-            if "NO_ALERT" in response:
+            if self.generate_proactive_message(prompt, topic, user_id) is None:
                 print("  → No alert generated.")
                 return
-
-            # Add to queue
-            message_obj = {
-                "id": f"notif-{len(self.message_queue)}",
-                "timestamp": datetime.now().isoformat(),
-                "topic": topic,
-                "content": response,
-                "read": False
-            }
-            self.message_queue.append(message_obj)
             print(f"  → Notification queued: {topic}")
             
         except Exception as e:
             print(f"Error generating proactive message: {e}")
 
-    def get_unread_messages(self) -> list:
-        """Return and clear unread messages from the queue"""
-        messages = [m for m in self.message_queue if not m['read']]
-        # Mark as read
-        for m in messages:
-            m['read'] = True
-        return messages
+    def get_unread_messages(self, user_id: str = None) -> list:
+        """Return unread notifications for the user and mark them as read"""
+        return self.notifications.get_unread(user_id or self.user_id)
 
     def reset_conversation(self):
         """Clear the conversation memory"""
+        self.memory_writer.settle(self.memory_manager)
         self.memory_manager.short_term_memory.clear()
+        self.context_assembler.reset(self.user_id)
@@ -0,0 +1,278 @@
+"""
+Token-budgeted conversation context assembly.
+Keeps prompts bounded as conversations grow: the rendered static profile is
+cached per user, the last N turns are kept verbatim, and older turns are folded
+into a rolling summary that is updated in the background (never on the
+request path).
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from agent.data_version import get_data_version
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and their financial advisor.
+Update the summary with the new turns below. Keep facts, numbers, decisions and open questions; drop pleasantries.
+Reply with the updated summary only (max 200 words).
+
+CURRENT SUMMARY:
+{summary}
+
+NEW TURNS:
+{turns}"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count (tiktoken if installed, else ~4 characters per token)"""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // 4 + 1
+
+
+def _message_text(message) -> str:
+    content = getattr(message, "content", message)
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return str(content)
+
+
+class _UserSummary:
+    __slots__ = ("text", "folded", "scheduled")
+
+    def __init__(self):
+        # Messages are identified by their position in the conversation history
+        # (append-only until reset), not by content: "ok" said twice is two turns
+        self.text = ""
+        self.folded = set()      # positions already represented in text
+        self.scheduled = set()   # positions queued for folding
+
+
+class ContextAssembler:
+    """
+    Builds the {static_profile, long_term_history, chat_history} prompt inputs
+    within a token budget.
+    """
+
+    def __init__(self, token_budget: int = None, recent_turns: int = None, long_term_store=None):
+        """
+        Args:
+            token_budget: Max tokens for profile + history + past conversations
+            recent_turns: Number of most recent turns (user + AI pairs) kept verbatim
+            long_term_store: Optional PartitionedMemoryStore; when set it is the only
+                             source of past conversations (MemoryManager's long-term
+                             retrieval is not called)
+        """
+        self.long_term_store = long_term_store
+        self.token_budget = token_budget or int(os.getenv("CONTEXT_TOKEN_BUDGET", "4000"))
+        self.recent_turns = recent_turns or int(os.getenv("CONTEXT_RECENT_TURNS", "4"))
+
+        self._profiles: Dict[str, tuple] = {}
+        self._summaries: Dict[str, _UserSummary] = {}
+        self._lock = threading.Lock()
+        self._summarizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="context-summary")
+        self._llm = None
+
+        self.stats = {
+            "assembled": 0,
+            "tokens_before": 0,
+            "tokens_after": 0,
+            "last_tokens_before": 0,
+            "last_tokens_after": 0,
+            "summary_updates": 0,
+            "summary_failures": 0
+        }
+
+    # -------------------------------
+    # PUBLIC API
+    # -------------------------------
+
+    def assemble(self, user_id: str, message: str, memory_manager) -> Dict[str, Any]:
+        """
+        Build prompt inputs for the next turn.
+
+        Args:
+            user_id: Active user id
+            message: Incoming user message (used for long-term retrieval)
+            memory_manager: The agent's MemoryManager
+
+        Returns:
+            Dict with static_profile, long_term_history and chat_history
+        """
+        if self.long_term_store is not None:
+            # Past conversations only come from the partitioned store; MemoryManager's
+            # own retrieval would embed the message a second time for nothing
+            raw = {"chat_history": list(memory_manager.short_term_memory.chat_memory.messages)}
+            # Rendered only when the cached copy is stale
+            render_profile = memory_manager.static_memory.get_profile_context
+            try:
+                long_term = self.long_term_store.render(user_id, message)
+            except Exception as e:
+                print(f"⚠ Long-term store lookup failed: {e}")
+                long_term = ""
+        else:
+            raw = memory_manager.get_combined_context(message)
+            render_profile = lambda: raw.get("static_profile", "")
+            long_term = raw.get("long_term_history", "") or ""
+        static_profile, profile_tokens = self._cached_profile(user_id, render_profile)
+        history = list(raw.get("chat_history", []) or [])
+
+        tokens_before = (
+            profile_tokens + estimate_tokens(long_term) +
+            sum(estimate_tokens(_message_text(m)) for m in history)
+        )
+
+        recent_count = self.recent_turns * 2
+        recent = history[-recent_count:] if recent_count else []
+        older = history[:-recent_count] if recent_count else history
+
+        state = self._summary_state(user_id)
+        with self._lock:
+            summary_text = state.text
+            unfolded = [(position, m) for position, m in enumerate(older) if position not in state.folded]
+
+        # Fold anything older than the verbatim window, off the request path
+        self._schedule_summary(user_id, unfolded)
+
+        # Fixed parts: profile, summary and the recent window
+        summary_block = f"EARLIER IN THIS CONVERSATION (summary):\n{summary_text}\n\n" if summary_text else ""
+        used = (
+            estimate_tokens(static_profile) + estimate_tokens(summary_block) +
+            sum(estimate_tokens(_message_text(m)) for m in recent)
+        )
+        remaining = max(0, self.token_budget - used)
+
+        # Older turns not yet summarized stay verbatim while budget allows (newest first)
+        kept_older: List = []
+        for _, m in reversed(unfolded):
+            cost = estimate_tokens(_message_text(m))
+            if cost > remaining:
+                break
+            kept_older.insert(0, m)
+            remaining -= cost
+
+        long_term = self._truncate(long_term, remaining)
+        chat_history = kept_older + recent
+        assembled = {
+            **raw,
+            "static_profile": static_profile,
+            "long_term_history": summary_block + long_term,
+            "chat_history": chat_history
+        }
+
+        tokens_after = (
+            estimate_tokens(static_profile) + estimate_tokens(assembled["long_term_history"]) +
+            sum(estimate_tokens(_message_text(m)) for m in chat_history)
+        )
+        with self._lock:
+            self.stats["assembled"] += 1
+            self.stats["tokens_before"] += tokens_before
+            self.stats["tokens_after"] += tokens_after
+            self.stats["last_tokens_before"] = tokens_before
+            self.stats["last_tokens_after"] = tokens_after
+
+        return assembled
+
+    def reset(self, user_id: str):
+        """Forget the rolling summary (e.g. after the conversation was cleared)"""
+        with self._lock:
+            self._summaries.pop(user_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        if stats["tokens_before"]:
+            stats["reduction_pct"] = round((1 - stats["tokens_after"] / stats["tokens_before"]) * 100, 1)
+        return stats
+
+    # -------------------------------
+    # HELPERS
+    # -------------------------------
+
+    def _cached_profile(self, user_id: str, render: Callable[[], str]) -> Tuple[str, int]:
+        """
+        Reuse the rendered profile while the user's data is unchanged, so the
+        system prompt prefix stays byte-identical across turns and the profile
+        is only rendered again after a data change.
+
+        Returns:
+            (profile truncated to the budget, tokens of the full rendering)
+        """
+        version = get_data_version(user_id)
+        with self._lock:
+            cached = self._profiles.get(user_id)
+        if cached and cached[0] == version:
+            return cached[1], cached[2]
+
+        rendered = render() or ""
+        profile = self._truncate(rendered, self.token_budget // 2)
+        tokens = estimate_tokens(rendered)
+        with self._lock:
+            self._profiles[user_id] = (version, profile, tokens)
+        return profile, tokens
+
+    def _summary_state(self, user_id: str) -> _UserSummary:
+        with self._lock:
+            return self._summaries.setdefault(user_id, _UserSummary())
+
+    @staticmethod
+    def _truncate(text: str, max_tokens: int) -> str:
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+        # Shrink proportionally, then trim until it fits
+        cut = int(len(text) * max_tokens / estimate_tokens(text))
+        while cut > 0 and estimate_tokens(text[:cut]) > max_tokens:
+            cut = int(cut * 0.9)
+        return text[:cut].rstrip() + "\n…"
+
+    def _schedule_summary(self, user_id: str, messages: List[Tuple[int, Any]]):
+        """Queue (position, message) pairs that aren't already being folded"""
+        state = self._summary_state(user_id)
+        with self._lock:
+            batch = [(position, m) for position, m in messages if position not in state.scheduled]
+            if not batch:
+                return
+            state.scheduled.update(position for position, _ in batch)
+        self._summarizer.submit(self._fold, user_id, state, batch)
+
+    def _fold(self, user_id: str, state: _UserSummary, batch: List[Tuple[int, Any]]):
+        """Background job: merge older turns into the user's rolling summary"""
+        messages = [m for _, m in batch]
+        turns = "\n".join(f"{getattr(m, 'type', 'message')}: {_message_text(m)}" for m in messages)
+        with self._lock:
+            current = state.text
+
+        try:
+            if self._llm is None:
+                from agent.config import Config
+                self._llm = Config.get_llm()
+            result = self._llm.invoke(SUMMARY_PROMPT.format(summary=current or "(none)", turns=turns))
+            updated = _message_text(result).strip()
+        except Exception as e:
+            print(f"⚠ Summary update failed, using extractive fallback: {e}")
+            with self._lock:
+                self.stats["summary_failures"] += 1
+            extract = "\n".join(f"- {_message_text(m)[:160]}" for m in messages)
+            updated = self._truncate(f"{current}\n{extract}".strip(), 300)
+
+        with self._lock:
+            # The conversation may have been reset while we were summarizing
+            if self._summaries.get(user_id) is not state:
+                return
+            state.text = updated
+            state.folded.update(position for position, _ in batch)
+            self.stats["summary_updates"] += 1
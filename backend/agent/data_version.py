@@ -0,0 +1,32 @@
+"""
+Data version tokens for cache invalidation.
+A user's version changes whenever the data an answer could depend on changes:
+their AA data (new fetch with different content) or the knowledge base index.
+"""
+
+import os
+
+MOCK_USER_IDS = {"personal_user", "gig_user"}
+
+
+def get_aa_data_version(user_id: str) -> str:
+    """Version of the user's AA data ("mock" for the static demo users)"""
+    if not user_id or user_id in MOCK_USER_IDS or os.getenv("USE_MOCK_DATA", "false").lower() == "true":
+        return "mock"
+
+    from services import get_aa_client
+    return get_aa_client().get_data_version(user_id)
+
+
+def get_data_version(user_id: str) -> str:
+    """
+    Combined version token for everything a cached answer may depend on.
+
+    Args:
+        user_id: Active user id
+
+    Returns:
+        Opaque string; compare for equality only
+    """
+    from agent.knowledge_base import get_knowledge_base_version
+    return f"aa:{get_aa_data_version(user_id)}|kb:{get_knowledge_base_version()}"
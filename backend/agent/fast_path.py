@@ -0,0 +1,378 @@
+"""
+Deterministic fast path for common data questions.
+Answers simple balance, spending and portfolio lookups straight from the data
+layer so they skip the multi-iteration tool-calling agent loop.
+"""
+
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# Words that signal the user wants reasoning or advice, not a lookup.
+# Any of these sends the message to the full agent.
+ADVISORY_MARKERS = re.compile(
+    r"\b(should|why|how can|how do|can i|could|would|afford|if|advice|advise|plan|"
+    r"recommend|suggest|compare|better|worse|reduce|save|invest in|optimi[sz]e|"
+    r"budget|goal|predict|forecast|tax|and then|also)\b",
+    re.IGNORECASE
+)
+
+BALANCE_PATTERN = re.compile(
+    r"^(what('?s| is| are)|show( me)?|check|tell me|how much( money)? (do i have|is)|get)?\s*"
+    r"(my\s+)?(current\s+|total\s+|bank\s+|account\s+|savings\s+)*(bank\s+|account\s+)?balances?"
+    r"(\s+(in|across)\s+(my\s+)?(bank\s+)?accounts?)?(\s+now|\s+today)?\s*\??$",
+    re.IGNORECASE
+)
+
+PORTFOLIO_PATTERN = re.compile(
+    r"^(what('?s| is| are)|show( me)?|check|tell me|get|how('?s| is) )?\s*(my\s+)?"
+    r"(current\s+|total\s+)?(investment\s+)?(portfolio|holdings|investments)"
+    r"(\s+(value|summary|worth|doing))?(\s+now|\s+today)?\s*\??$",
+    re.IGNORECASE
+)
+
+SPENDING_PATTERN = re.compile(
+    r"^(how much|what)( money)? (did|have) i (spend|spent)"
+    r"(\s+(on|for)\s+(?P<category>[a-z][a-z &/-]*?))?"
+    r"(\s+(in|over|during|for)?\s*(the\s+)?(?P<period>last month|this month|last week|this week|today|yesterday|"
+    r"last \d+ (days?|weeks?|months?)|past \d+ (days?|weeks?|months?)))?\s*\??$",
+    re.IGNORECASE
+)
+
+# User vocabulary -> categories used by mock data and the AA backend
+CATEGORY_SYNONYMS = {
+    "food": ["Food Delivery", "Dining", "Food"],
+    "eating out": ["Dining"],
+    "restaurants": ["Dining"],
+    "takeout": ["Food Delivery"],
+    "grocery": ["Groceries"],
+    "groceries": ["Groceries"],
+    "petrol": ["Fuel"],
+    "fuel": ["Fuel"],
+    "travel": ["Transportation", "Travel"],
+    "transport": ["Transportation"],
+    "cabs": ["Transportation"],
+    "bills": ["Utilities"],
+    "utilities": ["Utilities"],
+    "emi": ["Loan EMI"],
+    "emis": ["Loan EMI"],
+    "loans": ["Loan EMI"],
+    "medical": ["Healthcare"],
+    "health": ["Healthcare"],
+    "medicines": ["Healthcare"],
+}
+
+MOCK_USER_IDS = {"personal_user"}
+
+
+def format_inr(amount: float) -> str:
+    """Format an amount with Indian digit grouping, e.g. ₹12,34,567."""
+    sign = "-" if amount < 0 else ""
+    whole = f"{abs(amount):.0f}"
+    if len(whole) > 3:
+        head, tail = whole[:-3], whole[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        if head:
+            groups.insert(0, head)
+        whole = ",".join(groups + [tail])
+    return f"{sign}₹{whole}"
+
+
+def resolve_period(period: Optional[str], now: Optional[datetime] = None) -> Tuple[datetime, datetime, str]:
+    """
+    Turn a spoken period ("last month", "last 3 weeks") into a date range.
+
+    Returns:
+        (start, end, label) where end is exclusive
+    """
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    period = (period or "").lower().strip()
+
+    if period == "last month":
+        first_this_month = today.replace(day=1)
+        start = (first_this_month - timedelta(days=1)).replace(day=1)
+        return start, first_this_month, start.strftime("in %B %Y")
+    if period == "this month":
+        return today.replace(day=1), now, "this month"
+    if period == "today":
+        return today, now, "today"
+    if period == "yesterday":
+        return today - timedelta(days=1), today, "yesterday"
+    if period in ("last week", "this week"):
+        return now - timedelta(days=7), now, "in the last 7 days"
+
+    match = re.match(r"(last|past) (\d+) (day|week|month)s?", period)
+    if match:
+        count, unit = int(match.group(2)), match.group(3)
+        days = count * {"day": 1, "week": 7, "month": 30}[unit]
+        return now - timedelta(days=days), now, f"in the last {days} days"
+
+    return now - timedelta(days=30), now, "in the last 30 days"
+
+
+class FastPathRouter:
+    """
+    Pattern-matches common lookup questions and answers them from data.
+    Returns None whenever it is not confident, so the caller falls back to
+    the full agent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "fallbacks": 0,
+            "by_intent": {}
+        }
+
+    # -------------------------------
+    # PUBLIC API
+    # -------------------------------
+
+    def try_answer(self, message: str, user_id: Optional[str]) -> Optional[str]:
+        """
+        Answer the message deterministically if it is a known lookup.
+
+        Args:
+            message: Raw user message
+            user_id: Active user id
+
+        Returns:
+            The answer text, or None to fall back to the agent
+        """
+        text = " ".join(message.strip().split())
+        intent, match = self._match_intent(text)
+        if intent is None:
+            self._record("misses")
+            return None
+
+        try:
+            handler = getattr(self, f"_answer_{intent}")
+            answer = handler(user_id, match)
+        except Exception as e:
+            print(f"⚠ Fast path '{intent}' failed, falling back to agent: {e}")
+            answer = None
+
+        if answer is None:
+            self._record("fallbacks")
+            return None
+
+        self._record("hits", intent)
+        return answer
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate"""
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"] + self.stats["fallbacks"]
+            return {
+                **self.stats,
+                "by_intent": dict(self.stats["by_intent"]),
+                "total": total,
+                "hit_rate": round(self.stats["hits"] / total, 4) if total else 0.0
+            }
+
+    # -------------------------------
+    # INTENT MATCHING
+    # -------------------------------
+
+    def _match_intent(self, text: str) -> Tuple[Optional[str], Optional[re.Match]]:
+        if not text or len(text.split()) > 14 or ADVISORY_MARKERS.search(text):
+            return None, None
+
+        for intent, pattern in (
+            ("balance", BALANCE_PATTERN),
+            ("portfolio", PORTFOLIO_PATTERN),
+            ("spending", SPENDING_PATTERN),
+        ):
+            match = pattern.match(text)
+            if match:
+                return intent, match
+        return None, None
+
+    def _record(self, counter: str, intent: Optional[str] = None):
+        with self._lock:
+            self.stats[counter] += 1
+            if intent:
+                self.stats["by_intent"][intent] = self.stats["by_intent"].get(intent, 0) + 1
+
+    # -------------------------------
+    # ANSWERS
+    # -------------------------------
+
+    def _answer_balance(self, user_id: str, match: re.Match) -> Optional[str]:
+        accounts = self._load_bank_accounts(user_id)
+        if not accounts:
+            return None
+
+        lines = []
+        total = 0.0
+        for acc in accounts:
+            balance = acc.get("balance_details", {}).get("current_balance", 0.0) or 0.0
+            total += balance
+            lines.append(f"• {acc.get('bank_name', 'Bank')} {acc.get('type', '')} "
+                         f"({acc.get('account_number', '')[-4:]}): {format_inr(balance)}")
+
+        return "\n".join([
+            f"💰 **Total bank balance: {format_inr(total)}**",
+            "",
+            *lines
+        ])
+
+    def _answer_spending(self, user_id: str, match: re.Match) -> Optional[str]:
+        start, end, label = resolve_period(match.group("period"))
+        df = self._load_transactions(user_id, start, end)
+        if df is None:
+            return None
+
+        expenses = df[(df["amount"] < 0) & (df["date"] >= start) & (df["date"] < end)]
+
+        term = (match.group("category") or "").strip().lower()
+        if term:
+            categories = self._resolve_categories(term, df["category"].unique().tolist())
+            if not categories:
+                return None
+            expenses = expenses[expenses["category"].isin(categories)]
+            scope = " + ".join(categories)
+        else:
+            scope = None
+
+        total = float(-expenses["amount"].sum())
+        count = len(expenses)
+
+        if scope:
+            return (f"🧾 You spent **{format_inr(total)}** on {scope} {label} "
+                    f"across {count} transaction{'s' if count != 1 else ''}.")
+
+        breakdown = (-expenses.groupby("category")["amount"].sum()).sort_values(ascending=False).head(5)
+        lines = [f"• {cat}: {format_inr(val)}" for cat, val in breakdown.items()]
+        return "\n".join([
+            f"🧾 You spent **{format_inr(total)}** {label} across {count} transactions.",
+            "",
+            "Top categories:",
+            *lines
+        ])
+
+    def _answer_portfolio(self, user_id: str, match: re.Match) -> Optional[str]:
+        portfolio = self._load_portfolio(user_id)
+        if portfolio is None:
+            return None
+
+        stocks_value, stocks_cost = portfolio["stocks"]
+        funds_value, funds_cost = portfolio["funds"]
+        fd_value = portfolio["fixed_deposits"]
+        total_value = stocks_value + funds_value + fd_value
+        gain = (stocks_value + funds_value) - (stocks_cost + funds_cost)
+        cost = stocks_cost + funds_cost
+        gain_pct = (gain / cost * 100) if cost > 0 else 0.0
+
+        return "\n".join([
+            f"📈 **Portfolio value: {format_inr(total_value)}**",
+            "",
+            f"• Stocks: {format_inr(stocks_value)}",
+            f"• Mutual funds: {format_inr(funds_value)}",
+            f"• Fixed deposits: {format_inr(fd_value)}",
+            "",
+            f"Market-linked gain: {format_inr(gain)} ({gain_pct:+.2f}%)"
+        ])
+
+    @staticmethod
+    def _resolve_categories(term: str, available: List[str]) -> List[str]:
+        """Map a spoken category to the categories present in the data"""
+        lookup = {c.lower(): c for c in available}
+        if term in lookup:
+            return [lookup[term]]
+
+        candidates = CATEGORY_SYNONYMS.get(term) or CATEGORY_SYNONYMS.get(term.rstrip("s"), [])
+        matched = [c for c in candidates if c.lower() in lookup]
+        if matched:
+            return [lookup[c.lower()] for c in matched]
+
+        # Single unambiguous partial match ("delivery" -> "Food Delivery")
+        partial = [c for c in available if term in c.lower()]
+        return partial if len(partial) == 1 else []
+
+    # -------------------------------
+    # DATA SOURCES
+    # -------------------------------
+
+    @staticmethod
+    def _use_mock(user_id: Optional[str]) -> bool:
+        return os.getenv("USE_MOCK_DATA", "false").lower() == "true" or user_id in MOCK_USER_IDS
+
+    @staticmethod
+    def _is_aa_user(user_id: Optional[str]) -> bool:
+        return bool(user_id) and user_id not in MOCK_USER_IDS and user_id != "gig_user"
+
+    def _load_bank_accounts(self, user_id: str) -> Optional[List[Dict]]:
+        if self._use_mock(user_id):
+            if user_id not in MOCK_USER_IDS:
+                return None
+            from data.mock_user import USER_PROFILE
+            return USER_PROFILE.get("bank_accounts", [])
+
+        if self._is_aa_user(user_id):
+            from services import get_aa_client, AATransformer
+            return AATransformer.transform_accounts(get_aa_client().get_typed("accounts", user_id=user_id))
+        return None
+
+    def _load_transactions(self, user_id: str, start: datetime, end: datetime):
+        if self._use_mock(user_id):
+            if user_id not in MOCK_USER_IDS:
+                return None
+            from data.mock_transactions import TRANSACTION_HISTORY
+            # Mock history only covers ~120 days; refuse ranges it can't answer
+            if start < TRANSACTION_HISTORY["date"].min():
+                return None
+            return TRANSACTION_HISTORY
+
+        if self._is_aa_user(user_id):
+            from services import get_transaction_store
+            df = get_transaction_store().get_transactions(user_id, start.date(), end.date())
+            return df if not df.empty else None
+        return None
+
+    def _load_portfolio(self, user_id: str) -> Optional[Dict[str, Any]]:
+        if self._use_mock(user_id):
+            if user_id not in MOCK_USER_IDS:
+                return None
+            from data.mock_portfolio import STOCK_HOLDINGS, MUTUAL_FUND_HOLDINGS, FIXED_DEPOSITS
+            stocks_value = float((STOCK_HOLDINGS["quantity"] * STOCK_HOLDINGS["current_price"]).sum())
+            stocks_cost = float((STOCK_HOLDINGS["quantity"] * STOCK_HOLDINGS["purchase_price"]).sum())
+            funds_value = float((MUTUAL_FUND_HOLDINGS["units"] * MUTUAL_FUND_HOLDINGS["current_nav"]).sum())
+            funds_cost = float((MUTUAL_FUND_HOLDINGS["units"] * MUTUAL_FUND_HOLDINGS["purchase_nav"]).sum())
+            return {
+                "stocks": (stocks_value, stocks_cost),
+                "funds": (funds_value, funds_cost),
+                "fixed_deposits": float(sum(fd["current_value"] for fd in FIXED_DEPOSITS))
+            }
+
+        if self._is_aa_user(user_id):
+            from services import get_aa_client, AATransformer
+            transformed = AATransformer.transform_investments(get_aa_client().get_typed("investments", user_id=user_id))
+            return {
+                "stocks": (sum(s["current_value"] for s in transformed["stocks"]),
+                           sum(s["cost_basis"] for s in transformed["stocks"])),
+                "funds": (sum(m["current_value"] for m in transformed["mutual_funds"]),
+                          sum(m["cost_basis"] for m in transformed["mutual_funds"])),
+                "fixed_deposits": sum(fd["current_value"] for fd in transformed["fixed_deposits"])
+            }
+        return None
+
+
+# Singleton instance
+_fast_path_instance = None
+
+def get_fast_path_router() -> FastPathRouter:
+    """Get or create the shared fast path router"""
+    global _fast_path_instance
+    if _fast_path_instance is None:
+        _fast_path_instance = FastPathRouter()
+    return _fast_path_instance
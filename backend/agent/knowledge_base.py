@@ -14,7 +14,7 @@ import faiss
 from langchain_community.vectorstores import FAISS
 from langchain_community.docstore.in_memory import InMemoryDocstore
 
-from agent.local_embeddings import LocalEmbeddings
+from agent.local_embeddings import get_local_embeddings
 
 
 class DocumentKnowledgeBase:
@@ -39,8 +39,8 @@ class DocumentKnowledgeBase:
         self.documents_dir.mkdir(parents=True, exist_ok=True)
         self.index_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize embeddings model
-        self.embeddings = LocalEmbeddings(model_name="all-MiniLM-L6-v2")
+        # Initialize embeddings model (shared with the response cache)
+        self.embeddings = get_local_embeddings()
         
         # Initialize or load FAISS vector store
         self.vectorstore: Optional[FAISS] = None
@@ -140,6 +140,7 @@ class DocumentKnowledgeBase:
                 )
             
             # Update metadata registry
+            self._bump_index_version()
             self.metadata["documents"][filename] = {
                 "filename": filename,
                 "upload_date": datetime.now().isoformat(),
@@ -240,6 +241,7 @@ class DocumentKnowledgeBase:
             
             # Remove from metadata
             del self.metadata["documents"][filename]
+            self._bump_index_version()
             
             # Delete original file if it exists
             doc_path = self.documents_dir / filename
@@ -256,6 +258,14 @@ class DocumentKnowledgeBase:
             print(f"⚠ Failed to delete document: {e}")
             return False
     
+    @property
+    def index_version(self) -> int:
+        """Monotonic counter bumped whenever indexed content changes."""
+        return self.metadata.get("index_version", 0)
+    
+    def _bump_index_version(self):
+        self.metadata["index_version"] = self.index_version + 1
+    
     def _auto_index_sample_documents(self):
         """
         Automatically index sample policy documents if knowledge base is empty.
@@ -303,6 +313,21 @@ class DocumentKnowledgeBase:
 # Global knowledge base instance
 _knowledge_base = None
 
+def get_knowledge_base_version(storage_dir: str = "data/knowledge_base") -> int:
+    """
+    Current index version without forcing the knowledge base (and its
+    embeddings model) to load.
+    """
+    if _knowledge_base is not None:
+        return _knowledge_base.index_version
+    
+    metadata_file = Path(storage_dir) / "metadata.json"
+    try:
+        with open(metadata_file, 'r') as f:
+            return json.load(f).get("index_version", 0)
+    except (OSError, ValueError):
+        return 0
+
 def get_knowledge_base() -> DocumentKnowledgeBase:
     """Get or create the global knowledge base instance."""
     global _knowledge_base
@@ -41,3 +41,14 @@ class LocalEmbeddings(Embeddings):
         """Embed a single query."""
         embedding = self.model.encode([text], convert_to_numpy=True)
         return embedding[0].tolist()
+
+
+# Shared model instance (the model is ~80MB; load it once per process)
+_embeddings_instance = None
+
+def get_local_embeddings() -> LocalEmbeddings:
+    """Get or create the shared local embeddings model."""
+    global _embeddings_instance
+    if _embeddings_instance is None:
+        _embeddings_instance = LocalEmbeddings(model_name="all-MiniLM-L6-v2")
+    return _embeddings_instance
@@ -0,0 +1,396 @@
+"""
+Partitioned long-term conversation memory.
+Each user gets their own bounded vector partition. When a partition fills
+up, a background compaction merges the oldest turns into summary vectors, so
+retrieval cost stays constant no matter how long the history grows.
+Partitions persist as .npy matrices (memory-mapped on load) plus a JSONL
+record file; each added batch is appended to both, and they are only
+rewritten after a compaction.
+"""
+
+import io
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _append_rows(path: Path, rows: np.ndarray) -> bool:
+    """
+    Append float32 rows to a 2-D .npy file in place: the data goes at the end,
+    then the header is rewritten with the new row count.
+
+    Returns:
+        False (file untouched) if the header can't be rewritten at the same length
+    """
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        header_length = f.tell()
+        if fortran_order or dtype != np.float32 or len(shape) != 2 or shape[1] != rows.shape[1]:
+            return False
+
+        header = io.BytesIO()
+        write_header = np.lib.format.write_array_header_1_0 if version == (1, 0) else np.lib.format.write_array_header_2_0
+        write_header(header, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False,
+                              "shape": (shape[0] + len(rows), shape[1])})
+        if len(header.getvalue()) != header_length:
+            return False
+
+        f.seek(header_length + shape[0] * shape[1] * dtype.itemsize)
+        f.write(np.ascontiguousarray(rows, dtype=np.float32).tobytes())
+        f.truncate()
+        f.seek(0)
+        f.write(header.getvalue())
+    return True
+
+
+class UserMemoryPartition:
+    """
+    Bounded vector store for a single user's conversation turns.
+    """
+
+    def __init__(self, path: Path, dimension: int, max_entries: int, compact_group: int):
+        self.path = path
+        self.dimension = dimension
+        self.max_entries = max_entries
+        self.compact_group = compact_group
+        self.lock = threading.RLock()
+        # Serializes compactions (background and inline) of this partition
+        self.compact_lock = threading.Lock()
+        self.compacting = False
+        # In-memory state differs from the files beyond what appends can fix up
+        self.dirty = False
+
+        # Persisted (possibly memory-mapped) matrix + appended tail, searched as two blocks
+        self._base = np.zeros((0, dimension), dtype=np.float32)
+        self._tail: List[np.ndarray] = []
+        self.records: List[Dict[str, Any]] = []
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # -------------------------------
+    # PERSISTENCE
+    # -------------------------------
+
+    def _load(self):
+        vectors_file = self.path / "vectors.npy"
+        records_file = self.path / "records.jsonl"
+        if not vectors_file.exists() or not records_file.exists():
+            return
+
+        try:
+            base = np.load(vectors_file, mmap_mode="r")
+            with open(records_file, "r") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+            if base.ndim != 2 or base.shape[1] != self.dimension:
+                raise ValueError("vectors have the wrong dimension")
+            if base.shape[0] != len(records):
+                # An append was interrupted between the two files; keep the common prefix
+                count = min(base.shape[0], len(records))
+                print(f"⚠ Long-term memory at {self.path} was partially written; keeping {count} entries")
+                base, records = base[:count], records[:count]
+                self.dirty = True
+            self._base, self.records = base, records
+        except Exception as e:
+            print(f"⚠ Failed to load long-term memory at {self.path}: {e}")
+            # Don't append to unreadable files; the next save replaces them
+            self.dirty = True
+
+    def _append(self, vectors: np.ndarray, records: List[Dict[str, Any]]):
+        """Persist one added batch by appending to both files (caller holds the lock)"""
+        vectors_file = self.path / "vectors.npy"
+        records_file = self.path / "records.jsonl"
+        if not vectors_file.exists() or not records_file.exists():
+            # Nothing on disk yet: write the whole partition
+            self.dirty = True
+            self.save()
+            return
+
+        try:
+            if not _append_rows(vectors_file, vectors):
+                self.dirty = True
+                self.save()
+                return
+            with open(records_file, "a") as f:
+                f.write("".join(json.dumps(record) + "\n" for record in records))
+        except Exception as e:
+            # Rewritten in full by the next save (flush, eviction or compaction)
+            print(f"⚠ Long-term memory append failed at {self.path}: {e}")
+            self.dirty = True
+
+    def save(self):
+        """Write vectors and records atomically (only if appends couldn't keep the files current)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            # Under the lock, so no append lands in a file that is about to be replaced
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp_vectors = self.path / "vectors.tmp.npy"
+            tmp_records = self.path / "records.jsonl.tmp"
+            np.save(tmp_vectors, self.matrix())
+            with open(tmp_records, "w") as f:
+                for record in self.records:
+                    f.write(json.dumps(record) + "\n")
+            os.replace(tmp_vectors, self.path / "vectors.npy")
+            os.replace(tmp_records, self.path / "records.jsonl")
+            self.dirty = False
+
+    # -------------------------------
+    # DATA
+    # -------------------------------
+
+    def _tail_block(self) -> np.ndarray:
+        """Vectors added since the base was loaded or compacted, as one array"""
+        if len(self._tail) > 1:
+            self._tail = [np.vstack(self._tail)]
+        return self._tail[0] if self._tail else np.zeros((0, self.dimension), dtype=np.float32)
+
+    def matrix(self) -> np.ndarray:
+        """All vectors as one in-memory matrix (a copy; the base stays memory-mapped)"""
+        with self.lock:
+            return np.vstack([np.asarray(self._base), self._tail_block()])
+
+    def add(self, vectors: np.ndarray, records: List[Dict[str, Any]]):
+        with self.lock:
+            vectors = _normalize(vectors)
+            self._tail.append(vectors)
+            self.records.extend(records)
+            if self.dirty:
+                self.save()
+            else:
+                self._append(vectors, records)
+
+    def search(self, query: np.ndarray, k: int) -> List[Dict[str, Any]]:
+        with self.lock:
+            if not self.records:
+                return []
+            # Score the mapped base and the in-memory tail separately instead of
+            # copying the base into a combined matrix after every add
+            scores = self._base @ query
+            tail = self._tail_block()
+            if len(tail):
+                scores = np.concatenate([scores, tail @ query])
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [{**self.records[i], "score": float(scores[i])} for i in top]
+
+    def needs_compaction(self) -> bool:
+        """Over capacity and no background compaction already scheduled"""
+        return len(self.records) > self.max_entries and not self.compacting
+
+    def compact(self):
+        """
+        Merge the oldest turns into summary entries until the partition is back
+        under 75% of capacity. Summary vectors are the normalized mean of their
+        members; text keeps the first line of each merged turn.
+        """
+        with self.compact_lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        with self.lock:
+            matrix = self.matrix()
+            records = list(self.records)
+            target = int(self.max_entries * 0.75)
+
+        if len(records) <= target:
+            return
+
+        # Merge the oldest raw turns (right after existing summaries); only
+        # re-merge summaries once there aren't enough raw turns left
+        excess = len(records) - target
+        span = excess + (excess + self.compact_group - 2) // (self.compact_group - 1)
+        head = 0
+        while head < len(records) and records[head].get("kind") == "summary":
+            head += 1
+        if len(records) - head < span:
+            head = 0
+        end = min(len(records), head + span)
+
+        merged_vectors, merged_records = [], []
+        for start in range(head, end, self.compact_group):
+            group = records[start:min(start + self.compact_group, end)]
+            vector = matrix[start:start + len(group)].mean(axis=0)
+            snippets = [r["text"].split("\n")[0][:120] for r in group]
+            merged_vectors.append(vector)
+            merged_records.append({
+                "text": "Summary of earlier conversations:\n" + "\n".join(f"- {s}" for s in snippets),
+                "kind": "summary",
+                "turns": sum(r.get("turns", 1) for r in group),
+                "from": group[0].get("from", group[0].get("timestamp")),
+                "to": group[-1].get("to", group[-1].get("timestamp"))
+            })
+
+        new_matrix = np.vstack([matrix[:head], _normalize(np.array(merged_vectors)), matrix[end:]])
+        with self.lock:
+            # Turns appended while we were compacting stay at the end
+            appended = self.records[len(records):]
+            appended_vectors = self.matrix()[len(records):]
+            self._base = np.vstack([new_matrix, appended_vectors]).astype(np.float32)
+            self._tail = []
+            self.records = records[:head] + merged_records + records[end:] + appended
+            self.dirty = True
+
+
+class PartitionedMemoryStore:
+    """
+    Per-user long-term memory with bounded partitions and background compaction.
+    """
+
+    def __init__(
+        self,
+        storage_dir: str = None,
+        max_entries: int = None,
+        compact_group: int = None,
+        max_loaded_partitions: int = 64,
+        embeddings=None
+    ):
+        """
+        Args:
+            storage_dir: Root directory for partitions
+            max_entries: Max vectors per user before compaction
+            compact_group: Number of old entries merged into one summary vector
+            max_loaded_partitions: Partitions kept in memory (LRU)
+            embeddings: LangChain embeddings (defaults to shared local model)
+        """
+        self.storage_dir = Path(storage_dir or os.getenv("LONG_TERM_MEMORY_DIR", "data/long_term_memory"))
+        self.max_entries = max_entries or int(os.getenv("LONG_TERM_MAX_ENTRIES", "2000"))
+        self.compact_group = max(2, compact_group or int(os.getenv("LONG_TERM_COMPACT_GROUP", "10")))
+        self.max_loaded_partitions = max_loaded_partitions
+        self._embeddings = embeddings
+        self._dimension: Optional[int] = None
+
+        self._partitions: "OrderedDict[str, UserMemoryPartition]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-compaction")
+        self.stats = {"turns_added": 0, "searches": 0, "compactions": 0}
+
+    # -------------------------------
+    # PUBLIC API
+    # -------------------------------
+
+    def add_turns(self, user_id: str, texts: List[str]):
+        """Embed (in one batch) and store conversation turns for a user"""
+        if not texts:
+            return
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        self.add_vectors(user_id, vectors, texts)
+
+    def add_vectors(self, user_id: str, vectors: np.ndarray, texts: List[str]):
+        """Store pre-computed embeddings for a user's turns"""
+        now = datetime.now().isoformat()
+        records = [{"text": t, "kind": "turn", "turns": 1, "timestamp": now} for t in texts]
+        partition = self._partition(user_id, vectors.shape[1])
+        partition.add(vectors, records)
+        with self._lock:
+            self.stats["turns_added"] += len(texts)
+
+        if len(partition) > self.max_entries * 2:
+            # Compactor has fallen far behind; bound the partition inline (this
+            # waits for a compaction already running, then compacts what's left)
+            self._compact(partition, background=False)
+        elif partition.needs_compaction():
+            partition.compacting = True
+            self._compactor.submit(self._compact, partition)
+
+    def search(self, user_id: str, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        """Most relevant past turns (or turn summaries) for the query"""
+        vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        return self.search_vector(user_id, vector, k)
+
+    def search_vector(self, user_id: str, vector: np.ndarray, k: int = 3) -> List[Dict[str, Any]]:
+        partition = self._partition(user_id, vector.shape[0])
+        with self._lock:
+            self.stats["searches"] += 1
+        return partition.search(_normalize(vector), k)
+
+    def render(self, user_id: str, query: str, k: int = 3) -> str:
+        """Past conversation snippets formatted for the prompt"""
+        results = self.search(user_id, query, k)
+        return "\n\n".join(r["text"] for r in results)
+
+    def flush(self):
+        """Persist every loaded partition"""
+        with self._lock:
+            partitions = list(self._partitions.values())
+        for partition in partitions:
+            partition.save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "loaded_partitions": len(self._partitions),
+                "max_entries_per_user": self.max_entries
+            }
+
+    # -------------------------------
+    # HELPERS
+    # -------------------------------
+
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            from agent.local_embeddings import get_local_embeddings
+            self._embeddings = get_local_embeddings()
+        return self._embeddings
+
+    def _partition(self, user_id: str, dimension: int) -> UserMemoryPartition:
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", user_id or "anonymous")
+        evicted = None
+        with self._lock:
+            partition = self._partitions.get(safe_id)
+            if partition is None:
+                partition = UserMemoryPartition(
+                    self.storage_dir / safe_id, dimension, self.max_entries, self.compact_group
+                )
+                self._partitions[safe_id] = partition
+                if len(self._partitions) > self.max_loaded_partitions:
+                    _, evicted = self._partitions.popitem(last=False)
+            self._partitions.move_to_end(safe_id)
+
+        if evicted is not None:
+            evicted.save()
+        return partition
+
+    def _compact(self, partition: UserMemoryPartition, background: bool = True):
+        try:
+            partition.compact()
+            partition.save()
+            with self._lock:
+                self.stats["compactions"] += 1
+        except Exception as e:
+            print(f"⚠ Long-term memory compaction failed: {e}")
+        finally:
+            if background:
+                partition.compacting = False
+
+
+# Singleton instance
+_long_term_store_instance = None
+
+def get_long_term_store() -> PartitionedMemoryStore:
+    """Get or create the shared long-term memory store"""
+    global _long_term_store_instance
+    if _long_term_store_instance is None:
+        _long_term_store_instance = PartitionedMemoryStore()
+    return _long_term_store_instance
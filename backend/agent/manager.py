@@ -5,6 +5,15 @@ Agent Manager for handling multiple agents (Personal Advisor vs Gig Worker Agent
 from agent.financial_agent import get_agent as get_personal_agent
 from agent.gig_agent import get_gig_agent
 from agent.user_manager import get_user_manager
+from agent.fast_path import get_fast_path_router
+from agent.response_cache import get_response_cache
+from agent.tool_cache import get_tool_cache
+from agent.memory_writer import get_memory_writer
+from agent.long_term_store import get_long_term_store
+from agent.proactive_scheduler import get_proactive_scheduler
+from agent.notification_store import get_notification_store
+from agent.notification_hub import get_notification_hub
+from services import get_aa_client, get_transaction_store, get_portfolio_cache
 
 class AgentManager:
     """
@@ -31,7 +40,7 @@ class AgentManager:
             return True
         return False
     
-    def chat(self, message: str, agent_id: str = None, user_id: str = None) -> str:
+    def chat(self, message: str, agent_id: str = None, user_id: str = None, use_cache: bool = True) -> str:
         """
         Routes chat to the specified agent or the active one.
         Updates user context if user_id changes.
@@ -52,21 +61,48 @@ class AgentManager:
                     agent.memory_manager.static_memory = StaticUserProfileMemory(user_id=user_id)
                     
                     # Clear short-term memory on user switch to avoid context leak
+                    # (after any deferred writes of the previous user have landed)
+                    agent.memory_writer.settle(agent.memory_manager)
                     agent.memory_manager.short_term_memory.clear()
+                    agent.context_assembler.reset(user_id)
+                    
+                    agent.user_id = user_id
 
         # 2. Handle Agent Switch
         if agent_id and agent_id in self.agents:
             self.active_agent_id = agent_id
             
         agent = self.get_active_agent()
-        return agent.chat(message)
+        return agent.chat(message, use_cache=use_cache)
         
-    def get_unread_messages(self):
-        """Collects unread messages from ALL agents"""
-        all_messages = []
-        for agent in self.agents.values():
-            all_messages.extend(agent.get_unread_messages())
-        return all_messages
+    def get_unread_messages(self, user_id: str = None, mark_read: bool = True):
+        """Unread notifications from ALL agents for a user (defaults to the active user)"""
+        return get_notification_store().get_unread(user_id or self.user_manager.active_user_id, mark_read=mark_read)
+    
+    def get_metrics(self) -> dict:
+        """Performance counters for the chat pipeline"""
+        return {
+            "fast_path": get_fast_path_router().get_stats(),
+            "response_cache": get_response_cache().get_stats(),
+            "tool_cache": get_tool_cache().get_stats(),
+            "memory_writer": get_memory_writer().get_stats(),
+            "long_term_memory": get_long_term_store().get_stats(),
+            "proactive": get_proactive_scheduler().get_stats(),
+            "notifications": get_notification_store().get_stats(),
+            "notification_push": get_notification_hub().get_stats(),
+            "aa_cache": get_aa_client().get_cache_stats(),
+            "transaction_store": get_transaction_store().get_stats(),
+            "portfolio_cache": get_portfolio_cache().get_stats(),
+            "context": {
+                agent_id: agent.context_assembler.get_stats()
+                for agent_id, agent in self.agents.items()
+            },
+            "parallel_tools": {
+                agent_id: agent.agent_executor.parallel_stats.as_dict()
+                for agent_id, agent in self.agents.items()
+                if hasattr(agent.agent_executor, "parallel_stats")
+            }
+        }
 
 # Singleton
 _manager_instance = None
@@ -0,0 +1,240 @@
+"""
+Write-behind persistence for conversation memory.
+MemoryManager.save_context (short-term append + long-term embedding) runs on a
+background worker after the response has been returned; with a partitioned
+long-term store only the short-term append goes through the MemoryManager. Writes are drained in
+batches; a per-session barrier guarantees the next turn of the same session
+sees its own writes.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class MemoryWriteBehind:
+    """
+    Background queue for MemoryManager.save_context calls.
+    """
+
+    def __init__(self, batch_size: int = None, batch_window: float = None, long_term_store=None):
+        """
+        Args:
+            batch_size: Max writes handled per worker wake-up
+            batch_window: Seconds to wait for more writes before processing a batch
+            long_term_store: PartitionedMemoryStore receiving each batch's turns
+                             (embedded in a single call per user) in place of
+                             MemoryManager's long-term memory
+        """
+        self.long_term_store = long_term_store
+        self.batch_size = batch_size or int(os.getenv("MEMORY_WRITE_BATCH_SIZE", "16"))
+        self.batch_window = batch_window if batch_window is not None else float(os.getenv("MEMORY_WRITE_BATCH_WINDOW", "0.05"))
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pending: Dict[int, int] = defaultdict(int)
+        # Per-session write lock, so an inline settle and the worker never write one session at once
+        self._session_locks: Dict[int, threading.RLock] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._worker.start()
+
+        self.stats = {
+            "queued": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "write_seconds": 0.0
+        }
+
+    # -------------------------------
+    # PUBLIC API
+    # -------------------------------
+
+    def submit(self, memory_manager, inputs: Dict[str, Any], outputs: Dict[str, Any], user_id: Optional[str] = None):
+        """
+        Queue a save_context call for the given memory manager.
+        Falls back to a synchronous write once the writer has been shut down.
+        """
+        with self._cond:
+            closed = self._closed
+            if not closed:
+                self._pending[id(memory_manager)] += 1
+                self.stats["queued"] += 1
+
+        if closed:
+            self._write_batch([(memory_manager, inputs, outputs, user_id)], track=False)
+            return
+        self._queue.put((memory_manager, inputs, outputs, user_id))
+
+    def wait_for(self, memory_manager, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Read-your-writes barrier: block until every queued write for this
+        memory manager has been applied.
+
+        Returns:
+            True if all writes were applied within the timeout
+        """
+        key = id(memory_manager)
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending.get(key, 0) == 0, timeout=timeout)
+
+    def settle(self, memory_manager, timeout: Optional[float] = 10.0) -> bool:
+        """
+        wait_for, but if the worker hasn't got to this session's writes within
+        the timeout they are taken off the queue and applied inline, after any
+        of the session's writes the worker already holds (earlier turns) have
+        landed, so writes still apply in submission order.
+
+        Returns:
+            True if every write for this memory manager has been applied; False
+            if the worker is still stuck on an earlier one (the rest stay queued)
+        """
+        if self.wait_for(memory_manager, timeout=timeout):
+            return True
+
+        key = id(memory_manager)
+        with self._queue.mutex:
+            queued = [item for item in self._queue.queue if item is not None and item[0] is memory_manager]
+            for item in queued:
+                self._queue.queue.remove(item)
+
+        # Whatever is still pending beyond what we took is in the worker's hands
+        with self._cond:
+            ready = self._cond.wait_for(lambda: self._pending.get(key, 0) <= len(queued), timeout=timeout)
+        if not ready:
+            with self._queue.mutex:
+                self._queue.queue.extendleft(reversed(queued))
+                self._queue.not_empty.notify()
+            logger.warning(f"Memory writer is stuck on an earlier write for this session; "
+                           f"{len(queued)} writes left queued")
+            return False
+
+        logger.warning(f"Memory writes still pending after {timeout}s; applying {len(queued)} inline")
+        if queued:
+            # Held for the whole batch so a turn submitted meanwhile can't land in between
+            with self._session_lock(memory_manager):
+                self._write_batch(queued)
+        return True
+
+    def _session_lock(self, memory_manager) -> threading.RLock:
+        with self._cond:
+            return self._session_locks.setdefault(id(memory_manager), threading.RLock())
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Block until the queue is fully drained"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not any(self._pending.values()), timeout=timeout)
+
+    def shutdown(self, timeout: float = 30.0):
+        """Flush outstanding writes and stop the worker (FastAPI shutdown hook)"""
+        with self._cond:
+            self._closed = True
+        flushed = self.flush(timeout=timeout)
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+        if self.long_term_store is not None:
+            self.long_term_store.flush()
+        if not flushed:
+            logger.warning("Memory writer shut down with unflushed writes")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self.stats)
+            stats["pending"] = sum(self._pending.values())
+        stats["avg_write_ms"] = round(stats["write_seconds"] / stats["written"] * 1000, 2) if stats["written"] else 0.0
+        stats["write_seconds"] = round(stats["write_seconds"], 3)
+        return stats
+
+    # -------------------------------
+    # WORKER
+    # -------------------------------
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            # Collect a batch: whatever arrives within the window, up to batch_size
+            batch = [item]
+            deadline = time.monotonic() + self.batch_window
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    nxt = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch, track: bool = True):
+        started = time.perf_counter()
+        written = failed = 0
+        turns_by_user = defaultdict(list)
+
+        try:
+            # Writes for the same session are applied in submission order
+            for memory_manager, inputs, outputs, user_id in batch:
+                try:
+                    with self._session_lock(memory_manager):
+                        if user_id and self.long_term_store is not None:
+                            # Long-term goes to the partitioned store below; MemoryManager's
+                            # own long-term write would embed the turn a second time
+                            memory_manager.short_term_memory.save_context(inputs, outputs)
+                        else:
+                            memory_manager.save_context(inputs, outputs)
+                    written += 1
+                except Exception as e:
+                    failed += 1
+                    logger.warning(f"Deferred memory write failed: {e}")
+                if user_id and self.long_term_store is not None:
+                    turns_by_user[user_id].append(f"User: {inputs.get('input', '')}\nAssistant: {outputs.get('output', '')}")
+
+            # One embedding call per user for the whole batch
+            for user_id, texts in turns_by_user.items():
+                try:
+                    self.long_term_store.add_turns(user_id, texts)
+                except Exception as e:
+                    logger.warning(f"Long-term memory write failed: {e}")
+        finally:
+            if track:
+                with self._cond:
+                    for memory_manager, *_ in batch:
+                        key = id(memory_manager)
+                        self._pending[key] -= 1
+                        if self._pending[key] <= 0:
+                            del self._pending[key]
+                            self._session_locks.pop(key, None)
+                    self._cond.notify_all()
+
+        with self._cond:
+            self.stats["written"] += written
+            self.stats["failed"] += failed
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            self.stats["write_seconds"] += time.perf_counter() - started
+
+
+# Singleton instance
+_memory_writer_instance = None
+
+def get_memory_writer() -> MemoryWriteBehind:
+    """Get or create the shared memory writer"""
+    global _memory_writer_instance
+    if _memory_writer_instance is None:
+        from agent.long_term_store import get_long_term_store
+        _memory_writer_instance = MemoryWriteBehind(long_term_store=get_long_term_store())
+    return _memory_writer_instance
@@ -0,0 +1,274 @@
+"""
+Push delivery of proactive notifications.
+Connected clients (SSE streams and long-poll requests) subscribe per user; a
+notification stored by any thread is handed to their asyncio queues with
+call_soon_threadsafe, so an idle connection costs one small queue and a
+suspended coroutine rather than a polling loop. With the SQLite notification
+store, one tail task per worker also picks up notifications written by other
+worker processes.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Dict, Any, AsyncIterator, List, Optional, Set
+
+from agent.notification_store import get_notification_store
+
+
+class _Subscriber:
+    __slots__ = ("user_id", "queue", "loop", "last_seq", "overflowed")
+
+    def __init__(self, user_id: str, loop: asyncio.AbstractEventLoop, after_seq: int, max_queue: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.loop = loop
+        self.last_seq = after_seq
+        self.overflowed = False
+
+    def offer(self, message: Dict[str, Any]):
+        """Runs on the subscriber's event loop"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow consumer: it re-reads from the store instead
+            self.overflowed = True
+
+
+class NotificationHub:
+    """
+    Fans stored notifications out to subscribed connections.
+    """
+
+    def __init__(self, store=None, keepalive_seconds: float = None, max_queue: int = 100,
+                 tail_seconds: float = None):
+        """
+        Args:
+            store: Notification store (defaults to the shared one)
+            keepalive_seconds: Interval of SSE keep-alive comments on idle streams
+            max_queue: Buffered messages per subscriber before it falls back to the store
+            tail_seconds: Poll interval for notifications written by other processes
+                          (SQLite store only)
+        """
+        self.store = store or get_notification_store()
+        self.keepalive_seconds = keepalive_seconds or float(os.getenv("NOTIFICATIONS_KEEPALIVE_SECONDS", "15"))
+        self.tail_seconds = tail_seconds or float(os.getenv("NOTIFICATIONS_TAIL_SECONDS", "2"))
+        self.max_queue = max_queue
+
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._tail_task: Optional[asyncio.Task] = None
+        # Cross-process tail cursor, and local publishes it hasn't reached yet;
+        # together they make sure each notification is fanned out once
+        self._tail_seq: Optional[int] = None
+        self._local_seqs: Set[int] = set()
+        self.stats = {"published": 0, "delivered": 0, "connections_total": 0, "overflows": 0}
+
+    # -------------------------------
+    # PUBLISHING (any thread)
+    # -------------------------------
+
+    def publish(self, message: Dict[str, Any]):
+        """Hand a stored notification to every subscriber of its user"""
+        seq = message.get("seq")
+        with self._lock:
+            if self._tail_seq is not None and seq is not None:
+                if seq <= self._tail_seq:
+                    return   # the tail has already delivered it
+                self._local_seqs.add(seq)
+        self._deliver(message)
+
+    def _deliver(self, message: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers.get(message.get("user_id"), ()))
+            self.stats["published"] += 1
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, message)
+            except RuntimeError:
+                # Loop already closed; the connection is going away
+                pass
+
+    # -------------------------------
+    # SUBSCRIBING (event loop)
+    # -------------------------------
+
+    def subscribe(self, user_id: str, after_seq: int = 0) -> _Subscriber:
+        sub = _Subscriber(user_id, asyncio.get_running_loop(), after_seq, self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(sub)
+            self.stats["connections_total"] += 1
+        self._ensure_tail()
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber):
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.user_id]
+
+    async def _take(self, sub: _Subscriber, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop anything the subscriber has already seen; advance its cursor"""
+        fresh = [m for m in messages if m["seq"] > sub.last_seq]
+        if fresh:
+            sub.last_seq = fresh[-1]["seq"]
+            # Store calls block (SQLite), so they stay off the event loop
+            await asyncio.to_thread(self.store.mark_read, sub.user_id, sub.last_seq)
+            with self._lock:
+                self.stats["delivered"] += len(fresh)
+        return fresh
+
+    async def _next_batch(self, sub: _Subscriber, timeout: float) -> List[Dict[str, Any]]:
+        """Wait up to timeout for new notifications (empty list on timeout)"""
+        if sub.overflowed:
+            sub.overflowed = False
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+            with self._lock:
+                self.stats["overflows"] += 1
+            return await self._take(sub, await asyncio.to_thread(self.store.get_since, sub.user_id, sub.last_seq))
+
+        try:
+            first = await asyncio.wait_for(sub.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+        batch = [first]
+        while not sub.queue.empty():
+            batch.append(sub.queue.get_nowait())
+        return await self._take(sub, batch)
+
+    async def stream(self, user_id: str, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Server-Sent Events for a user: unread backlog first, then live notifications.
+
+        Args:
+            user_id: User to stream for
+            last_event_id: Last-Event-ID sent by a reconnecting EventSource
+        """
+        after = self._parse_seq(last_event_id)
+        sub = self.subscribe(user_id, after)
+        try:
+            # Subscribe before reading the backlog so nothing falls in between
+            backlog = await (
+                asyncio.to_thread(self.store.get_since, user_id, after) if last_event_id is not None
+                else asyncio.to_thread(self.store.get_unread, user_id, mark_read=False)
+            )
+            yield "retry: 5000\n\n"
+            for message in await self._take(sub, backlog):
+                yield self._format(message)
+
+            while True:
+                batch = await self._next_batch(sub, self.keepalive_seconds)
+                if not batch:
+                    yield ": keepalive\n\n"
+                for message in batch:
+                    yield self._format(message)
+        finally:
+            self.unsubscribe(sub)
+
+    async def wait(self, user_id: str, timeout: float = 25.0) -> List[Dict[str, Any]]:
+        """
+        Long-poll fallback: return unread notifications immediately, or wait up
+        to timeout for the next one.
+        """
+        # Subscribe first so a notification stored right after the read isn't missed
+        sub = self.subscribe(user_id)
+        try:
+            unread = await asyncio.to_thread(self.store.get_unread, user_id)
+            if unread:
+                with self._lock:
+                    self.stats["delivered"] += len(unread)
+                return unread
+
+            try:
+                await asyncio.wait_for(sub.queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return []
+            # The store's cursor decides what is still unread (another poll may have taken it)
+            messages = await asyncio.to_thread(self.store.get_unread, user_id)
+            with self._lock:
+                self.stats["delivered"] += len(messages)
+            return messages
+        finally:
+            self.unsubscribe(sub)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "connections": sum(len(s) for s in self._subscribers.values()),
+                "subscribed_users": len(self._subscribers)
+            }
+
+    # -------------------------------
+    # HELPERS
+    # -------------------------------
+
+    @staticmethod
+    def _parse_seq(event_id: Optional[str]) -> int:
+        if not event_id:
+            return 0
+        try:
+            return int(str(event_id).rsplit("-", 1)[-1])
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def _format(message: Dict[str, Any]) -> str:
+        return f"id: {message['seq']}\nevent: notification\ndata: {json.dumps(message)}\n\n"
+
+    def _ensure_tail(self):
+        """Start the cross-process tail once per worker (SQLite store only)"""
+        if not hasattr(self.store, "get_all_since"):
+            return
+        if self._tail_task is None or self._tail_task.done():
+            self._tail_task = asyncio.get_running_loop().create_task(self._tail())
+
+    async def _tail(self):
+        last_seq = await asyncio.to_thread(self.store.latest_global_seq)
+        self._advance_tail(last_seq)
+        while True:
+            await asyncio.sleep(self.tail_seconds)
+            with self._lock:
+                idle = not self._subscribers
+            try:
+                if idle:
+                    # Nobody to deliver to; skip what arrives meanwhile instead of
+                    # replaying it to the next subscriber (it reads its own backlog)
+                    last_seq = await asyncio.to_thread(self.store.latest_global_seq)
+                    self._advance_tail(last_seq)
+                    continue
+                messages = await asyncio.to_thread(self.store.get_all_since, last_seq)
+            except Exception as e:
+                print(f"⚠ Notification tail failed: {e}")
+                continue
+            for message in messages:
+                last_seq = message["seq"]
+                with self._lock:
+                    published = last_seq in self._local_seqs
+                    self._local_seqs.discard(last_seq)
+                    self._tail_seq = last_seq
+                if not published:
+                    self._deliver(message)
+            self._advance_tail(last_seq)
+
+    def _advance_tail(self, seq: int):
+        """Move the tail cursor and forget local publishes it has passed"""
+        with self._lock:
+            self._tail_seq = max(seq, self._tail_seq or 0)
+            if self._local_seqs:
+                self._local_seqs = {s for s in self._local_seqs if s > self._tail_seq}
+
+
+# Singleton instance
+_notification_hub_instance = None
+
+def get_notification_hub() -> NotificationHub:
+    """Get or create the shared notification hub"""
+    global _notification_hub_instance
+    if _notification_hub_instance is None:
+        _notification_hub_instance = NotificationHub()
+    return _notification_hub_instance
@@ -0,0 +1,294 @@
+"""
+Per-user store for proactive notifications.
+Each user has a bounded ring buffer of notifications with monotonic sequence
+numbers and a read cursor, so reading unread messages costs O(unread) rather
+than a scan of everything ever queued. Set NOTIFICATIONS_DB to a SQLite path to
+persist notifications across restarts and share them between uvicorn workers.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+def _message(seq: int, user_id: str, agent_id: str, topic: str, content: str, timestamp: str) -> Dict[str, Any]:
+    return {
+        "id": f"notif-{seq}",
+        "seq": seq,
+        "user_id": user_id,
+        "agent_id": agent_id,
+        "timestamp": timestamp,
+        "topic": topic,
+        "content": content
+    }
+
+
+class InMemoryNotificationStore:
+    """
+    Ring buffer of notifications per user, held in process memory.
+    """
+
+    def __init__(self, max_per_user: int = None):
+        """
+        Args:
+            max_per_user: Notifications kept per user (oldest are dropped)
+        """
+        self.max_per_user = max_per_user or int(os.getenv("NOTIFICATIONS_MAX_PER_USER", "200"))
+        self._buffers: Dict[str, deque] = {}
+        self._cursors: Dict[str, int] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.stats = {"added": 0, "read": 0, "evicted": 0}
+
+    def add(self, user_id: str, topic: str, content: str, agent_id: str = None) -> Dict[str, Any]:
+        """Append a notification for a user and return it"""
+        with self._lock:
+            self._seq += 1
+            message = _message(self._seq, user_id, agent_id, topic, content, datetime.now().isoformat())
+            buffer = self._buffers.setdefault(user_id, deque(maxlen=self.max_per_user))
+            if len(buffer) == buffer.maxlen:
+                self.stats["evicted"] += 1
+            buffer.append(message)
+            self.stats["added"] += 1
+        return message
+
+    def get_since(self, user_id: str, after_seq: int = 0, limit: int = None) -> List[Dict[str, Any]]:
+        """Notifications newer than after_seq, oldest first (does not move the cursor)"""
+        with self._lock:
+            newer = self._since(user_id, after_seq)
+        return newer[:limit] if limit else newer
+
+    def get_unread(self, user_id: str, mark_read: bool = True) -> List[Dict[str, Any]]:
+        """Unread notifications for a user, oldest first"""
+        # Read and cursor move are one step, so concurrent readers never both get a message
+        with self._lock:
+            messages = self._since(user_id, self._cursors.get(user_id, 0))
+            if mark_read and messages:
+                self._advance(user_id, messages[-1]["seq"])
+        return messages
+
+    def mark_read(self, user_id: str, up_to_seq: int):
+        """Move the user's read cursor forward (never backwards)"""
+        with self._lock:
+            self._advance(user_id, up_to_seq)
+
+    def unread_count(self, user_id: str) -> int:
+        with self._lock:
+            return len(self._since(user_id, self._cursors.get(user_id, 0)))
+
+    def _since(self, user_id: str, after_seq: int) -> List[Dict[str, Any]]:
+        """get_since body; caller holds the lock"""
+        buffer = self._buffers.get(user_id)
+        if not buffer:
+            return []
+        # Walk back from the newest entry; stops at the first already-seen one
+        newer = []
+        for message in reversed(buffer):
+            if message["seq"] <= after_seq:
+                break
+            newer.append(message)
+        newer.reverse()
+        return newer
+
+    def _advance(self, user_id: str, up_to_seq: int):
+        """mark_read body; caller holds the lock"""
+        previous = self._cursors.get(user_id, 0)
+        if up_to_seq > previous:
+            self._cursors[user_id] = up_to_seq
+            self.stats["read"] += sum(
+                1 for m in self._buffers.get(user_id, ()) if previous < m["seq"] <= up_to_seq
+            )
+
+    def latest_seq(self, user_id: str) -> int:
+        with self._lock:
+            buffer = self._buffers.get(user_id)
+            return buffer[-1]["seq"] if buffer else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "backend": "memory",
+                "users": len(self._buffers),
+                "stored": sum(len(b) for b in self._buffers.values()),
+                "max_per_user": self.max_per_user
+            }
+
+
+class SQLiteNotificationStore:
+    """
+    Same interface as InMemoryNotificationStore, persisted to SQLite (WAL mode)
+    so every worker process sees the same notifications and cursors.
+    """
+
+    def __init__(self, db_path: str, max_per_user: int = None):
+        """
+        Args:
+            db_path: SQLite database file
+            max_per_user: Notifications kept per user (oldest are dropped)
+        """
+        self.db_path = db_path
+        self.max_per_user = max_per_user or int(os.getenv("NOTIFICATIONS_MAX_PER_USER", "200"))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {"added": 0, "read": 0, "evicted": 0}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS notifications (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    agent_id TEXT,
+                    topic TEXT,
+                    content TEXT,
+                    timestamp TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_notifications_user_seq ON notifications (user_id, seq);
+                CREATE TABLE IF NOT EXISTS notification_cursors (
+                    user_id TEXT PRIMARY KEY,
+                    last_read INTEGER NOT NULL
+                );
+            """)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        return _message(row["seq"], row["user_id"], row["agent_id"], row["topic"], row["content"], row["timestamp"])
+
+    def add(self, user_id: str, topic: str, content: str, agent_id: str = None) -> Dict[str, Any]:
+        """Append a notification for a user and return it"""
+        timestamp = datetime.now().isoformat()
+        with self._conn() as conn:
+            seq = conn.execute(
+                "INSERT INTO notifications (user_id, agent_id, topic, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (user_id, agent_id, topic, content, timestamp)
+            ).lastrowid
+            # Trim the user's ring buffer
+            evicted = conn.execute(
+                """DELETE FROM notifications WHERE user_id = ? AND seq <= (
+                       SELECT seq FROM notifications WHERE user_id = ?
+                       ORDER BY seq DESC LIMIT 1 OFFSET ?
+                   )""",
+                (user_id, user_id, self.max_per_user)
+            ).rowcount
+        with self._lock:
+            self.stats["added"] += 1
+            self.stats["evicted"] += max(0, evicted)
+        return _message(seq, user_id, agent_id, topic, content, timestamp)
+
+    def get_since(self, user_id: str, after_seq: int = 0, limit: int = None) -> List[Dict[str, Any]]:
+        """Notifications newer than after_seq, oldest first (does not move the cursor)"""
+        rows = self._conn().execute(
+            "SELECT * FROM notifications WHERE user_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (user_id, after_seq, limit or -1)
+        ).fetchall()
+        return [self._row(r) for r in rows]
+
+    def _cursor(self, conn: sqlite3.Connection, user_id: str) -> int:
+        row = conn.execute("SELECT last_read FROM notification_cursors WHERE user_id = ?", (user_id,)).fetchone()
+        return row["last_read"] if row else 0
+
+    def get_unread(self, user_id: str, mark_read: bool = True) -> List[Dict[str, Any]]:
+        """Unread notifications for a user, oldest first"""
+        conn = self._conn()
+        if not mark_read:
+            return self.get_since(user_id, self._cursor(conn, user_id))
+
+        # Read and advance the cursor in one write transaction so two workers
+        # polling for the same user never both deliver a message
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT * FROM notifications WHERE user_id = ? AND seq > ? ORDER BY seq",
+                (user_id, self._cursor(conn, user_id))
+            ).fetchall()
+            if rows:
+                self._advance(conn, user_id, rows[-1]["seq"])
+        with self._lock:
+            self.stats["read"] += len(rows)
+        return [self._row(r) for r in rows]
+
+    @staticmethod
+    def _advance(conn: sqlite3.Connection, user_id: str, up_to_seq: int):
+        conn.execute(
+            """INSERT INTO notification_cursors (user_id, last_read) VALUES (?, ?)
+               ON CONFLICT(user_id) DO UPDATE SET last_read = MAX(last_read, excluded.last_read)""",
+            (user_id, up_to_seq)
+        )
+
+    def mark_read(self, user_id: str, up_to_seq: int):
+        """Move the user's read cursor forward (never backwards)"""
+        conn = self._conn()
+        with conn:
+            previous = self._cursor(conn, user_id)
+            self._advance(conn, user_id, up_to_seq)
+            read = conn.execute(
+                "SELECT COUNT(*) FROM notifications WHERE user_id = ? AND seq > ? AND seq <= ?",
+                (user_id, previous, up_to_seq)
+            ).fetchone()[0]
+        with self._lock:
+            self.stats["read"] += read
+
+    def unread_count(self, user_id: str) -> int:
+        conn = self._conn()
+        return conn.execute(
+            "SELECT COUNT(*) FROM notifications WHERE user_id = ? AND seq > ?",
+            (user_id, self._cursor(conn, user_id))
+        ).fetchone()[0]
+
+    def latest_seq(self, user_id: str) -> int:
+        row = self._conn().execute("SELECT MAX(seq) FROM notifications WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] or 0
+
+    def get_all_since(self, after_seq: int, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Notifications of every user newer than after_seq (cross-process tailing)"""
+        rows = self._conn().execute(
+            "SELECT * FROM notifications WHERE seq > ? ORDER BY seq LIMIT ?", (after_seq, limit)
+        ).fetchall()
+        return [self._row(r) for r in rows]
+
+    def latest_global_seq(self) -> int:
+        return self._conn().execute("SELECT MAX(seq) FROM notifications").fetchone()[0] or 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        users, stored = conn.execute("SELECT COUNT(DISTINCT user_id), COUNT(*) FROM notifications").fetchone()
+        with self._lock:
+            return {
+                **self.stats,
+                "backend": "sqlite",
+                "users": users,
+                "stored": stored,
+                "max_per_user": self.max_per_user
+            }
+
+
+# Singleton instance
+_notification_store_instance = None
+
+def get_notification_store():
+    """Get or create the notification store (SQLite if NOTIFICATIONS_DB is set)"""
+    global _notification_store_instance
+    if _notification_store_instance is None:
+        db_path = os.getenv("NOTIFICATIONS_DB")
+        if db_path:
+            _notification_store_instance = SQLiteNotificationStore(db_path)
+        else:
+            _notification_store_instance = InMemoryNotificationStore()
+    return _notification_store_instance
@@ -0,0 +1,196 @@
+"""
+Agent executor that runs independent tool calls of a single step concurrently.
+When the model emits several tool calls at once (e.g. analyze_transactions +
+generate_insights + fetch_market_data), they are dispatched on a shared thread
+pool instead of one after another, then reassembled in the original order.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional
+
+from langchain_classic.agents import AgentExecutor
+from langchain_core.agents import AgentStep
+from pydantic import PrivateAttr
+
+# Tools with side effects on shared state; a step containing one runs sequentially.
+# They run on their own small pool: a call can't be interrupted once started, so
+# one that times out keeps its worker until it finishes, and a stuck write must
+# not tie up the workers of the shared pool.
+SEQUENTIAL_TOOLS = {"update_user_context"}
+
+_tool_pool: Optional[ThreadPoolExecutor] = None
+_sequential_tool_pool: Optional[ThreadPoolExecutor] = None
+_tool_pool_lock = threading.Lock()
+
+
+def get_tool_pool() -> ThreadPoolExecutor:
+    """Shared worker pool for tool calls (sized by AGENT_TOOL_WORKERS)"""
+    global _tool_pool
+    with _tool_pool_lock:
+        if _tool_pool is None:
+            _tool_pool = ThreadPoolExecutor(
+                max_workers=int(os.getenv("AGENT_TOOL_WORKERS", "8")),
+                thread_name_prefix="agent-tool"
+            )
+        return _tool_pool
+
+
+def get_sequential_tool_pool() -> ThreadPoolExecutor:
+    """Separate bounded pool for SEQUENTIAL_TOOLS (sized by AGENT_SEQUENTIAL_TOOL_WORKERS)"""
+    global _sequential_tool_pool
+    with _tool_pool_lock:
+        if _sequential_tool_pool is None:
+            _sequential_tool_pool = ThreadPoolExecutor(
+                max_workers=int(os.getenv("AGENT_SEQUENTIAL_TOOL_WORKERS", "2")),
+                thread_name_prefix="agent-tool-seq"
+            )
+        return _sequential_tool_pool
+
+
+class _PendingObservation:
+    """Placeholder for a deferred tool call inside a step"""
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+class ParallelToolStats:
+    """Per-step wall time versus the sequential time the same calls would take"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = 0
+        self.parallel_steps = 0
+        self.tool_calls = 0
+        self.timeouts = 0
+        self.wall_seconds = 0.0
+        self.sequential_seconds = 0.0
+
+    def record(self, calls: int, wall: float, sequential: float, timeouts: int, parallel: bool):
+        with self._lock:
+            self.steps += 1
+            self.parallel_steps += int(parallel)
+            self.tool_calls += calls
+            self.timeouts += timeouts
+            self.wall_seconds += wall
+            self.sequential_seconds += sequential
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "steps": self.steps,
+                "parallel_steps": self.parallel_steps,
+                "tool_calls": self.tool_calls,
+                "timeouts": self.timeouts,
+                "wall_seconds": round(self.wall_seconds, 3),
+                "sequential_seconds": round(self.sequential_seconds, 3),
+                "saved_seconds": round(self.sequential_seconds - self.wall_seconds, 3),
+                "speedup": round(self.sequential_seconds / self.wall_seconds, 2) if self.wall_seconds else 1.0
+            }
+
+
+class ParallelAgentExecutor(AgentExecutor):
+    """
+    AgentExecutor that fans out the tool calls of one step onto a thread pool.
+
+    Planning is unchanged: the parent's step iterator is reused, with tool
+    execution deferred so every call of the step can be submitted at once.
+    """
+
+    tool_timeout: float = 20.0
+    """Default per-tool timeout in seconds"""
+
+    tool_timeouts: Dict[str, float] = {}
+    """Per-tool timeout overrides, keyed by tool name"""
+
+    _local: threading.local = PrivateAttr(default_factory=threading.local)
+    _stats: ParallelToolStats = PrivateAttr(default_factory=ParallelToolStats)
+
+    @property
+    def parallel_stats(self) -> ParallelToolStats:
+        return self._stats
+
+    def _perform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None) -> AgentStep:
+        deferred = getattr(self._local, "deferred", None)
+        if deferred is None:
+            return super()._perform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+
+        deferred.append(agent_action)
+        return AgentStep(action=agent_action, observation=_PendingObservation(len(deferred) - 1))
+
+    def _iter_next_step(self, name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager=None):
+        self._local.deferred = []
+        try:
+            items = list(super()._iter_next_step(
+                name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager
+            ))
+            actions = self._local.deferred
+        finally:
+            self._local.deferred = None
+
+        observations = self._run_actions(actions, name_to_tool_map, color_mapping, run_manager) if actions else []
+
+        for item in items:
+            if isinstance(item, AgentStep) and isinstance(item.observation, _PendingObservation):
+                yield AgentStep(action=item.action, observation=observations[item.observation.index])
+            else:
+                yield item
+
+    def _run_actions(self, actions, name_to_tool_map, color_mapping, run_manager) -> List[Any]:
+        """
+        Execute the step's tool calls, concurrently when safe, preserving order.
+        Every call runs on a pool worker so its timeout holds on the sequential
+        path too; a call still queued at its timeout is cancelled, one already
+        running is abandoned and its result discarded.
+        """
+        def run_one(index: int):
+            started = time.perf_counter()
+            observation = super(ParallelAgentExecutor, self)._perform_agent_action(
+                name_to_tool_map, color_mapping, actions[index], run_manager
+            ).observation
+            return observation, time.perf_counter() - started
+
+        def submit(index: int):
+            pool = get_sequential_tool_pool() if actions[index].tool in SEQUENTIAL_TOOLS else get_tool_pool()
+            return pool.submit(contextvars.copy_context().run, run_one, index)
+
+        # Durations are only written here, never by a worker that may outlive its timeout
+        observations, durations = [], []
+        timeouts = 0
+
+        def collect(index: int, future, timeout: float, deadline: float):
+            nonlocal timeouts
+            try:
+                observation, duration = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except FutureTimeoutError:
+                future.cancel()
+                timeouts += 1
+                observation, duration = f"Tool '{actions[index].tool}' timed out after {timeout:g}s", timeout
+            observations.append(observation)
+            durations.append(duration)
+
+        parallel = len(actions) > 1 and not any(a.tool in SEQUENTIAL_TOOLS for a in actions)
+        started = time.perf_counter()
+
+        if parallel:
+            futures = [submit(i) for i in range(len(actions))]
+            for i, future in enumerate(futures):
+                timeout = self.tool_timeouts.get(actions[i].tool, self.tool_timeout)
+                collect(i, future, timeout, started + timeout)
+        else:
+            for i in range(len(actions)):
+                timeout = self.tool_timeouts.get(actions[i].tool, self.tool_timeout)
+                collect(i, submit(i), timeout, time.perf_counter() + timeout)
+
+        wall = time.perf_counter() - started
+        sequential = sum(durations)
+        self._stats.record(len(actions), wall, sequential, timeouts, parallel)
+        if parallel:
+            print(f"⚡ Ran {len(actions)} tools in parallel: {wall:.2f}s (sequential ~{sequential:.2f}s)")
+
+        return observations
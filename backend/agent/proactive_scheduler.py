@@ -0,0 +1,406 @@
+"""
+Background scheduler for proactive notifications.
+Jobs fire on interval or cron-style triggers and fan out one check per user
+onto a bounded worker pool (by default only the active user, see
+get_proactive_scheduler). A (user, agent, topic) check that is already
+queued or running is coalesced, and users whose data version hasn't changed
+since the topic last ran are skipped. Checks run in an isolated agent context
+so they never touch the user's conversation memory.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from agent.data_version import get_data_version
+
+
+# -------------------------------
+# TRIGGERS
+# -------------------------------
+
+class IntervalTrigger:
+    """Fires every `seconds` seconds (first run one interval after start)"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+        self._next: Optional[float] = None
+
+    def is_due(self, now: float) -> bool:
+        if self._next is None:
+            self._next = now + self.seconds
+            return False
+        if now < self._next:
+            return False
+        # Skip missed intervals instead of firing a burst
+        while self._next <= now:
+            self._next += self.seconds
+        return True
+
+    def __repr__(self):
+        return f"every {self.seconds:g}s"
+
+
+class CronTrigger:
+    """
+    Minimal 5-field cron expression: minute hour day-of-month month day-of-week.
+    Each field accepts *, */n, a-b, a,b,c and plain numbers (day-of-week 0 = Sunday).
+    """
+
+    _RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self._allowed = [self._parse(f, lo, hi) for f, (lo, hi) in zip(fields, self._RANGES)]
+        self._last_minute: Optional[Tuple[int, ...]] = None
+
+    @staticmethod
+    def _parse(spec: str, lo: int, hi: int) -> Set[int]:
+        values = set()
+        for part in spec.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+            if part == "*":
+                start, end = lo, hi
+            elif "-" in part:
+                start, end = (int(x) for x in part.split("-", 1))
+            else:
+                start = end = int(part)
+            if start < lo or end > hi or step <= 0:
+                raise ValueError(f"Cron field {spec!r} out of range {lo}-{hi}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches(self, dt: datetime) -> bool:
+        minute, hour, dom, month, dow = self._allowed
+        return (
+            dt.minute in minute and dt.hour in hour and dt.day in dom and
+            dt.month in month and (dt.weekday() + 1) % 7 in dow
+        )
+
+    def is_due(self, now: float) -> bool:
+        dt = datetime.fromtimestamp(now)
+        minute_key = (dt.year, dt.month, dt.day, dt.hour, dt.minute)
+        # Fire at most once per matching minute
+        if minute_key == self._last_minute or not self.matches(dt):
+            return False
+        self._last_minute = minute_key
+        return True
+
+    def __repr__(self):
+        return f"cron({self.expression})"
+
+
+# -------------------------------
+# JOBS
+# -------------------------------
+
+@dataclass
+class ProactiveJob:
+    """A proactive check run for every user on a trigger"""
+    topic: str
+    prompt: str
+    trigger: Any
+    agent_id: str = "personal_advisor"
+    users: Optional[Callable[[], Iterable[str]]] = None  # defaults to the scheduler's list_users
+    skip_unchanged: bool = True
+
+
+@dataclass
+class _Task:
+    user_id: str
+    agent_id: str
+    topic: str
+    prompt: str
+    skip_unchanged: bool
+    queued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.user_id, self.agent_id, self.topic)
+
+
+DEFAULT_JOBS = [
+    ProactiveJob(
+        topic="Spending Alert",
+        prompt=(
+            "Review this user's recent transactions for unusual spending, overshooting "
+            "budgets or large upcoming outflows. If there is something the user should "
+            "know, write a short, friendly alert (max 60 words). Otherwise reply NO_ALERT."
+        ),
+        trigger=CronTrigger("0 9 * * *"),
+    ),
+    ProactiveJob(
+        topic="Goal Check-in",
+        prompt=(
+            "Check whether this user is on track for their financial goals this month. "
+            "If they are falling behind or a goal needs attention, write a short nudge "
+            "(max 60 words) with one concrete action. Otherwise reply NO_ALERT."
+        ),
+        trigger=CronTrigger("0 18 * * 0"),
+    ),
+]
+
+
+class ProactiveScheduler:
+    """
+    Runs proactive jobs for many users on a bounded worker pool.
+    """
+
+    def __init__(
+        self,
+        get_agent: Callable[[str], Any],
+        list_users: Callable[[], Iterable[str]] = None,
+        max_workers: int = None,
+        max_queue: int = None,
+        recheck_seconds: float = None,
+        tick_seconds: float = 1.0
+    ):
+        """
+        Args:
+            get_agent: Returns the agent instance for an agent id
+            list_users: Returns the user ids jobs run for by default
+            max_workers: Concurrent proactive checks
+            max_queue: Max checks waiting for a worker (extra checks are dropped)
+            recheck_seconds: Run a topic again after this long even if the data is unchanged
+            tick_seconds: How often triggers are evaluated
+        """
+        self.get_agent = get_agent
+        self.list_users = list_users or (lambda: [])
+        self.max_workers = max_workers or int(os.getenv("PROACTIVE_WORKERS", "4"))
+        self.max_queue = max_queue or int(os.getenv("PROACTIVE_MAX_QUEUE", "500"))
+        self.recheck_seconds = recheck_seconds or float(os.getenv("PROACTIVE_RECHECK_SECONDS", str(7 * 24 * 3600)))
+        self.tick_seconds = tick_seconds
+
+        self.jobs: List[ProactiveJob] = []
+        self._queue: "queue.Queue[Optional[_Task]]" = queue.Queue(maxsize=self.max_queue)
+        self._inflight: Set[Tuple[str, str, str]] = set()
+        self._last_runs: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+        self._completions: deque = deque()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running = 0
+
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "alerts": 0,
+            "failed": 0,
+            "coalesced": 0,
+            "skipped_unchanged": 0,
+            "dropped": 0,
+            "run_seconds": 0.0,
+            "wait_seconds": 0.0
+        }
+
+    # -------------------------------
+    # PUBLIC API
+    # -------------------------------
+
+    def add_job(self, job: ProactiveJob):
+        with self._lock:
+            self.jobs.append(job)
+
+    def submit(self, user_id: str, topic: str, prompt: str, agent_id: str = "personal_advisor",
+               skip_unchanged: bool = True) -> bool:
+        """
+        Queue one proactive check.
+
+        Returns:
+            True if queued; False if coalesced, skipped (data unchanged) or dropped
+        """
+        task = _Task(user_id, agent_id, topic, prompt, skip_unchanged)
+        version = self._data_version(user_id) if skip_unchanged else None
+        with self._lock:
+            if task.key in self._inflight:
+                self.stats["coalesced"] += 1
+                return False
+            last = self._last_runs.get(task.key)
+            if (version is not None and last is not None and last[0] == version
+                    and time.time() - last[1] < self.recheck_seconds):
+                self.stats["skipped_unchanged"] += 1
+                return False
+            self._inflight.add(task.key)
+
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            with self._lock:
+                self._inflight.discard(task.key)
+                self.stats["dropped"] += 1
+            return False
+
+        with self._lock:
+            self.stats["submitted"] += 1
+        return True
+
+    def run_job(self, job: ProactiveJob) -> int:
+        """Fan a job out to its users now; returns the number of checks queued"""
+        users = job.users() if job.users else self.list_users()
+        return sum(
+            self.submit(user_id, job.topic, job.prompt, job.agent_id, job.skip_unchanged)
+            for user_id in users
+        )
+
+    def start(self):
+        """Start the trigger loop and the worker pool"""
+        if self._threads:
+            return
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._tick_loop, name="proactive-scheduler", daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._worker, name=f"proactive-worker-{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        print(f"✓ Proactive scheduler started ({len(self.jobs)} jobs, {self.max_workers} workers)")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop triggering; let running checks finish and discard the rest"""
+        if not self._threads:
+            return
+        self._stop.set()
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                with self._lock:
+                    self._inflight.discard(task.key)
+        for _ in range(self.max_workers):
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            while self._completions and now - self._completions[0] > 60:
+                self._completions.popleft()
+            stats = dict(self.stats)
+            stats["running"] = self._running
+            stats["completed_last_minute"] = len(self._completions)
+        finished = stats["completed"] + stats["failed"]
+        stats["queue_depth"] = self._queue.qsize()
+        stats["max_queue"] = self.max_queue
+        stats["workers"] = self.max_workers
+        stats["jobs"] = [{"topic": j.topic, "agent_id": j.agent_id, "trigger": repr(j.trigger)} for j in self.jobs]
+        stats["avg_run_ms"] = round(stats["run_seconds"] / finished * 1000, 1) if finished else 0.0
+        stats["avg_wait_ms"] = round(stats["wait_seconds"] / finished * 1000, 1) if finished else 0.0
+        stats["run_seconds"] = round(stats["run_seconds"], 3)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        return stats
+
+    # -------------------------------
+    # WORKERS
+    # -------------------------------
+
+    @staticmethod
+    def _data_version(user_id: str) -> Optional[str]:
+        try:
+            return get_data_version(user_id)
+        except Exception:
+            return None
+
+    def _tick_loop(self):
+        while not self._stop.wait(self.tick_seconds):
+            now = time.time()
+            with self._lock:
+                jobs = list(self.jobs)
+            for job in jobs:
+                try:
+                    if job.trigger.is_due(now):
+                        self.run_job(job)
+                except Exception as e:
+                    print(f"⚠ Proactive job '{job.topic}' failed to schedule: {e}")
+
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            if task is None or self._stop.is_set():
+                if task is not None:
+                    with self._lock:
+                        self._inflight.discard(task.key)
+                return
+            self._run_task(task)
+
+    def _run_task(self, task: _Task):
+        started = time.monotonic()
+        with self._lock:
+            self._running += 1
+            self.stats["wait_seconds"] += started - task.queued_at
+
+        ok, alert = False, None
+        try:
+            agent = self.get_agent(task.agent_id)
+            alert = agent.generate_proactive_message(task.prompt, task.topic, user_id=task.user_id,
+                                                     agent_id=task.agent_id)
+            ok = True
+        except Exception as e:
+            print(f"⚠ Proactive check '{task.topic}' for {task.user_id} failed: {e}")
+
+        # The check's own tool calls refresh the user's data, so read the version afterwards
+        version = self._data_version(task.user_id) if ok else None
+
+        with self._lock:
+            self._running -= 1
+            self._inflight.discard(task.key)
+            self.stats["run_seconds"] += time.monotonic() - started
+            if ok:
+                self.stats["completed"] += 1
+                now = time.monotonic()
+                self._completions.append(now)
+                while now - self._completions[0] > 60:
+                    self._completions.popleft()
+                if alert is not None:
+                    self.stats["alerts"] += 1
+                if version is not None:
+                    self._last_runs[task.key] = (version, time.time())
+            else:
+                self.stats["failed"] += 1
+
+
+# Singleton instance
+_scheduler_instance = None
+
+def get_proactive_scheduler() -> ProactiveScheduler:
+    """
+    Get or create the shared scheduler running the default jobs.
+
+    Checks only go to the active user unless PROACTIVE_ALL_USERS=true: the
+    data tools read whichever user get_current_user_id resolves to, and a
+    check for anyone else is only correct once every tool does so.
+    """
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        from agent.manager import get_agent_manager
+        from agent.user_manager import get_user_manager
+
+        if os.getenv("PROACTIVE_ALL_USERS", "false").lower() == "true":
+            list_users = lambda: list(get_user_manager().users)
+        else:
+            list_users = lambda: [get_user_manager().active_user_id]
+        _scheduler_instance = ProactiveScheduler(
+            get_agent=lambda agent_id: get_agent_manager().agents[agent_id],
+            list_users=list_users
+        )
+        for job in DEFAULT_JOBS:
+            _scheduler_instance.add_job(job)
+    return _scheduler_instance
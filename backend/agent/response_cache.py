@@ -0,0 +1,208 @@
+"""
+Semantic response cache for repeated chat questions.
+Near-identical questions from the same user are answered from a previous
+response as long as the underlying data version hasn't changed.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+# Follow-ups lean on the previous turn ("what about last month?"), so the same
+# words can need a different answer. Never serve or store them.
+FOLLOW_UP_MARKERS = re.compile(
+    r"^(and|but|also|what about|how about|then|so|ok|okay|yes|no|why)\b|\b(that|this|those|these|it|them)\b",
+    re.IGNORECASE
+)
+
+
+class _CacheEntry:
+    __slots__ = ("vector", "message", "response", "data_version", "created_at")
+
+    def __init__(self, vector, message, response, data_version):
+        self.vector = vector
+        self.message = message
+        self.response = response
+        self.data_version = data_version
+        self.created_at = time.time()
+
+
+class SemanticResponseCache:
+    """
+    Per-user cache of chat responses keyed by message embedding.
+    Entries are evicted by TTL and per-user LRU size limit.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = None,
+        ttl_seconds: int = None,
+        max_entries_per_user: int = None
+    ):
+        """
+        Args:
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Maximum age of a cached response
+            max_entries_per_user: LRU bound per (user, agent) partition
+        """
+        self.similarity_threshold = similarity_threshold or float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.92"))
+        self.ttl_seconds = ttl_seconds or int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+        self.max_entries_per_user = max_entries_per_user or int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "200"))
+
+        self._partitions: Dict[tuple, "OrderedDict[int, _CacheEntry]"] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._embeddings = None
+        self._disabled_reason: Optional[str] = None
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "expired": 0,
+            "evictions": 0,
+            "bypassed": 0,
+            "stores": 0
+        }
+
+    # -------------------------------
+    # PUBLIC API
+    # -------------------------------
+
+    def lookup(self, user_id: str, agent_id: str, message: str, data_version: str) -> Optional[str]:
+        """
+        Return a cached response for a semantically equivalent message.
+
+        Args:
+            user_id: Active user id
+            agent_id: Agent persona answering (responses differ by persona)
+            message: User message
+            data_version: Current data version token for the user
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        if not self._cacheable(message):
+            self._count("bypassed")
+            return None
+
+        vector = self._embed(message)
+        if vector is None:
+            self._count("bypassed")
+            return None
+
+        now = time.time()
+        with self._lock:
+            partition = self._partitions.get((user_id, agent_id))
+            if not partition:
+                self.stats["misses"] += 1
+                return None
+
+            # Drop expired / stale entries as we go
+            for entry_id in [eid for eid, e in partition.items() if now - e.created_at > self.ttl_seconds]:
+                del partition[entry_id]
+                self.stats["expired"] += 1
+            for entry_id in [eid for eid, e in partition.items() if e.data_version != data_version]:
+                del partition[entry_id]
+                self.stats["stale"] += 1
+
+            if not partition:
+                self.stats["misses"] += 1
+                return None
+
+            ids = list(partition.keys())
+            matrix = np.stack([partition[eid].vector for eid in ids])
+            scores = matrix @ vector
+            best = int(np.argmax(scores))
+
+            if scores[best] < self.similarity_threshold:
+                self.stats["misses"] += 1
+                return None
+
+            entry_id = ids[best]
+            partition.move_to_end(entry_id)
+            self.stats["hits"] += 1
+            return partition[entry_id].response
+
+    def store(self, user_id: str, agent_id: str, message: str, response: str, data_version: str):
+        """Cache a response computed by the agent."""
+        if not self._cacheable(message) or not response or response.startswith("I apologize"):
+            return
+
+        vector = self._embed(message)
+        if vector is None:
+            return
+
+        with self._lock:
+            partition = self._partitions.setdefault((user_id, agent_id), OrderedDict())
+            partition[self._next_id] = _CacheEntry(vector, message, response, data_version)
+            self._next_id += 1
+            self.stats["stores"] += 1
+
+            while len(partition) > self.max_entries_per_user:
+                partition.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, user_id: str):
+        """Drop every cached response for a user."""
+        with self._lock:
+            for key in [k for k in self._partitions if k[0] == user_id]:
+                del self._partitions[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit metrics and current size"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": sum(len(p) for p in self._partitions.values()),
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "enabled": self._disabled_reason is None,
+                "disabled_reason": self._disabled_reason
+            }
+
+    # -------------------------------
+    # HELPERS
+    # -------------------------------
+
+    @staticmethod
+    def _cacheable(message: str) -> bool:
+        text = message.strip()
+        return len(text.split()) >= 3 and not FOLLOW_UP_MARKERS.search(text)
+
+    def _embed(self, message: str) -> Optional[np.ndarray]:
+        """Unit-normalized embedding (dot product == cosine similarity)"""
+        if self._disabled_reason is not None:
+            return None
+        try:
+            if self._embeddings is None:
+                from agent.local_embeddings import get_local_embeddings
+                self._embeddings = get_local_embeddings()
+            vector = np.asarray(self._embeddings.embed_query(" ".join(message.lower().split())), dtype=np.float32)
+        except Exception as e:
+            self._disabled_reason = str(e)
+            print(f"⚠ Response cache disabled: {e}")
+            return None
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+
+# Singleton instance
+_response_cache_instance = None
+
+def get_response_cache() -> SemanticResponseCache:
+    """Get or create the shared response cache"""
+    global _response_cache_instance
+    if _response_cache_instance is None:
+        _response_cache_instance = SemanticResponseCache()
+    return _response_cache_instance
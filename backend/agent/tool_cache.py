@@ -0,0 +1,158 @@
+"""
+Memoization of data tool results.
+Tool outputs are cached per (user, tool, arguments) and shared between agents,
+so personal_advisor and gig_accountant reuse each other's analyze_transactions
+or generate_insights results for the same user. Entries are valid while the
+user's data version is unchanged and the per-tool TTL has not elapsed.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional
+
+from agent.data_version import get_data_version
+
+# Cacheable tools and their TTLs (seconds)
+CACHEABLE_TOOL_TTLS = {
+    "analyze_transactions": 900,
+    "generate_insights": 900,
+    "check_goal_alignment": 900,
+    "query_knowledge_base": 3600,
+    "fetch_market_data": 300,
+}
+
+# Results that don't depend on who is asking
+USER_INDEPENDENT_TOOLS = {"fetch_market_data"}
+
+# Tools that change user context; running one invalidates the user's cached results
+INVALIDATING_TOOLS = {"update_user_context"}
+
+
+class ToolResultCache:
+    """
+    LRU cache of tool observations with data-version-aware TTLs.
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1000"))
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "by_tool": {}}
+
+    @staticmethod
+    def make_key(user_id: str, tool_name: str, args: tuple, kwargs: dict) -> tuple:
+        """Canonical cache key; argument order doesn't matter"""
+        owner = "*" if tool_name in USER_INDEPENDENT_TOOLS else user_id
+        canonical = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True, default=str)
+        return (owner, tool_name, canonical)
+
+    def get(self, key: tuple, data_version: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            tool_stats = self.stats["by_tool"].setdefault(key[1], {"hits": 0, "misses": 0})
+            if entry is not None:
+                value, version, expires_at = entry
+                if version == data_version and time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    tool_stats["hits"] += 1
+                    return value
+                del self._entries[key]
+
+            self.stats["misses"] += 1
+            tool_stats["misses"] += 1
+            return None
+
+    def put(self, key: tuple, value: Any, data_version: str):
+        ttl = CACHEABLE_TOOL_TTLS.get(key[1], 300)
+        with self._lock:
+            self._entries[key] = (value, data_version, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: str):
+        """Drop every cached tool result belonging to a user"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+            self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "hits": self.stats["hits"],
+                "misses": self.stats["misses"],
+                "invalidations": self.stats["invalidations"],
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "by_tool": {name: dict(counts) for name, counts in self.stats["by_tool"].items()}
+            }
+
+
+def memoize_tool(tool, get_user_id: Callable[[], str], cache: "ToolResultCache" = None):
+    """
+    Wrap a LangChain tool so its results are served from the shared cache.
+
+    Args:
+        tool: LangChain tool (e.g. from the @tool decorator)
+        get_user_id: Returns the user the calling agent is serving
+        cache: Cache to use (defaults to the shared instance)
+
+    Returns:
+        A copy of the tool with a caching func, or the tool itself if it
+        isn't cacheable
+    """
+    cache = cache or get_tool_cache()
+    func = getattr(tool, "func", None)
+    if func is None:
+        return tool
+
+    if tool.name in INVALIDATING_TOOLS:
+        def invalidating(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                user_id = get_user_id()
+                cache.invalidate_user(user_id)
+                from agent.response_cache import get_response_cache
+                get_response_cache().invalidate(user_id)
+        return tool.model_copy(update={"func": invalidating})
+
+    if tool.name not in CACHEABLE_TOOL_TTLS:
+        return tool
+
+    def cached(*args, **kwargs):
+        user_id = get_user_id()
+        data_version = "*" if tool.name in USER_INDEPENDENT_TOOLS else get_data_version(user_id)
+        key = cache.make_key(user_id, tool.name, args, kwargs)
+
+        value = cache.get(key, data_version)
+        if value is not None:
+            return value
+
+        value = func(*args, **kwargs)
+        # Don't pin transient failures
+        if not (isinstance(value, str) and value.lower().startswith("error")):
+            # The call itself may have refreshed the user's data; store under the version it saw
+            if tool.name not in USER_INDEPENDENT_TOOLS:
+                data_version = get_data_version(user_id)
+            cache.put(key, value, data_version)
+        return value
+
+    return tool.model_copy(update={"func": cached})
+
+
+# Singleton instance
+_tool_cache_instance = None
+
+def get_tool_cache() -> ToolResultCache:
+    """Get or create the tool result cache shared by all agents"""
+    global _tool_cache_instance
+    if _tool_cache_instance is None:
+        _tool_cache_instance = ToolResultCache()
+    return _tool_cache_instance
@@ -2,9 +2,16 @@
 User Manager for handling multiple user profiles.
 """
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from data.mock_user import USER_PROFILE as PERSONAL_PROFILE
 from data.mock_gig_data import GIG_USER_PROFILE
 
+# User a background run (e.g. a proactive check) works for; a context variable
+# so it follows the run into parallel tool workers without touching the active user
+_run_user_id: ContextVar = ContextVar("run_user_id", default=None)
+
 class UserManager:
     """
     Manages available user profiles.
@@ -110,3 +117,26 @@ def get_user_manager() -> UserManager:
     if _user_manager_instance is None:
         _user_manager_instance = UserManager()
     return _user_manager_instance
+
+
+def get_run_user_id():
+    """User of the surrounding run_as_user block, or None outside one"""
+    return _run_user_id.get()
+
+
+def get_current_user_id() -> str:
+    """
+    User whose data a tool or data lookup should read: the user of the
+    surrounding run_as_user block, otherwise the active user
+    """
+    return get_run_user_id() or get_user_manager().active_user_id
+
+
+@contextmanager
+def run_as_user(user_id: str):
+    """Make get_current_user_id return user_id for the enclosed code (this context only)"""
+    token = _run_user_id.set(user_id)
+    try:
+        yield
+    finally:
+        _run_user_id.reset(token)
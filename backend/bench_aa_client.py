@@ -0,0 +1,53 @@
+"""
+Benchmark: AA request latency with a per-request httpx.Client vs. the pooled
+keep-alive client in AAClient. Runs against the local AA stand-in
+(aa_standin.py) with a synthetic user and no injected latency.
+
+Usage: python bench_aa_client.py
+"""
+
+import statistics
+import time
+
+import httpx
+
+from aa_standin import AAStandIn, SyntheticAAData
+from services.aa_client import AAClient
+
+REQUESTS = 500
+
+
+def timed(fn) -> list:
+    timings = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(label: str, timings: list):
+    timings.sort()
+    print(f"{label:<32} p50 {statistics.median(timings):6.2f} ms   "
+          f"p95 {timings[int(len(timings) * 0.95)]:6.2f} ms   total {sum(timings):8.1f} ms")
+
+
+if __name__ == "__main__":
+    server = AAStandIn(SyntheticAAData(users=1, transactions=100)).start()
+    base_url = server.base_url
+    user_id = server.synthetic.user_ids[0]
+    url = f"{base_url}/api/v1/accounts"
+
+    def per_request_client():
+        # What _make_request used to do on every call
+        with httpx.Client() as client:
+            client.get(url, params={"user_id": user_id}, timeout=30).json()
+
+    # Response cache off: every call must reach the server
+    aa = AAClient(base_url=base_url)
+    aa.cache = None
+    print(f"{REQUESTS} sequential GET /api/v1/accounts against {base_url}")
+    report("new httpx.Client per request", timed(per_request_client))
+    report("pooled AAClient", timed(lambda: aa.get_accounts(user_id)))
+    aa.close()
+    server.stop()
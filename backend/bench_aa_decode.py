@@ -0,0 +1,78 @@
+"""
+Benchmark: decode + transform of large AA payloads, generic dicts
+(json.loads + AATransformer over dicts) vs. typed schemas
+(aa_schemas.decode_response straight from bytes + AATransformer over the
+typed objects). Payloads carry the extra per-item detail real AA responses
+have (ISIN, NAV, folio, holdings history) that the transforms never read.
+Peak memory is the Python heap as seen by tracemalloc.
+
+Usage: python bench_aa_decode.py [items ...]
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from services.aa_schemas import decode_response
+from services.aa_transformer import AATransformer
+
+SIZES = [1_000, 10_000, 100_000]
+INVESTMENT_TYPES = ["MUTUAL_FUNDS", "EQUITIES", "PPF", "FIXED_DEPOSITS"]
+
+
+def investments_payload(items: int) -> bytes:
+    rng = random.Random(7)
+    investments = [{
+        "id": f"inv-{n}",
+        "type": rng.choice(INVESTMENT_TYPES),
+        "schemeName": f"Scheme {n % 500}",
+        "provider": "Provider",
+        "investedAmount": round(rng.uniform(1_000, 100_000), 2),
+        "currentValue": round(rng.uniform(1_000, 120_000), 2),
+        "returnsPercentage": round(rng.uniform(-10, 30), 2),
+        "units": round(rng.uniform(1, 500), 3),
+        "quantity": rng.randint(1, 200),
+        "status": "ACTIVE",
+        "isin": f"INF{n:09d}",
+        "folio": f"{n}/{n % 97}",
+        "nav": {"date": "2025-01-15", "value": round(rng.uniform(10, 500), 4)},
+        "history": [{"date": f"2024-{m:02d}-01", "units": round(rng.uniform(0, 10), 3)} for m in range(1, 7)],
+    } for n in range(items)]
+    return json.dumps({"success": True, "data": {"count": items, "investments": investments}}).encode()
+
+
+def dict_path(content: bytes) -> dict:
+    data = json.loads(content)
+    return AATransformer.transform_investments(data.get("data", {}))
+
+
+def typed_path(content: bytes) -> dict:
+    return AATransformer.transform_investments(decode_response("/api/v1/aggregated/investments", content).data)
+
+
+def measure(fn, content: bytes, runs: int) -> tuple:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn(content)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 2**20, result
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'items':>8}  {'payload':>9}  {'dicts':>10}  {'typed':>10}  {'speedup':>7}  {'peak dicts':>10}  {'peak typed':>10}")
+    for items in sizes:
+        content = investments_payload(items)
+        runs = 5 if items <= 10_000 else 2
+        dict_ms, dict_peak, expected = measure(dict_path, content, runs)
+        typed_ms, typed_peak, result = measure(typed_path, content, runs)
+        assert result == expected
+        print(f"{items:>8,}  {len(content) / 2**20:>6.1f} MB  {dict_ms:>7.1f} ms  {typed_ms:>7.1f} ms  "
+              f"{dict_ms / typed_ms:>6.1f}x  {dict_peak:>7.1f} MB  {typed_peak:>7.1f} MB")
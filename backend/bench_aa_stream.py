@@ -0,0 +1,70 @@
+"""
+Benchmark: one large /aggregated/transactions response, buffered
+(get_transactions: response.json() -> dicts -> DataFrame) vs. streamed
+(stream_transactions: parsed incrementally into fixed-size DataFrame
+batches). Runs against the local AA stand-in in a subprocess, so only the
+client's memory is measured: peak Python heap as seen by tracemalloc, in a
+separate pass from timing.
+
+Usage: python bench_aa_stream.py [rows ...]
+"""
+
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from services.aa_client import AAClient
+from services.aa_transformer import AATransformer
+
+SIZES = [10_000, 100_000, 300_000]
+BATCH_SIZE = 2000
+
+
+def buffered(client: AAClient, user_id: str, rows: int) -> int:
+    page = client.get_transactions(user_id, limit=rows)
+    return len(AATransformer.transform_transactions(page))
+
+
+def streamed(client: AAClient, user_id: str, rows: int) -> int:
+    # Each batch is consumed (here: counted) and dropped, as a sink like the
+    # transaction store would
+    return sum(len(df) for df in client.stream_transactions(user_id, limit=rows, batch_size=BATCH_SIZE))
+
+
+def measure(fn, *args) -> tuple:
+    started = time.perf_counter()
+    count = fn(*args)
+    elapsed = (time.perf_counter() - started) * 1000
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / 2**20
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'rows':>8}  {'buffered':>10}  {'streamed':>10}  {'peak buffered':>13}  {'peak streamed':>13}")
+    for rows in sizes:
+        server = subprocess.Popen(
+            [sys.executable, "aa_standin.py", "--port", "0", "--users", "1",
+             "--transactions", str(rows), "--days", str(max(30, rows // 100))],
+            stdout=subprocess.PIPE, text=True
+        )
+        try:
+            base_url = server.stdout.readline().strip().split()[-1]
+            client = AAClient(base_url=base_url)
+            client.cache = None
+            user_id = "synthetic-user-0"
+            client.get_transactions(user_id, limit=1)  # generate the synthetic user up front
+
+            n1, buffered_ms, buffered_mb = measure(buffered, client, user_id, rows)
+            n2, streamed_ms, streamed_mb = measure(streamed, client, user_id, rows)
+            assert n1 == n2 == rows
+            print(f"{rows:>8,}  {buffered_ms:>7.0f} ms  {streamed_ms:>7.0f} ms  "
+                  f"{buffered_mb:>10.1f} MB  {streamed_mb:>10.1f} MB")
+            client.close()
+        finally:
+            server.terminate()
+            server.wait()
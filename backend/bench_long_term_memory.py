@@ -0,0 +1,63 @@
+"""
+Benchmark: long-term memory retrieval latency as history grows.
+Compares the bounded, compacting per-user partition against an unbounded one
+over 100k stored turns. Uses random 384-d vectors so no embedding model is needed.
+
+Usage: python bench_long_term_memory.py
+"""
+
+import tempfile
+import time
+
+import numpy as np
+
+from agent.long_term_store import PartitionedMemoryStore
+
+DIMENSION = 384
+TOTAL_TURNS = 100_000
+BATCH = 1_000
+CHECKPOINTS = {1_000, 10_000, 50_000, 100_000}
+QUERIES = 200
+
+
+def measure(store: PartitionedMemoryStore, rng) -> float:
+    """Median search latency in milliseconds"""
+    queries = rng.standard_normal((QUERIES, DIMENSION)).astype(np.float32)
+    timings = []
+    for q in queries:
+        started = time.perf_counter()
+        store.search_vector("bench_user", q, k=3)
+        timings.append((time.perf_counter() - started) * 1000)
+    return float(np.median(timings))
+
+
+def run(label: str, max_entries: int):
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PartitionedMemoryStore(storage_dir=tmp, max_entries=max_entries)
+        print(f"\n{label} (max_entries={max_entries:,})")
+        print(f"{'stored turns':>14} {'vectors':>9} {'p50 search ms':>14}")
+
+        for added in range(BATCH, TOTAL_TURNS + 1, BATCH):
+            vectors = rng.standard_normal((BATCH, DIMENSION)).astype(np.float32)
+            store.add_vectors("bench_user", vectors, [f"turn {added - BATCH + i}" for i in range(BATCH)])
+            # Let background compaction catch up before measuring
+            store._compactor.submit(lambda: None).result()
+
+            if added in CHECKPOINTS:
+                partition = store._partition("bench_user", DIMENSION)
+                print(f"{added:>14,} {len(partition):>9,} {measure(store, rng):>14.3f}")
+
+        started = time.perf_counter()
+        store.flush()
+        print(f"  persist: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        started = time.perf_counter()
+        reloaded = PartitionedMemoryStore(storage_dir=tmp, max_entries=max_entries)
+        reloaded.search_vector("bench_user", rng.standard_normal(DIMENSION).astype(np.float32))
+        print(f"  mmap load + first search: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    run("Bounded partition with compaction", max_entries=2_000)
+    run("Unbounded partition (no compaction)", max_entries=TOTAL_TURNS * 2)
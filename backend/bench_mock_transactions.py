@@ -0,0 +1,84 @@
+"""
+Benchmark: mock transaction queries over a multi-year synthetic history,
+copy-and-mask (get_transactions_by_category / get_spending_summary as they
+were) vs. the sorted date index with per-category partitions
+(TransactionIndex). Results are checked against the old implementation.
+
+Usage: python bench_mock_transactions.py [rows ...]
+"""
+
+import sys
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+from aa_standin import SyntheticAAData
+from data.mock_transactions import TransactionIndex
+from services.aa_transformer import AATransformer
+
+SIZES = [100_000, 1_000_000]
+YEARS = 5
+QUERIES = [(30, None), (30, "Groceries"), (365, None), (365, "Groceries")]
+
+
+def history(rows: int) -> pd.DataFrame:
+    data = SyntheticAAData(users=1, transactions=rows, days=365 * YEARS)
+    raw = data._transaction_index(data.user_ids[0])[1]
+    df = AATransformer.transform_transactions({"transactions": raw})
+    # Same shape as TRANSACTION_HISTORY: naive dates, plain columns, newest first
+    df["date"] = df["date"].dt.tz_localize(None)
+    df = df.astype({"category": object, "type": object, "mode": object, "account": object})
+    return df.sort_values("date", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def by_category_as_it_was(df, cutoff, category):
+    df = df.copy()
+    df = df[df["date"] >= cutoff]
+    if category:
+        df = df[df["category"] == category]
+    return df
+
+
+def summary_as_it_was(df, cutoff):
+    df = by_category_as_it_was(df, cutoff, None)
+    expenses = df[df["amount"] < 0].copy()
+    expenses["amount"] = expenses["amount"].abs()
+    summary = expenses.groupby("category")["amount"].agg(["sum", "count", "mean"]).round(2)
+    summary.columns = ["total_spent", "num_transactions", "avg_transaction"]
+    return summary.sort_values("total_spent", ascending=False)
+
+
+def best_of(fn, *args, runs: int = 5) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    for rows in sizes:
+        df = history(rows)
+        build_ms, index = best_of(TransactionIndex, df, runs=1)
+        latest = df["date"].max()
+        print(f"{rows:,} transactions over {YEARS} years (index built in {build_ms:.0f} ms)")
+        print(f"  {'query':<28} {'copy + mask':>12}  {'indexed':>10}  {'speedup':>7}")
+
+        for days, category in QUERIES:
+            cutoff = latest - timedelta(days=days)
+            old_ms, expected = best_of(by_category_as_it_was, df, cutoff, category)
+            new_ms, result = best_of(index.select, cutoff, None, category)
+            pd.testing.assert_frame_equal(result, expected)
+            label = f"{days} days, {category or 'all'}"
+            print(f"  {label:<28} {old_ms:>9.2f} ms  {new_ms:>7.2f} ms  {old_ms / new_ms:>6.0f}x")
+
+        for days in (30, 365):
+            cutoff = latest - timedelta(days=days)
+            old_ms, expected = best_of(summary_as_it_was, df, cutoff)
+            new_ms, result = best_of(index.spending_summary, cutoff)
+            pd.testing.assert_frame_equal(result.sort_index(), expected.sort_index(), check_exact=False)
+            label = f"summary, {days} days"
+            print(f"  {label:<28} {old_ms:>9.2f} ms  {new_ms:>7.2f} ms  {old_ms / new_ms:>6.0f}x")
@@ -0,0 +1,99 @@
+"""
+Benchmark: building the /api/portfolio body for N stock + N fund holdings,
+per holding in Python (the previous get_portfolio loop) vs. the vectorized
+portfolio engine, plus a repeat request served from the payload cache.
+Times include JSON serialization, as the endpoint paid it on every request.
+
+Usage: python bench_portfolio.py [holdings ...]
+"""
+
+import json
+import random
+import sys
+import time
+
+import pandas as pd
+
+from services.portfolio_engine import PortfolioPayloadCache, value_stocks, value_funds, serialize_portfolio
+
+SIZES = [10, 1_000, 100_000]
+
+
+def holdings(count: int) -> tuple:
+    rng = random.Random(11)
+    stocks = pd.DataFrame([{
+        "ticker": f"TICK{n}",
+        "company": f"Company {n} Ltd.",
+        "quantity": rng.randint(1, 500),
+        "purchase_price": round(rng.uniform(50, 5_000), 2),
+        "current_price": round(rng.uniform(50, 5_500), 2),
+        "sector": "Sector",
+    } for n in range(count)])
+    funds = pd.DataFrame([{
+        "fund_name": f"Fund {n} Direct Growth",
+        "ticker": f"FUND{n}",
+        "units": round(rng.uniform(1, 1_000), 3),
+        "purchase_nav": round(rng.uniform(10, 600), 2),
+        "current_nav": round(rng.uniform(10, 650), 2),
+        "category": "Flexi Cap",
+    } for n in range(count)])
+    return stocks, funds
+
+
+def per_holding(stocks: pd.DataFrame, funds: pd.DataFrame) -> bytes:
+    """get_portfolio's mock path as it was: to_dict, then a Python loop per holding"""
+    stock_rows = stocks.to_dict(orient="records")
+    fund_rows = funds.to_dict(orient="records")
+    for stock in stock_rows:
+        stock["current"] = stock["current_price"]
+        stock["value"] = stock["quantity"] * stock["current"]
+        stock["gain"] = stock["value"] - (stock["quantity"] * stock["purchase_price"])
+        stock["gain_pct"] = stock["gain"] / (stock["quantity"] * stock["purchase_price"]) * 100
+        stock["shares"] = stock["quantity"]
+        stock["avgCost"] = stock["purchase_price"]
+    for fund in fund_rows:
+        fund["currentNAV"] = fund["current_nav"]
+        fund["value"] = fund["units"] * fund["currentNAV"]
+        fund["gain"] = fund["value"] - (fund["units"] * fund["purchase_nav"])
+        fund["gain_pct"] = fund["gain"] / (fund["units"] * fund["purchase_nav"]) * 100
+        fund["purchaseNAV"] = fund["purchase_nav"]
+        fund["name"] = fund["fund_name"]
+    return json.dumps({"status": "success", "stocks": stock_rows, "funds": fund_rows}, separators=(",", ":")).encode()
+
+
+def vectorized(stocks: pd.DataFrame, funds: pd.DataFrame, cache: PortfolioPayloadCache) -> bytes:
+    return cache.put("bench", "v1", serialize_portfolio(value_stocks(stocks), value_funds(funds)))
+
+
+def best_of(fn, *args, runs: int) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def same_holdings(a: list, b: list) -> bool:
+    return len(a) == len(b) and all(
+        abs(x[key] - y[key]) <= 1e-6 * max(1.0, abs(x[key]))
+        for x, y in zip(a, b) for key in ("value", "gain", "gain_pct")
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'holdings':>9}  {'per-holding':>12}  {'vectorized':>11}  {'speedup':>7}  {'cached':>9}")
+    for count in sizes:
+        stocks, funds = holdings(count)
+        cache = PortfolioPayloadCache()
+        runs = 20 if count <= 1_000 else 3
+
+        old_ms, old_body = best_of(per_holding, stocks, funds, runs=runs)
+        new_ms, new_body = best_of(vectorized, stocks, funds, cache, runs=runs)
+        hit_ms, hit_body = best_of(cache.get, "bench", "v1", runs=runs)
+        assert hit_body == new_body
+
+        old, new = json.loads(old_body), json.loads(new_body)
+        assert same_holdings(old["stocks"], new["stocks"]) and same_holdings(old["funds"], new["funds"])
+        print(f"{count:>9,}  {old_ms:>9.2f} ms  {new_ms:>8.2f} ms  {old_ms / new_ms:>6.1f}x  {hit_ms * 1000:>6.1f} us")
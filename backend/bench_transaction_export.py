@@ -0,0 +1,72 @@
+"""
+Benchmark: pulling a user's whole transaction history out of the API, as one
+JSON document (get_transactions -> DataFrame -> records -> json.dumps) vs. the
+streaming export (aa_chunks -> gzipped NDJSON, chunk by chunk). Runs against
+the local AA stand-in in a subprocess, so only the API side's memory is
+measured: peak Python heap as seen by tracemalloc, in a separate pass from
+timing.
+
+Usage: python bench_transaction_export.py [rows ...]
+"""
+
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from services.aa_client import AAClient
+from services.aa_transformer import AATransformer
+from services.transaction_export import aa_chunks, encode_chunks
+
+SIZES = [10_000, 100_000, 300_000]
+USER_ID = "synthetic-user-0"
+
+
+def one_document(client: AAClient, rows: int) -> int:
+    df = AATransformer.transform_transactions(client.get_transactions(USER_ID, limit=rows))
+    df["date"] = df["date"].dt.strftime("%Y-%m-%dT%H:%M:%S")
+    df = df.astype(object).where(pd.notnull(df), None)
+    return len(json.dumps({"status": "success", "transactions": df.to_dict(orient="records")}).encode())
+
+
+def streamed_export(client: AAClient, rows: int) -> int:
+    # Pieces go to the socket as they're produced; here they're counted and dropped
+    return sum(len(part) for part in encode_chunks(aa_chunks(client, USER_ID), "ndjson", "gzip"))
+
+
+def measure(fn, *args) -> tuple:
+    started = time.perf_counter()
+    size = fn(*args)
+    elapsed = (time.perf_counter() - started) * 1000
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / 2**20, elapsed, peak / 2**20
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'rows':>8}  {'document':>10}  {'export':>10}  {'peak document':>13}  {'peak export':>11}  {'body sizes':>18}")
+    for rows in sizes:
+        server = subprocess.Popen(
+            [sys.executable, "aa_standin.py", "--port", "0", "--users", "1",
+             "--transactions", str(rows), "--days", str(max(30, rows // 100))],
+            stdout=subprocess.PIPE, text=True
+        )
+        try:
+            client = AAClient(base_url=server.stdout.readline().strip().split()[-1])
+            client.cache = None
+            client.get_transactions(USER_ID, limit=1)  # generate the synthetic user up front
+
+            doc_mb, doc_ms, doc_peak = measure(one_document, client, rows)
+            out_mb, out_ms, out_peak = measure(streamed_export, client, rows)
+            print(f"{rows:>8,}  {doc_ms:>7.0f} ms  {out_ms:>7.0f} ms  {doc_peak:>10.1f} MB  {out_peak:>8.1f} MB  "
+                  f"{doc_mb:>6.1f} / {out_mb:>4.1f} MB")
+            client.close()
+        finally:
+            server.terminate()
+            server.wait()
@@ -0,0 +1,87 @@
+"""
+Benchmark: the /api/transactions body at 100k rows, as it was (sort the whole
+frame, astype(object) to null out NaN, to_dict, json.dumps) vs. the paged
+serializer (keyset page + projection, encoded straight from typed columns).
+Covers the in-memory (mock) source and the SQLite transaction store.
+Peak memory is the Python heap as seen by tracemalloc.
+
+Usage: python bench_transactions_api.py [rows ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from aa_standin import SyntheticAAData
+from services.aa_transformer import AATransformer
+from services.transaction_page import page_frame, parse_fields, serialize_page
+from services.transaction_store import TransactionStore
+
+SIZES = [100_000]
+PAGE_SIZE = 500
+PROJECTION = "date,merchant,amount,category"
+
+
+def history(rows: int) -> tuple:
+    data = SyntheticAAData(users=1, transactions=rows, days=max(30, rows // 100))
+    raw = data._transaction_index(data.user_ids[0])[1]
+    df = AATransformer.transform_transactions({"transactions": raw})
+    df["date"] = df["date"].dt.tz_localize(None)
+    return raw, df
+
+
+def as_it_was(df: pd.DataFrame) -> bytes:
+    df = df.sort_values("date", ascending=False)
+    df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+    df = df.astype(object).where(pd.notnull(df), None)
+    return json.dumps({"status": "success", "transactions": df.to_dict(orient="records")}).encode()
+
+
+def frame_page(df: pd.DataFrame, fields: str, limit: int) -> bytes:
+    page, next_cursor = page_frame(df, limit=limit)
+    return serialize_page(page, parse_fields(fields), next_cursor)
+
+
+def store_page(store: TransactionStore, user_id: str, fields: str, limit: int) -> bytes:
+    page, next_key = store.page(user_id, limit=limit)
+    return serialize_page(page, parse_fields(fields), next_key)
+
+
+def measure(fn, *args, runs: int = 3) -> tuple:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        body = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 2**20, len(body)
+
+
+def report(label: str, result: tuple):
+    ms, peak, size = result
+    print(f"  {label:<34} {ms:>9.1f} ms  {peak:>8.1f} MB peak  {size / 2**20:>7.2f} MB body")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    for rows in sizes:
+        raw, df = history(rows)
+        store = TransactionStore(db_path=os.path.join(tempfile.mkdtemp(), "bench.db"))
+        store._upsert(store._conn(), "bench-user", raw)
+
+        print(f"{rows:,} transactions")
+        report("as it was (all rows, all fields)", measure(as_it_was, df))
+        report("frame, all rows, all fields", measure(frame_page, df, None, rows))
+        report(f"frame, page of {PAGE_SIZE}, all fields", measure(frame_page, df, None, PAGE_SIZE))
+        report(f"frame, page of {PAGE_SIZE}, 4 fields", measure(frame_page, df, PROJECTION, PAGE_SIZE))
+        report("store, all rows, all fields", measure(store_page, store, "bench-user", None, rows))
+        report(f"store, page of {PAGE_SIZE}, all fields", measure(store_page, store, "bench-user", None, PAGE_SIZE))
+        report(f"store, page of {PAGE_SIZE}, 4 fields", measure(store_page, store, "bench-user", PROJECTION, PAGE_SIZE))
@@ -2,6 +2,7 @@
 Mock transaction history data adapted for Indian market with Account Aggregator richness
 """
 
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import random
@@ -224,30 +225,103 @@ TRANSACTION_HISTORY = generate_transactions()
 
 
 # -------------------------------
-# FILTERING FUNCTIONS
+# DATE INDEX + CATEGORY PARTITIONS
 # -------------------------------
 
-def get_transactions_by_category(category=None, days=30):
-    """Filter by category + time window"""
-    df = TRANSACTION_HISTORY.copy()
+class TransactionIndex:
+    """
+    Read-only lookup structure over a transaction history.
+    Rows are kept oldest first behind a sorted DatetimeIndex, and each
+    category has its own (sorted) row positions and expense amounts, so a
+    window/category query is a searchsorted plus a slice: O(log n + k)
+    instead of copying and masking the whole history.
+    """
 
-    cutoff = datetime.now() - timedelta(days=days)
-    df = df[df["date"] >= cutoff]
+    def __init__(self, history: pd.DataFrame):
+        # Reversed first so same-day rows come back in history's order when
+        # a result is flipped to newest first
+        self.frame = history.iloc[::-1].sort_values("date", kind="stable")
+        self.dates = pd.DatetimeIndex(self.frame["date"])
 
-    if category:
-        df = df[df["category"] == category]
+        codes, categories = pd.factorize(self.frame["category"])
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        amounts = self.frame["amount"].to_numpy()
 
-    return df
+        self.partitions = {}  # category -> (row positions, their dates)
+        self.expenses = {}    # category -> (dates, amounts as positive values) of debits
+        for code, category in enumerate(categories):
+            rows = order[bounds[code]:bounds[code + 1]]
+            self.partitions[category] = (rows, self.dates[rows])
+            spent = rows[amounts[rows] < 0]
+            self.expenses[category] = (self.dates[spent], -amounts[spent])
 
+    def select(self, start=None, end=None, category=None) -> pd.DataFrame:
+        """
+        Transactions dated in [start, end), newest first
+
+        Args:
+            start: Inclusive lower bound (None: from the beginning)
+            end: Exclusive upper bound (None: up to the latest)
+            category: Only this category
+
+        Returns:
+            Copy of the matching rows (original index labels kept)
+        """
+        if category:
+            if category not in self.partitions:
+                return self.frame.iloc[:0].copy()
+            rows, dates = self.partitions[category]
+        else:
+            rows, dates = None, self.dates
+
+        lo = dates.searchsorted(start) if start is not None else 0
+        hi = dates.searchsorted(end) if end is not None else len(dates)
+        selected = self.frame.iloc[lo:hi] if rows is None else self.frame.iloc[rows[lo:hi]]
+        return selected.iloc[::-1].copy()
+
+    def spending_summary(self, start=None) -> pd.DataFrame:
+        """
+        Debits per category since start: total, count and average (absolute amounts)
+
+        Returns:
+            DataFrame indexed by category, largest total first
+        """
+        totals = {}
+        for category, (dates, spent) in self.expenses.items():
+            lo = dates.searchsorted(start) if start is not None else 0
+            if lo < len(spent):
+                window = spent[lo:]
+                totals[category] = (window.sum(), len(window))
+
+        total_spent = np.array([total for total, _ in totals.values()], dtype="float64")
+        num_transactions = np.array([count for _, count in totals.values()], dtype="int64")
+        summary = pd.DataFrame(
+            {
+                "total_spent": total_spent,
+                "num_transactions": num_transactions,
+                "avg_transaction": total_spent / num_transactions
+            },
+            # An empty index can't infer its dtype; take the column's, as groupby would
+            index=pd.Index(list(totals), name="category", dtype=None if totals else self.frame["category"].dtype)
+        ).round(2)
+        return summary.sort_values("total_spent", ascending=False)
 
-def get_spending_summary(days=30):
-    """Return category-wise spending summary"""
-    df = get_transactions_by_category(days=days)
 
-    expenses = df[df["amount"] < 0].copy()
-    expenses["amount"] = expenses["amount"].abs()
+_HISTORY_INDEX = TransactionIndex(TRANSACTION_HISTORY)
 
-    summary = expenses.groupby("category")["amount"].agg(["sum", "count", "mean"]).round(2)
-    summary.columns = ["total_spent", "num_transactions", "avg_transaction"]
 
-    return summary.sort_values("total_spent", ascending=False)
+# -------------------------------
+# FILTERING FUNCTIONS
+# -------------------------------
+
+def get_transactions_by_category(category=None, days=30):
+    """Filter by category + time window"""
+    cutoff = datetime.now() - timedelta(days=days)
+    return _HISTORY_INDEX.select(start=cutoff, category=category)
+
+
+def get_spending_summary(days=30):
+    """Return category-wise spending summary"""
+    cutoff = datetime.now() - timedelta(days=days)
+    return _HISTORY_INDEX.spending_summary(start=cutoff)
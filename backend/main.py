@@ -2,28 +2,56 @@
 FastAPI server for the AI Relationship Manager
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from pydantic import BaseModel
 from typing import Optional, List, Union
 import uvicorn
 import os
 import tempfile
 from pathlib import Path
-import pandas as pd
+from datetime import date, datetime, timedelta
 
 from agent.manager import get_agent_manager
 from agent.config import Config
 from agent.tools import optimize_spending
-from services import get_aa_client, AATransformer
+from agent.memory_writer import get_memory_writer
+from agent.proactive_scheduler import get_proactive_scheduler
+from agent.notification_hub import get_notification_hub
+from services import get_aa_client, get_async_aa_client, get_transaction_store, get_portfolio_cache, AATransformer
+from services.portfolio_engine import value_stocks, value_funds, serialize_portfolio, AA_STOCK_FIELDS, AA_FUND_FIELDS
+from services.transaction_page import parse_fields, decode_cursor, page_frame, serialize_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from services.transaction_export import check_export, export_filename, aa_chunks, frame_chunks, encode_chunks, EXPORT_FORMATS
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup / shutdown hooks"""
+    # Proactive checks run in the background on their own worker pool
+    scheduler_enabled = os.getenv("PROACTIVE_SCHEDULER_ENABLED", "true").lower() == "true"
+    if scheduler_enabled:
+        get_proactive_scheduler().start()
+    yield
+    if scheduler_enabled:
+        get_proactive_scheduler().stop()
+    # Persist conversation turns still queued in the write-behind buffer
+    get_memory_writer().shutdown()
+    # Close pooled AA connections
+    get_aa_client().close()
+    await get_async_aa_client().aclose()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Financial Relationship Manager",
     description="Personalized financial guidance through conversational AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -45,6 +73,7 @@ class ChatRequest(BaseModel):
     session_id: Optional[str] = "default"
     agent_id: Optional[str] = "personal_advisor"
     user_id: Optional[str] = "personal_user"  # New field for user selection
+    use_cache: Optional[bool] = True  # Set False to bypass the semantic response cache
 
 
 class ChatResponse(BaseModel):
@@ -85,7 +114,7 @@ async def chat(request: ChatRequest):
         manager = get_agent_manager()
         
         # Process message via manager
-        response = manager.chat(request.message, request.agent_id, request.user_id)
+        response = manager.chat(request.message, request.agent_id, request.user_id, use_cache=request.use_cache)
         
         return ChatResponse(
             response=response,
@@ -111,14 +140,45 @@ async def reset_conversation():
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (includes AA circuit breaker state)"""
+    breakers = get_aa_client().get_breaker_states()
+    degraded = any(b["state"] != "closed" for b in breakers.values())
     return {
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy",
         "service": "AI Financial Relationship Manager",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "aa_circuit_breakers": breakers
     }
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Chat pipeline performance counters (fast path hit rate, etc.)"""
+    try:
+        manager = get_agent_manager()
+        return {
+            "status": "success",
+            "metrics": manager.get_metrics()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/refresh-data")
+async def refresh_data(user_id: Optional[str] = None):
+    """Drop cached AA data so the next request refetches it (all users if none given)"""
+    try:
+        removed = get_aa_client().invalidate_cache(user_id)
+        get_transaction_store().expire(user_id)
+        get_portfolio_cache().invalidate(user_id)
+        return {
+            "status": "success",
+            "invalidated": removed
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/api/upload-document")
 async def upload_document(file: UploadFile = File(...)):
     """
@@ -228,178 +288,182 @@ async def get_portfolio(user_id: Optional[str] = None):
     try:
         # Check if we should use mock data
         use_mock = os.getenv("USE_MOCK_DATA", "false").lower() == "true"
+        portfolio_cache = get_portfolio_cache()
         
         if not use_mock:
             try:
-                aa_client = get_aa_client()
+                aa_client = get_async_aa_client()
                 if not user_id:
-                    user_id = aa_client.get_first_user_id()
-                investments = aa_client.get_investments(user_id=user_id)
-                
-                # Transform data
-                transformed = AATransformer.transform_investments(investments)
+                    user_id = await aa_client.get_first_user_id()
+                investments = await aa_client.get_typed("investments", user_id=user_id)
                 
-                # Format for frontend
-                stocks = []
-                for s in transformed['stocks']:
-                    gain = s['current_value'] - (s['quantity'] * s['purchase_price'])
-                    stocks.append({
-                        "ticker": s['ticker'],
-                        "company": s['company'],
-                        "shares": s['quantity'],
-                        "avgCost": s['purchase_price'],
-                        "current": s['current_price'],
-                        "value": s['current_value'],
-                        "gain": gain,
-                        "gain_pct": (gain / (s['quantity'] * s['purchase_price']) * 100) if s['quantity'] > 0 else 0
-                    })
-                    
-                funds = []
-                for m in transformed['mutual_funds']:
-                    gain = m['current_value'] - m['cost_basis']
-                    funds.append({
-                        "name": m['fund_name'],
-                        "category": m['category'],
-                        "units": m['units'],
-                        "purchaseNAV": m['purchase_nav'],
-                        "currentNAV": m['current_nav'],
-                        "value": m['current_value'],
-                        "gain": gain,
-                        "gain_pct": (gain / m['cost_basis'] * 100) if m['cost_basis'] > 0 else 0
-                    })
-                    
-                return {
-                    "status": "success",
-                    "stocks": stocks,
-                    "funds": funds,
-                    "fixed_deposits": transformed['fixed_deposits'],
-                    "recurring_deposits": transformed['recurring_deposits'],
-                    "cash": transformed['cash'],
-                }
+                # The fetch above refreshes the data version; unchanged data reuses the last payload
+                version = get_aa_client().get_data_version(user_id)
+                payload = portfolio_cache.get(user_id, version)
+                if payload is None:
+                    transformed = AATransformer.transform_investments(investments)
+                    payload = portfolio_cache.put(user_id, version, serialize_portfolio(
+                        value_stocks(transformed['stocks']),
+                        value_funds(transformed['mutual_funds']),
+                        stock_fields=AA_STOCK_FIELDS,
+                        fund_fields=AA_FUND_FIELDS,
+                        fixed_deposits=transformed['fixed_deposits'],
+                        recurring_deposits=transformed['recurring_deposits'],
+                        cash=transformed['cash'],
+                    ))
+                return Response(content=payload, media_type="application/json")
             except Exception as e:
                 print(f"Error fetching AA portfolio: {e}")
                 use_mock = True
         
         if use_mock:
-            from data.mock_portfolio import STOCK_HOLDINGS, MUTUAL_FUND_HOLDINGS, CASH_POSITION, FIXED_DEPOSITS, RECURRING_DEPOSITS
-            
-            # Convert DataFrames to list of dicts
-            stocks = STOCK_HOLDINGS.to_dict(orient='records')
-            funds = MUTUAL_FUND_HOLDINGS.to_dict(orient='records')
-            
-            # Calculate current values for stocks
-            for stock in stocks:
-                # Use enriched current_price if available, else calculate
-                if 'current_price' in stock:
-                    stock['current'] = stock['current_price']
-                else:
-                    stock['current'] = stock['purchase_price'] * 1.12
-                    
-                stock['value'] = stock['quantity'] * stock['current']
-                stock['gain'] = stock['value'] - (stock['quantity'] * stock['purchase_price'])
-                
-                # Frontend compatibility
-                stock['shares'] = stock['quantity']
-                stock['avgCost'] = stock['purchase_price']
-
-            for fund in funds:
-                if 'current_nav' in fund:
-                    fund['currentNAV'] = fund['current_nav']
-                else:
-                    fund['currentNAV'] = fund['purchase_nav'] * 1.08
-                    
-                fund['value'] = fund['units'] * fund['currentNAV']
-                fund['gain'] = fund['value'] - (fund['units'] * fund['purchase_nav'])
-                fund['purchaseNAV'] = fund['purchase_nav']
-                fund['name'] = fund['fund_name']
-
-            return {
-                "status": "success",
-                "stocks": stocks,
-                "funds": funds,
-                "fixed_deposits": FIXED_DEPOSITS,
-                "recurring_deposits": RECURRING_DEPOSITS,
-                "cash": CASH_POSITION,
-            }
+            # Static demo holdings: valued once, then served from the cache
+            payload = portfolio_cache.get("mock", "mock")
+            if payload is None:
+                from data.mock_portfolio import STOCK_HOLDINGS, MUTUAL_FUND_HOLDINGS, CASH_POSITION, FIXED_DEPOSITS, RECURRING_DEPOSITS
+                payload = portfolio_cache.put("mock", "mock", serialize_portfolio(
+                    value_stocks(STOCK_HOLDINGS),
+                    value_funds(MUTUAL_FUND_HOLDINGS),
+                    fixed_deposits=FIXED_DEPOSITS,
+                    recurring_deposits=RECURRING_DEPOSITS,
+                    cash=CASH_POSITION,
+                ))
+            return Response(content=payload, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/transactions")
-async def get_transactions(user_id: Optional[str] = None):
-    """Get transaction history"""
+async def get_transactions(
+    user_id: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    fields: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Get transaction history, newest first, optionally paged
+
+    Args:
+        start_date / end_date: Inclusive YYYY-MM-DD bounds (AA default: last 90 days)
+        category: Only this category
+        fields: Comma-separated fields to return (default: all)
+        limit: Page size (capped at TRANSACTIONS_MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous page
+    
+    Without limit or cursor the whole range comes back in one response (the
+    frontend doesn't follow next_cursor yet); either one turns on paging.
+    """
     try:
+        try:
+            columns = parse_fields(fields)
+            after = decode_cursor(cursor)
+            start = date.fromisoformat(start_date) if start_date else None
+            end = date.fromisoformat(end_date) if end_date else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if limit is not None or after is not None:
+            limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+        
         # Check if we should use mock data
         use_mock = os.getenv("USE_MOCK_DATA", "false").lower() == "true"
         
         if not use_mock:
             try:
-                aa_client = get_aa_client()
+                aa_client = get_async_aa_client()
                 if not user_id:
-                    user_id = aa_client.get_first_user_id()
-                
-                # Fetch last 90 days
-                from datetime import datetime, timedelta
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=90)
-                
-                aa_txns = aa_client.get_transactions(
-                    user_id=user_id,
-                    from_date=start_date.strftime("%Y-%m-%d"),
-                    to_date=end_date.strftime("%Y-%m-%d"),
-                    limit=200
-                )
+                    user_id = await aa_client.get_first_user_id()
                 
-                # Transform to DataFrame then to dict for consistency
-                df = AATransformer.transform_transactions(aa_txns)
+                # Served from the local store; only transactions newer than
+                # the last sync are fetched from AA
+                store = get_transaction_store()
+                window_start = start or (datetime.now() - timedelta(days=90)).date()
                 
-                # Sort by date desc
-                if not df.empty:
-                    df = df.sort_values('date', ascending=False)
-                    # Convert timestamps to string for JSON
-                    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
-                    
-                    # Replace NaN with None
-                    df = df.astype(object).where(pd.notnull(df), None)
-                    transactions = df.to_dict(orient='records')
-                else:
-                    transactions = []
+                def fetch_page():
+                    store.refresh(user_id, window_start)
+                    return store.page(user_id, window_start, end, category, after, limit)
                 
-                return {
-                    "status": "success",
-                    "transactions": transactions
-                }
+                page, next_cursor = await asyncio.to_thread(fetch_page)
+                return Response(content=serialize_page(page, columns, next_cursor), media_type="application/json")
             except Exception as e:
                 print(f"Error fetching AA transactions: {e}")
                 use_mock = True
 
         if use_mock:
             from data.mock_transactions import TRANSACTION_HISTORY
-            
-            # Convert DataFrame to list of dicts
-            # Sort by date desc
-            df = TRANSACTION_HISTORY.sort_values('date', ascending=False)
-            
-            # Replace NaN with None for JSON serialization
-            # Must cast to object first to allow None in float columns
-            df = df.astype(object).where(pd.notnull(df), None)
-            
-            transactions = df.to_dict(orient='records')
-            
-            return {
-                "status": "success",
-                "transactions": transactions
-            }
+            page, next_cursor = page_frame(TRANSACTION_HISTORY, start, end, category, after, limit)
+            return Response(content=serialize_page(page, columns, next_cursor), media_type="application/json")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/transactions/export")
+async def export_transactions(
+    user_id: Optional[str] = None,
+    format: str = "ndjson",
+    compression: str = "gzip",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None
+):
+    """
+    Stream a user's full transaction history as NDJSON, CSV or Parquet
+    
+    Args:
+        format: 'ndjson', 'csv' or 'parquet' (Parquet needs pyarrow)
+        compression: 'gzip' (default) or 'none'; Parquet is always zstd-compressed internally
+        start_date / end_date: Optional inclusive YYYY-MM-DD bounds
+        category: Only this category
+    """
+    try:
+        try:
+            check_export(format, compression)
+            start = date.fromisoformat(start_date) if start_date else None
+            end = date.fromisoformat(end_date) if end_date else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        use_mock = os.getenv("USE_MOCK_DATA", "false").lower() == "true"
+        
+        if not use_mock:
+            aa_client = get_async_aa_client()
+            if not user_id:
+                user_id = await aa_client.get_first_user_id()
+            chunks = aa_chunks(get_aa_client(), user_id, start, end, category)
+            # Pull the first chunk up front so AA errors surface as a status code,
+            # not as a truncated download
+            try:
+                first = await asyncio.to_thread(next, chunks, None)
+            except Exception as e:
+                raise HTTPException(status_code=502, detail=f"Error fetching AA transactions: {e}")
+            if first is not None:
+                chunks = itertools.chain([first], chunks)
+        else:
+            from data.mock_transactions import TRANSACTION_HISTORY
+            chunks = frame_chunks(TRANSACTION_HISTORY, start, end, category)
+        
+        media_type = "application/gzip" if compression == "gzip" and format != "parquet" else EXPORT_FORMATS[format]
+        return StreamingResponse(
+            encode_chunks(chunks, format, compression),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{export_filename(format, compression)}"'}
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/notifications")
-async def get_notifications():
-    """Get unread proactive notifications from the agent"""
+async def get_notifications(user_id: Optional[str] = None, mark_read: bool = True):
+    """Get unread proactive notifications for a user (defaults to the active user)"""
     try:
         manager = get_agent_manager()
-        messages = manager.get_unread_messages()
+        messages = manager.get_unread_messages(user_id, mark_read=mark_read)
         return {
             "status": "success",
             "count": len(messages),
@@ -408,6 +472,35 @@ async def get_notifications():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/notifications/stream")
+async def stream_notifications(user_id: Optional[str] = None, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of proactive notifications for a user.
+    Sends the unread backlog, then pushes new notifications as they are stored.
+    """
+    user_id = user_id or get_agent_manager().user_manager.active_user_id
+    return StreamingResponse(
+        get_notification_hub().stream(user_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/notifications/poll")
+async def poll_notifications(user_id: Optional[str] = None, timeout: float = 25.0):
+    """Long-poll fallback: returns as soon as there are unread notifications, or after timeout"""
+    try:
+        user_id = user_id or get_agent_manager().user_manager.active_user_id
+        messages = await get_notification_hub().wait(user_id, timeout=min(max(timeout, 0.0), 60.0))
+        return {
+            "status": "success",
+            "count": len(messages),
+            "messages": messages
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/api/optimize-spending")
 async def optimize_spending_endpoint(request: OptimizeSpendingRequest):
     """
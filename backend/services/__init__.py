@@ -1,12 +1,23 @@
 """Services package for external integrations"""
 
-from .aa_client import AAClient, get_aa_client, reset_aa_client, AAAPIError
+from .aa_client import AAClient, get_aa_client, reset_aa_client, AAAPIError, AARateLimitError, AACircuitOpenError
 from .aa_transformer import AATransformer
+from .aa_async_client import AsyncAAClient, get_async_aa_client
+from .transaction_store import TransactionStore, get_transaction_store
+from .portfolio_engine import PortfolioPayloadCache, get_portfolio_cache
 
 __all__ = [
     'AAClient',
     'get_aa_client', 
     'reset_aa_client',
     'AAAPIError',
-    'AATransformer'
+    'AARateLimitError',
+    'AACircuitOpenError',
+    'AATransformer',
+    'AsyncAAClient',
+    'get_async_aa_client',
+    'TransactionStore',
+    'get_transaction_store',
+    'PortfolioPayloadCache',
+    'get_portfolio_cache'
 ]
@@ -0,0 +1,305 @@
+"""
+Async Account Aggregator API Client
+
+Non-blocking counterpart of AAClient for async FastAPI handlers. Shares the
+sync client's configuration, response handling and data-version tracking, and
+adds get_snapshot() to fetch several endpoints of a user concurrently.
+"""
+
+import asyncio
+import functools
+import time
+from datetime import datetime
+from collections import deque
+from typing import Optional, Dict, Any, List, Iterable, AsyncIterator, Set
+
+import httpx
+import logging
+
+from .aa_client import AAClient, AAAPIError, AAServerError, AARateLimitError, USER_ENDPOINTS, get_aa_client
+from .aa_schemas import AA_SCHEMAS, AATyped
+
+logger = logging.getLogger(__name__)
+
+# Parts fetched by get_snapshot() when none are given
+DEFAULT_SNAPSHOT_PARTS = ("profile", "accounts", "net_worth", "investments", "liabilities", "transactions")
+
+
+class AsyncAAClient:
+    """
+    Async AA API client built on httpx.AsyncClient
+    """
+
+    def __init__(self, sync_client: Optional[AAClient] = None):
+        """
+        Initialize Async AA Client
+
+        Args:
+            sync_client: AAClient whose settings and data-version state are shared
+                         (defaults to the current singleton)
+        """
+        self._sync = sync_client
+        self._http: Optional[httpx.AsyncClient] = None
+
+    @property
+    def sync(self) -> AAClient:
+        return self._sync or get_aa_client()
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client (created on first use, inside the running loop)"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self.sync.http_timeout, **AAClient._client_options())
+        return self._http
+
+    async def aclose(self):
+        """Close pooled connections (FastAPI shutdown hook)"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _make_request(self, method: str, endpoint: str, typed: bool = False, **kwargs) -> Any:
+        """
+        Make HTTP request (served from the shared response cache when possible)
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            AACircuitOpenError: If the endpoint's circuit breaker is open
+            AAAPIError: On API errors
+        """
+        sync = self.sync
+        cache = sync._cache_for(method, endpoint, kwargs.get("params"))
+        if cache is not None:
+            # Stale entries are refreshed by the cache's worker threads via the sync client
+            lookup = functools.partial(
+                cache.get, endpoint, kwargs.get("params"),
+                refresh=lambda: sync._make_request(method, endpoint, fresh=True, typed=typed, **kwargs),
+                typed=typed
+            )
+            if cache.reads_disk(endpoint, kwargs.get("params"), typed):
+                cached = await asyncio.to_thread(lookup)
+            else:
+                cached = lookup()
+            if cached is not None:
+                return cached
+
+        async def fetch():
+            data = await self._fetch(method, endpoint, typed=typed, **kwargs)
+            if cache is not None:
+                params = kwargs.get("params")
+                cache.put(endpoint, params, data, typed=typed, fingerprint=sync._fingerprint_of(endpoint, params))
+            return data
+
+        return await sync.singleflight.do_async(sync._flight_key(method, endpoint, kwargs, typed), fetch)
+
+    async def _fetch(self, method: str, endpoint: str, typed: bool = False, **kwargs) -> Any:
+        """HTTP request with retries, backoff and the endpoint's circuit breaker"""
+        sync = self.sync
+        url = f"{sync.base_url}{endpoint}"
+        sync._before_request(endpoint)
+
+        for attempt in range(sync.max_retries):
+            try:
+                response = await self.http.request(method, url, **kwargs)
+                data = sync._parse_response(endpoint, response, kwargs.get("params"), typed)
+            except (AAServerError, AARateLimitError, httpx.RequestError) as e:
+                await asyncio.sleep(sync._retry_delay(endpoint, e, attempt))
+                continue
+            except AAAPIError:
+                sync.breaker(endpoint).record_success()
+                raise
+
+            sync.breaker(endpoint).record_success()
+            return data
+
+        raise AAAPIError("Max retries exceeded")
+
+    async def _get_user_data(self, part: str, user_id: str, **params) -> Dict[str, Any]:
+        if not user_id:
+            raise AAAPIError("user_id is required")
+        return await self._make_request("GET", USER_ENDPOINTS[part], params={"user_id": user_id, **params})
+
+    # -------------------------------
+    # ENDPOINTS
+    # -------------------------------
+
+    async def list_users(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Get list of all users (shares the sync client's cache)"""
+        sync = self.sync
+        if not force_refresh and sync._users_cache and sync._users_cache_time:
+            if datetime.now() - sync._users_cache_time < sync._cache_ttl:
+                return sync._users_cache
+
+        response = await self._make_request("GET", "/api/v1/auth/users")
+        sync._users_cache = response.get("users", [])
+        sync._users_cache_time = datetime.now()
+        return sync._users_cache
+
+    async def get_first_user_id(self) -> str:
+        users = await self.list_users()
+        if users:
+            return users[0]["_id"]
+        raise AAAPIError("No users found")
+
+    async def get_profile(self, user_id: str) -> Dict[str, Any]:
+        return await self._get_user_data("profile", user_id)
+
+    async def get_accounts(self, user_id: str) -> Dict[str, Any]:
+        return await self._get_user_data("accounts", user_id)
+
+    async def get_net_worth(self, user_id: str) -> Dict[str, Any]:
+        return await self._get_user_data("net_worth", user_id)
+
+    async def get_investments(self, user_id: str) -> Dict[str, Any]:
+        return await self._get_user_data("investments", user_id)
+
+    async def get_liabilities(self, user_id: str) -> Dict[str, Any]:
+        return await self._get_user_data("liabilities", user_id)
+
+    async def get_typed(self, part: str, user_id: str) -> AATyped:
+        """Typed counterpart of the part's getter (see AAClient.get_typed)"""
+        if not user_id:
+            raise AAAPIError("user_id is required")
+        endpoint = USER_ENDPOINTS.get(part)
+        if endpoint not in AA_SCHEMAS:
+            raise ValueError(f"No typed schema for '{part}'")
+        return await self._make_request("GET", endpoint, typed=True, params={"user_id": user_id})
+
+    async def get_income_sources(self, user_id: str) -> Dict[str, Any]:
+        return await self._get_user_data("income_sources", user_id)
+
+    async def get_monthly_spending(self, user_id: str, months: int = 6) -> Dict[str, Any]:
+        return await self._get_user_data("monthly_spending", user_id, **({"months": months} if months else {}))
+
+    async def get_transactions(
+        self,
+        user_id: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Get transactions (same parameters as AAClient.get_transactions)"""
+        if not user_id:
+            raise AAAPIError("user_id is required")
+        params = AAClient._transaction_params(user_id, from_date, to_date, category, limit, offset)
+        return await self._make_request("GET", USER_ENDPOINTS["transactions"], params=params)
+
+    async def aiter_transactions(
+        self,
+        user_id: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        category: Optional[str] = None,
+        page_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        as_frames: bool = False
+    ) -> AsyncIterator[Any]:
+        """
+        Async counterpart of AAClient.iter_transactions: pages through the
+        window with up to `prefetch` page requests in flight ahead of the consumer
+        """
+        if not user_id:
+            raise AAAPIError("user_id is required")
+
+        sync = self.sync
+        page_size = page_size or sync.page_size
+        prefetch = max(1, prefetch or sync.prefetch_pages)
+
+        def fetch(offset: int):
+            return asyncio.ensure_future(
+                self.get_transactions(user_id, from_date, to_date, category, limit=page_size, offset=offset)
+            )
+
+        page = await fetch(0)
+        total = page.get("total")
+        next_offset = page_size
+        pending = deque()
+        seen: Set[str] = set()
+        try:
+            while True:
+                if total is not None:
+                    while len(pending) < prefetch and next_offset < total:
+                        pending.append(fetch(next_offset))
+                        next_offset += page_size
+                elif not pending and len(page.get("transactions", [])) >= page_size:
+                    pending.append(fetch(next_offset))
+                    next_offset += page_size
+
+                yield AAClient._page_chunk(page, seen, as_frames)
+
+                if not pending:
+                    return
+                page = await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_snapshot(
+        self,
+        user_id: str,
+        parts: Iterable[str] = DEFAULT_SNAPSHOT_PARTS,
+        transaction_params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch several parts of a user's financial picture concurrently
+
+        Args:
+            user_id: User's _id (required)
+            parts: Any of USER_ENDPOINTS' keys
+            transaction_params: Extra arguments for the transactions part
+                                (from_date, to_date, category, limit, offset)
+
+        Returns:
+            Dict with one entry per part that succeeded, plus "errors"
+            (part -> message) for the ones that failed and "elapsed_ms"
+        """
+        if not user_id:
+            raise AAAPIError("user_id is required")
+
+        parts = list(dict.fromkeys(parts))
+        unknown = [p for p in parts if p not in USER_ENDPOINTS]
+        if unknown:
+            raise ValueError(f"Unknown snapshot parts: {unknown}")
+
+        def fetch(part: str):
+            if part == "transactions":
+                return self.get_transactions(user_id, **(transaction_params or {}))
+            if part == "monthly_spending":
+                return self.get_monthly_spending(user_id)
+            return self._get_user_data(part, user_id)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(fetch(p) for p in parts), return_exceptions=True)
+
+        snapshot: Dict[str, Any] = {"errors": {}}
+        for part, result in zip(parts, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Snapshot part '{part}' failed for {user_id}: {result}")
+                snapshot["errors"][part] = str(result)
+            else:
+                snapshot[part] = result
+        snapshot["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return snapshot
+
+
+# Singleton instance
+_async_aa_client_instance: Optional[AsyncAAClient] = None
+
+
+def get_async_aa_client() -> AsyncAAClient:
+    """
+    Get or create the singleton async AA client instance
+
+    Returns:
+        AsyncAAClient instance
+    """
+    global _async_aa_client_instance
+
+    if _async_aa_client_instance is None:
+        _async_aa_client_instance = AsyncAAClient()
+
+    return _async_aa_client_instance
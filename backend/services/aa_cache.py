@@ -0,0 +1,262 @@
+"""
+Per-user response cache for AA data endpoints.
+
+Entries are keyed by (endpoint, params) and owned by the user in params.
+An entry is fresh for its endpoint's TTL; after that it is still served for
+a stale window while a background refresh fetches the new payload
+(stale-while-revalidate). An optional on-disk tier keeps the cache warm
+across restarts.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fresh lifetime per endpoint (seconds); endpoints not listed are not cached
+AA_CACHE_TTLS = {
+    "/api/v1/auth/profile": 3600,
+    "/api/v1/accounts": 600,
+    "/api/v1/aggregated/net-worth": 600,
+    "/api/v1/aggregated/transactions": 600,
+    "/api/v1/aggregated/investments": 900,
+    "/api/v1/aggregated/liabilities": 3600,
+    "/api/v1/aggregated/monthly-spending": 1800,
+    "/api/v1/aggregated/income-sources": 3600,
+}
+
+
+def _canonical_params(params: Optional[Dict[str, Any]]) -> str:
+    return json.dumps({k: str(v) for k, v in (params or {}).items()}, sort_keys=True)
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value or "anonymous")
+
+
+class AAResponseCache:
+    """
+    TTL + stale-while-revalidate cache with an optional disk tier.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        stale_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        on_disk_hit: Optional[Callable[[str, Optional[Dict[str, Any]], str], None]] = None
+    ):
+        """
+        Args:
+            ttls: Fresh lifetime per endpoint (defaults to AA_CACHE_TTLS)
+            stale_seconds: How long past its TTL an entry may be served while refreshing
+            max_entries: In-memory entries (LRU)
+            disk_dir: Directory for the on-disk tier (None disables it)
+            on_disk_hit: Called with (endpoint, params, fingerprint) when an entry
+                         stored with a payload fingerprint is loaded from disk
+        """
+        self.ttls = dict(ttls or AA_CACHE_TTLS)
+        self.stale_seconds = stale_seconds if stale_seconds is not None else float(os.getenv("AA_CACHE_STALE_SECONDS", "3600"))
+        self.max_entries = max_entries or int(os.getenv("AA_CACHE_MAX_ENTRIES", "2000"))
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.on_disk_hit = on_disk_hit
+
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (stored_at, data)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._workers = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aa-cache")
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    # -------------------------------
+    # PUBLIC API
+    # -------------------------------
+
+    def is_cacheable(self, endpoint: str) -> bool:
+        return endpoint in self.ttls
+
+    def reads_disk(self, endpoint: str, params: Optional[Dict[str, Any]], typed: bool = False) -> bool:
+        """Whether get() for this request would have to read the disk tier"""
+        if self.disk_dir is None or typed:
+            return False
+        key = (endpoint, _canonical_params(params), typed)
+        with self._lock:
+            return key not in self._entries
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]], refresh: Callable[[], Any],
+            typed: bool = False) -> Optional[Any]:
+        """
+        Cached payload for the request, or None on a miss.
+        A stale hit schedules refresh() in the background. Treat the result as read-only.
+
+        Args:
+            endpoint: AA endpoint path
+            params: Query parameters (must include user_id)
+            refresh: Fetches the payload from AA (and stores it via put)
+            typed: Look up the typed (aa_schemas) form, which is kept in memory only
+        """
+        key = (endpoint, _canonical_params(params), typed)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        source = "hits"
+        if entry is None and not typed:
+            stored = self._read_disk(key, params)
+            source = "disk_hits"
+            if stored is not None:
+                entry, fingerprint = stored
+                self._remember(key, entry)
+                if fingerprint and self.on_disk_hit is not None:
+                    self.on_disk_hit(endpoint, params, fingerprint)
+
+        ttl = self.ttls.get(endpoint, 0)
+        if entry is not None:
+            age = now - entry[0]
+            if age < ttl:
+                self._count(endpoint, source)
+                return entry[1]
+            if age < ttl + self.stale_seconds:
+                self._count(endpoint, "stale_hits")
+                self._schedule_refresh(key, endpoint, refresh)
+                return entry[1]
+
+        self._count(endpoint, "misses")
+        return None
+
+    def put(self, endpoint: str, params: Optional[Dict[str, Any]], data: Any, typed: bool = False,
+            fingerprint: Optional[str] = None):
+        """
+        Store a freshly fetched payload
+
+        Args:
+            fingerprint: Digest of the response body, kept with the disk copy
+                         and handed to on_disk_hit when it is loaded again
+        """
+        key = (endpoint, _canonical_params(params), typed)
+        entry = (time.time(), data)
+        self._remember(key, entry)
+        if self.disk_dir is not None and not typed:
+            self._workers.submit(self._write_disk, key, params, entry, fingerprint)
+
+    def invalidate(self, user_id: Optional[str] = None, endpoint: Optional[str] = None) -> int:
+        """
+        Drop cached payloads for a user and/or endpoint (everything if neither is given).
+
+        Returns:
+            Number of in-memory entries removed
+        """
+        with self._lock:
+            doomed = [
+                k for k in self._entries
+                if (endpoint is None or k[0] == endpoint) and
+                   (user_id is None or json.loads(k[1]).get("user_id") == user_id)
+            ]
+            for k in doomed:
+                del self._entries[k]
+
+        if self.disk_dir is not None and self.disk_dir.exists():
+            if user_id is None and endpoint is None:
+                shutil.rmtree(self.disk_dir, ignore_errors=True)
+            else:
+                users = [self.disk_dir / _safe_name(user_id)] if user_id else [p for p in self.disk_dir.iterdir() if p.is_dir()]
+                for user_dir in users:
+                    pattern = f"{_safe_name(endpoint)}-*.json" if endpoint else "*.json"
+                    for path in user_dir.glob(pattern):
+                        path.unlink(missing_ok=True)
+
+        self._count(endpoint or "*", "invalidations")
+        return len(doomed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_endpoint = {e: dict(c) for e, c in self.stats.items()}
+            entries = len(self._entries)
+        for counts in by_endpoint.values():
+            served = counts.get("hits", 0) + counts.get("stale_hits", 0) + counts.get("disk_hits", 0)
+            lookups = served + counts.get("misses", 0)
+            counts["hit_rate"] = round(served / lookups, 4) if lookups else 0.0
+        return {
+            "entries": entries,
+            "disk_tier": str(self.disk_dir) if self.disk_dir else None,
+            "by_endpoint": by_endpoint
+        }
+
+    # -------------------------------
+    # HELPERS
+    # -------------------------------
+
+    def _count(self, endpoint: str, counter: str, amount: int = 1):
+        with self._lock:
+            counts = self.stats.setdefault(endpoint, {})
+            counts[counter] = counts.get(counter, 0) + amount
+
+    def _remember(self, key: tuple, entry: tuple):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _schedule_refresh(self, key: tuple, endpoint: str, refresh: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                refresh()
+                self._count(endpoint, "refreshes")
+            except Exception as e:
+                logger.warning(f"Background refresh of {endpoint} failed: {e}")
+                self._count(endpoint, "refresh_failures")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._workers.submit(run)
+
+    def _disk_path(self, key: tuple, params: Optional[Dict[str, Any]]) -> Path:
+        digest = hashlib.blake2b(key[1].encode(), digest_size=12).hexdigest()
+        user_dir = self.disk_dir / _safe_name((params or {}).get("user_id", ""))
+        return user_dir / f"{_safe_name(key[0])}-{digest}.json"
+
+    def _read_disk(self, key: tuple, params: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key, params)
+        try:
+            with open(path, "r") as f:
+                stored = json.load(f)
+            return (stored["stored_at"], stored["data"]), stored.get("fingerprint")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable AA cache file {path}: {e}")
+            return None
+
+    def _write_disk(self, key: tuple, params: Optional[Dict[str, Any]], entry: tuple,
+                    fingerprint: Optional[str] = None):
+        path = self._disk_path(key, params)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"endpoint": key[0], "params": key[1], "stored_at": entry[0],
+                           "fingerprint": fingerprint, "data": entry[1]}, f)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Failed to write AA cache file {path}: {e}")
@@ -10,11 +10,26 @@ UPDATED for No-Auth Mode (v2.1.0)
 """
 
 import httpx
+import hashlib
 import os
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, List, Iterator, Set
+from datetime import datetime, timedelta, timezone
 import logging
 
+from pydantic import ValidationError
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .aa_cache import AAResponseCache, _canonical_params
+from .singleflight import SingleFlight
+from .aa_schemas import AA_SCHEMAS, AATyped, decode_response, as_typed
+from .aa_stream import TransactionStreamParser
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,9 +40,35 @@ class AAAPIError(Exception):
 
 class AARateLimitError(AAAPIError):
     """Rate limit exceeded"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AAServerError(AAAPIError):
+    """5xx response from the AA API (retryable)"""
     pass
 
 
+class AACircuitOpenError(AAAPIError):
+    """AA endpoint is failing; call rejected without contacting it"""
+    pass
+
+
+# Endpoints of the per-user data calls, by snapshot part
+USER_ENDPOINTS = {
+    "profile": "/api/v1/auth/profile",
+    "accounts": "/api/v1/accounts",
+    "net_worth": "/api/v1/aggregated/net-worth",
+    "transactions": "/api/v1/aggregated/transactions",
+    "investments": "/api/v1/aggregated/investments",
+    "liabilities": "/api/v1/aggregated/liabilities",
+    "monthly_spending": "/api/v1/aggregated/monthly-spending",
+    "income_sources": "/api/v1/aggregated/income-sources",
+}
+
+
 class AAClient:
     """
     Account Aggregator API Client
@@ -44,68 +85,332 @@ class AAClient:
         """
         self.base_url = base_url or os.getenv("AA_BASE_URL", "http://localhost:3000")
         self.timeout = int(os.getenv("AA_TIMEOUT_SECONDS", "30"))
+        self.connect_timeout = float(os.getenv("AA_CONNECT_TIMEOUT_SECONDS", "5"))
         self.max_retries = int(os.getenv("AA_MAX_RETRIES", "3"))
         
+        # Exponential backoff with full jitter between retries
+        self.backoff_base = float(os.getenv("AA_BACKOFF_BASE_SECONDS", "0.5"))
+        self.backoff_max = float(os.getenv("AA_BACKOFF_MAX_SECONDS", "8"))
+        self.retry_after_max = float(os.getenv("AA_RETRY_AFTER_MAX_SECONDS", "30"))
+        
+        # Per-endpoint circuit breakers
+        self.breaker_threshold = int(os.getenv("AA_BREAKER_FAILURE_THRESHOLD", "5"))
+        self.breaker_recovery = float(os.getenv("AA_BREAKER_RECOVERY_SECONDS", "30"))
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        
+        # Long-lived HTTP client (connection pool with keep-alive), created on first use
+        self._http: Optional[httpx.Client] = None
+        self._http_lock = threading.Lock()
+        
+        # Per-user response cache for data endpoints (TTL + stale-while-revalidate)
+        self.cache: Optional[AAResponseCache] = None
+        if os.getenv("AA_CACHE_ENABLED", "true").lower() == "true":
+            self.cache = AAResponseCache(
+                disk_dir=os.getenv("AA_CACHE_DIR") or None,
+                on_disk_hit=self._record_digest
+            )
+        
+        # Identical concurrent requests share one in-flight call
+        self.singleflight = SingleFlight()
+        
+        # Transaction paging: page size, pages fetched ahead, shared prefetch pool
+        self.page_size = int(os.getenv("AA_PAGE_SIZE", "500"))
+        self.prefetch_pages = int(os.getenv("AA_PREFETCH_PAGES", "2"))
+        self.stream_batch_size = int(os.getenv("AA_STREAM_BATCH_SIZE", "2000"))
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        
         # User cache
         self._users_cache: Optional[List[Dict]] = None
         self._users_cache_time: Optional[datetime] = None
         self._cache_ttl = timedelta(minutes=5)
+        
+        # Per-user data version: changes only when a re-fetched payload differs
+        self._fingerprints: Dict[tuple, str] = {}
+        self._data_versions: Dict[str, str] = {}
+        self._version_lock = threading.Lock()
+    
+    def _record_fingerprint(self, endpoint: str, params: Optional[Dict[str, Any]], content: bytes):
+        """Track payload fingerprints so callers can detect changed user data"""
+        self._record_digest(endpoint, params, hashlib.blake2b(content, digest_size=16).hexdigest())
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    def _record_digest(self, endpoint: str, params: Optional[Dict[str, Any]], digest: str):
+        """Fingerprint bookkeeping shared by live responses and disk-cache hits"""
+        user_id = (params or {}).get("user_id")
+        if not user_id:
+            return
+        
+        key = self._fingerprint_key(endpoint, params)
+        with self._version_lock:
+            previous = self._fingerprints.get(key)
+            self._fingerprints[key] = digest
+            if user_id not in self._data_versions or (previous is not None and previous != digest):
+                self._data_versions[user_id] = datetime.now().isoformat()
+    
+    @staticmethod
+    def _fingerprint_key(endpoint: str, params: Dict[str, Any]) -> tuple:
+        return (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+    
+    def _fingerprint_of(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Digest of the last response recorded for this request"""
+        if not (params or {}).get("user_id"):
+            return None
+        with self._version_lock:
+            return self._fingerprints.get(self._fingerprint_key(endpoint, params))
+    
+    def get_data_version(self, user_id: str) -> str:
         """
-        Make HTTP request with retries and error handling
+        Version token for a user's AA data
+        
+        Returns:
+            Timestamp of the last fetch that returned changed data ("0" if never fetched)
+        """
+        with self._version_lock:
+            return self._data_versions.get(user_id, "0")
+    
+    @staticmethod
+    def _client_options() -> Dict[str, Any]:
+        """Pool limits / keep-alive / HTTP/2 settings shared by the sync and async clients"""
+        options = {
+            "limits": httpx.Limits(
+                max_connections=int(os.getenv("AA_MAX_CONNECTIONS", "20")),
+                max_keepalive_connections=int(os.getenv("AA_MAX_KEEPALIVE_CONNECTIONS", "10")),
+                keepalive_expiry=float(os.getenv("AA_KEEPALIVE_EXPIRY_SECONDS", "30"))
+            )
+        }
+        if os.getenv("AA_HTTP2", "false").lower() == "true":
+            try:
+                import h2  # noqa: F401  (httpx needs the h2 package for HTTP/2)
+                options["http2"] = True
+            except ImportError:
+                logger.warning("AA_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1")
+        return options
+    
+    @property
+    def http(self) -> httpx.Client:
+        """Shared pooled HTTP client"""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    self._http = httpx.Client(timeout=self.http_timeout, **self._client_options())
+        return self._http
+    
+    @property
+    def http_timeout(self) -> httpx.Timeout:
+        """Overall timeout, with a shorter connect timeout so a dead host fails quickly"""
+        return httpx.Timeout(self.timeout, connect=min(self.connect_timeout, self.timeout))
+    
+    def close(self):
+        """Close pooled connections (FastAPI shutdown hook)"""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+    
+    def _parse_response(self, endpoint: str, response: httpx.Response, params: Optional[Dict[str, Any]],
+                        typed: bool = False) -> Any:
+        """
+        Validate an AA response and unwrap its "data" payload
+        
+        Args:
+            typed: Decode the body straight into the endpoint's aa_schemas type
+        
+        Raises:
+            AARateLimitError: On 429
+            AAServerError: On 5xx (retryable)
+            AAAPIError: On other API errors
+        """
+        if response.status_code == 429:
+            raise AARateLimitError(
+                "Rate limit exceeded. Please try again later.",
+                retry_after=self._parse_retry_after(response.headers.get("Retry-After"))
+            )
+        elif response.status_code >= 500:
+            raise AAServerError(f"Server error: {response.status_code}")
+        elif response.status_code >= 400:
+            try:
+                error_data = response.json() if response.text else {}
+            except:
+                error_data = {}
+            error_msg = error_data.get("error", f"HTTP {response.status_code}")
+            raise AAAPIError(f"API Error: {error_msg}")
+        
+        if typed:
+            try:
+                envelope = decode_response(endpoint, response.content)
+            except ValidationError as e:
+                raise AAAPIError(f"Invalid response from {endpoint}: {e.error_count()} validation error(s)")
+            if not envelope.success:
+                raise AAAPIError(envelope.error or "Unknown error")
+            self._record_fingerprint(endpoint, params, response.content)
+            return envelope.data if envelope.data is not None else as_typed(AA_SCHEMAS[endpoint], {})
+        
+        # Parse and return successful response
+        try:
+            data = response.json()
+        except Exception as e:
+            raise AAAPIError(f"Invalid JSON response from {endpoint}: {str(e)}")
+            
+        if not data.get("success"):
+            raise AAAPIError(data.get("error", "Unknown error"))
+        
+        self._record_fingerprint(endpoint, params, response.content)
+        return data.get("data", {})
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After header in seconds (delta-seconds or HTTP date)"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Circuit breaker guarding an endpoint"""
+        with self._breakers_lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(endpoint, self.breaker_threshold, self.breaker_recovery)
+                self._breakers[endpoint] = breaker
+            return breaker
+    
+    def get_breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state per endpoint (for /api/health)"""
+        with self._breakers_lock:
+            breakers = list(self._breakers.values())
+        return {b.name: b.snapshot() for b in breakers}
+    
+    def _before_request(self, endpoint: str):
+        try:
+            self.breaker(endpoint).before_call()
+        except CircuitOpenError as e:
+            raise AACircuitOpenError(str(e))
+    
+    def _retry_delay(self, endpoint: str, error: Exception, attempt: int) -> float:
+        """
+        Seconds to wait before retrying a failed attempt
+        
+        Raises:
+            The final error once retries are exhausted (AAAPIError subclass)
+        """
+        if isinstance(error, httpx.RequestError):
+            reason = f"Request failed: {error}"
+            final = AAAPIError(f"Network error: {str(error)}")
+        else:
+            reason = str(error)
+            final = error
+        
+        retry_after = getattr(error, "retry_after", None)
+        # Not worth holding the request longer than retry_after_max
+        give_up = attempt >= self.max_retries - 1 or (retry_after is not None and retry_after > self.retry_after_max)
+        if give_up:
+            # Rate limiting means the backend is up; only real failures trip the breaker
+            if isinstance(error, AARateLimitError):
+                self.breaker(endpoint).record_success()
+            else:
+                self.breaker(endpoint).record_failure()
+            raise final
+        
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        
+        logger.warning(f"{reason} (attempt {attempt + 1}/{self.max_retries}); retrying in {delay:.2f}s")
+        return delay
+    
+    def _cache_for(self, method: str, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[AAResponseCache]:
+        """The response cache if this request may be served from it"""
+        if self.cache is None or method != "GET" or not (params or {}).get("user_id"):
+            return None
+        return self.cache if self.cache.is_cacheable(endpoint) else None
+    
+    def invalidate_cache(self, user_id: Optional[str] = None, endpoint: Optional[str] = None) -> int:
+        """
+        Drop cached AA responses so the next call refetches
+        
+        Args:
+            user_id: Only this user's entries (all users if None)
+            endpoint: Only this endpoint (all endpoints if None)
+            
+        Returns:
+            Number of in-memory entries removed
+        """
+        return self.cache.invalidate(user_id, endpoint) if self.cache is not None else 0
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        stats = self.cache.get_stats() if self.cache is not None else {"enabled": False}
+        stats["singleflight"] = self.singleflight.get_stats()
+        return stats
+    
+    def _make_request(self, method: str, endpoint: str, fresh: bool = False, typed: bool = False, **kwargs) -> Any:
+        """
+        Make HTTP request (served from the response cache when possible)
         
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint (e.g., '/api/v1/accounts')
+            fresh: Skip the cache lookup (the response is still cached)
+            typed: Decode into the endpoint's aa_schemas type instead of dicts
             **kwargs: Additional arguments for httpx request
             
         Returns:
-            Parsed JSON response
+            Parsed JSON response (typed object if typed)
             
         Raises:
+            AACircuitOpenError: If the endpoint's circuit breaker is open
             AAAPIError: On API errors
         """
+        cache = self._cache_for(method, endpoint, kwargs.get("params"))
+        if cache is not None and not fresh:
+            cached = cache.get(
+                endpoint, kwargs.get("params"),
+                refresh=lambda: self._make_request(method, endpoint, fresh=True, typed=typed, **kwargs),
+                typed=typed
+            )
+            if cached is not None:
+                return cached
+        
+        def fetch():
+            data = self._fetch(method, endpoint, typed=typed, **kwargs)
+            if cache is not None:
+                params = kwargs.get("params")
+                cache.put(endpoint, params, data, typed=typed, fingerprint=self._fingerprint_of(endpoint, params))
+            return data
+        
+        return self.singleflight.do(self._flight_key(method, endpoint, kwargs, typed), fetch)
+    
+    @staticmethod
+    def _flight_key(method: str, endpoint: str, kwargs: Dict[str, Any], typed: bool = False) -> tuple:
+        return (method, endpoint, _canonical_params(kwargs.get("params")), typed)
+    
+    def _fetch(self, method: str, endpoint: str, typed: bool = False, **kwargs) -> Any:
+        """HTTP request with retries, backoff and the endpoint's circuit breaker"""
         url = f"{self.base_url}{endpoint}"
-        kwargs.setdefault("timeout", self.timeout)
+        self._before_request(endpoint)
         
         for attempt in range(self.max_retries):
             try:
-                with httpx.Client() as client:
-                    response = client.request(method, url, **kwargs)
-                    
-                    # Handle error responses
-                    if response.status_code == 429:
-                        raise AARateLimitError("Rate limit exceeded. Please try again later.")
-                    elif response.status_code >= 500:
-                        if attempt < self.max_retries - 1:
-                            logger.warning(f"Server error (attempt {attempt + 1}/{self.max_retries})")
-                            continue
-                        raise AAAPIError(f"Server error: {response.status_code}")
-                    elif response.status_code >= 400:
-                        try:
-                            error_data = response.json() if response.text else {}
-                        except:
-                            error_data = {}
-                        error_msg = error_data.get("error", f"HTTP {response.status_code}")
-                        raise AAAPIError(f"API Error: {error_msg}")
-                    
-                    # Parse and return successful response
-                    try:
-                        data = response.json()
-                    except Exception as e:
-                        raise AAAPIError(f"Invalid JSON response from {endpoint}: {str(e)}")
-                        
-                    if not data.get("success"):
-                        raise AAAPIError(data.get("error", "Unknown error"))
-                    
-                    return data.get("data", {})
-                    
-            except httpx.RequestError as e:
-                if attempt < self.max_retries - 1:
-                    logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}")
-                    continue
-                raise AAAPIError(f"Network error: {str(e)}")
+                response = self.http.request(method, url, **kwargs)
+                data = self._parse_response(endpoint, response, kwargs.get("params"), typed)
+            except (AAServerError, AARateLimitError, httpx.RequestError) as e:
+                time.sleep(self._retry_delay(endpoint, e, attempt))
+                continue
+            except AAAPIError:
+                # The backend answered; client-side errors don't count against it
+                self.breaker(endpoint).record_success()
+                raise
+            
+            self.breaker(endpoint).record_success()
+            return data
         
         raise AAAPIError("Max retries exceeded")
     
@@ -206,7 +511,8 @@ class AAClient:
         to_date: Optional[str] = None,
         category: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        fresh: bool = False
     ) -> Dict[str, Any]:
         """
         Get transactions
@@ -218,6 +524,7 @@ class AAClient:
             category: Filter by category
             limit: Results per page
             offset: Pagination offset
+            fresh: Fetch from the API even if the response is cached
             
         Returns:
             Dict with transactions list and metadata
@@ -225,6 +532,11 @@ class AAClient:
         if not user_id:
             raise AAAPIError("user_id is required")
             
+        params = self._transaction_params(user_id, from_date, to_date, category, limit, offset)
+        return self._make_request("GET", "/api/v1/aggregated/transactions", fresh=fresh, params=params)
+    
+    @staticmethod
+    def _transaction_params(user_id, from_date=None, to_date=None, category=None, limit=100, offset=0) -> Dict[str, Any]:
         params = {"user_id": user_id, "limit": limit, "offset": offset}
         if from_date:
             params["from"] = from_date
@@ -232,8 +544,192 @@ class AAClient:
             params["to"] = to_date
         if category:
             params["category"] = category
+        return params
+    
+    def iter_transactions(
+        self,
+        user_id: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        category: Optional[str] = None,
+        page_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        as_frames: bool = False,
+        fresh: bool = False
+    ) -> Iterator[Any]:
+        """
+        Iterate over every transaction in the window, page by page, fetching
+        the next pages in the background while the current one is consumed
         
-        return self._make_request("GET", "/api/v1/aggregated/transactions", params=params)
+        Args:
+            user_id: User's _id (required)
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            category: Filter by category
+            page_size: Transactions per request (defaults to AA_PAGE_SIZE)
+            prefetch: Max page requests in flight ahead of the consumer
+                      (defaults to AA_PREFETCH_PAGES)
+            as_frames: Yield AATransformer DataFrame chunks instead of raw pages
+            fresh: Fetch every page from the API, not the response cache
+            
+        Yields:
+            Page dicts in the get_transactions shape (transactions already seen
+            on an earlier page are dropped), or DataFrame chunks
+        """
+        if not user_id:
+            raise AAAPIError("user_id is required")
+        
+        page_size = page_size or self.page_size
+        prefetch = max(1, prefetch or self.prefetch_pages)
+        pool = self._pages_pool()
+        
+        def fetch(offset: int) -> Dict[str, Any]:
+            return self.get_transactions(user_id, from_date, to_date, category, limit=page_size, offset=offset,
+                                         fresh=fresh)
+        
+        page = fetch(0)
+        total = page.get("total")
+        next_offset = page_size
+        pending = deque()
+        seen: Set[str] = set()
+        try:
+            while True:
+                # Keep the window full before handing out the current page
+                if total is not None:
+                    while len(pending) < prefetch and next_offset < total:
+                        pending.append(pool.submit(fetch, next_offset))
+                        next_offset += page_size
+                elif not pending and len(page.get("transactions", [])) >= page_size:
+                    # Unknown total: only look one page ahead, and only after a full page
+                    pending.append(pool.submit(fetch, next_offset))
+                    next_offset += page_size
+                
+                yield self._page_chunk(page, seen, as_frames)
+                
+                if not pending:
+                    return
+                page = pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    def stream_transactions(
+        self,
+        user_id: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 100_000,
+        offset: int = 0,
+        batch_size: Optional[int] = None,
+        as_frames: bool = True
+    ) -> Iterator[Any]:
+        """
+        Fetch transactions in one request and parse the response as it streams in,
+        yielding fixed-size batches. Peak memory follows batch_size, not the
+        response size. Not cached or coalesced; meant for large one-off pulls.
+        
+        Args:
+            user_id: User's _id (required)
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            category: Filter by category
+            limit: Max transactions in the response
+            offset: Offset for pagination
+            batch_size: Transactions per batch (defaults to AA_STREAM_BATCH_SIZE)
+            as_frames: Yield AATransformer DataFrames instead of lists of raw dicts
+            
+        Yields:
+            DataFrame (or list) per batch
+            
+        Raises:
+            AAAPIError: On API errors, or if the response breaks off mid-stream
+        """
+        if not user_id:
+            raise AAAPIError("user_id is required")
+        
+        from .aa_transformer import AATransformer
+        
+        endpoint = USER_ENDPOINTS["transactions"]
+        params = self._transaction_params(user_id, from_date, to_date, category, limit, offset)
+        batch_size = batch_size or self.stream_batch_size
+        self._before_request(endpoint)
+        
+        def emit(batch):
+            return AATransformer.transform_transactions({"transactions": batch}) if as_frames else batch
+        
+        for attempt in range(self.max_retries):
+            parser = TransactionStreamParser(batch_size=batch_size)
+            try:
+                with self.http.stream("GET", f"{self.base_url}{endpoint}", params=params) as response:
+                    if response.status_code != 200:
+                        response.read()
+                        self._parse_response(endpoint, response, params)
+                    for chunk in response.iter_bytes():
+                        for batch in self._parse_stream(endpoint, parser.feed, chunk):
+                            yield emit(batch)
+                    batch, envelope = self._parse_stream(endpoint, parser.close)
+            except (AAServerError, AARateLimitError, httpx.RequestError) as e:
+                if parser.count:
+                    # Batches were already handed out; a retry would repeat them
+                    self.breaker(endpoint).record_failure()
+                    raise AAAPIError(f"Transaction stream broke off after {parser.count} rows: {e}")
+                # Records the breaker failure once retries are exhausted, as in _fetch
+                time.sleep(self._retry_delay(endpoint, e, attempt))
+                continue
+            except AAAPIError:
+                self.breaker(endpoint).record_success()
+                raise
+            except Exception:
+                # Our own failure (e.g. transforming a batch); the backend answered
+                self.breaker(endpoint).record_success()
+                raise
+            
+            self.breaker(endpoint).record_success()
+            if not envelope.get("success"):
+                raise AAAPIError(envelope.get("error", "Unknown error"))
+            if batch:
+                yield emit(batch)
+            return
+        
+        raise AAAPIError("Max retries exceeded")
+    
+    @staticmethod
+    def _parse_stream(endpoint: str, step, *args):
+        """Run a TransactionStreamParser step, reporting malformed bodies like _parse_response does"""
+        try:
+            return step(*args)
+        except ValueError as e:
+            raise AAAPIError(f"Invalid JSON response from {endpoint}: {e}")
+    
+    def _pages_pool(self) -> ThreadPoolExecutor:
+        if self._prefetch_pool is None:
+            with self._http_lock:
+                if self._prefetch_pool is None:
+                    self._prefetch_pool = ThreadPoolExecutor(
+                        max_workers=int(os.getenv("AA_PREFETCH_WORKERS", "4")), thread_name_prefix="aa-pages"
+                    )
+        return self._prefetch_pool
+    
+    @staticmethod
+    def _page_chunk(page: Dict[str, Any], seen: Set[str], as_frames: bool) -> Any:
+        """
+        Drop transactions already yielded (offsets shift if new ones arrive
+        mid-iteration) and optionally convert the page to a DataFrame
+        """
+        transactions = []
+        for txn in page.get("transactions", []):
+            txn_id = txn.get("id") or txn.get("referenceId")
+            if txn_id:
+                if txn_id in seen:
+                    continue
+                seen.add(txn_id)
+            transactions.append(txn)
+        chunk = {**page, "transactions": transactions}
+        if as_frames:
+            from .aa_transformer import AATransformer
+            return AATransformer.transform_transactions(chunk)
+        return chunk
     
     def get_investments(self, user_id: str) -> Dict[str, Any]:
         """
@@ -265,6 +761,27 @@ class AAClient:
             
         return self._make_request("GET", "/api/v1/aggregated/liabilities", params={"user_id": user_id})
     
+    def get_typed(self, part: str, user_id: str) -> AATyped:
+        """
+        Get a user's data decoded straight into its typed schema (aa_schemas),
+        skipping the fields the transforms don't read
+        
+        Args:
+            part: "profile", "accounts", "net_worth", "investments" or "liabilities"
+            user_id: User's _id (required)
+            
+        Returns:
+            Profile, AccountsData, NetWorth, InvestmentsData or LiabilitiesData
+            (accepted by the matching AATransformer method)
+        """
+        if not user_id:
+            raise AAAPIError("user_id is required")
+        endpoint = USER_ENDPOINTS.get(part)
+        if endpoint not in AA_SCHEMAS:
+            raise ValueError(f"No typed schema for '{part}'")
+        
+        return self._make_request("GET", endpoint, typed=True, params={"user_id": user_id})
+    
     def get_monthly_spending(self, user_id: str, months: int = 6) -> Dict[str, Any]:
         """
         Get monthly spending breakdown
@@ -326,4 +843,6 @@ def get_aa_client(token: Optional[str] = None) -> AAClient:
 def reset_aa_client():
     """Reset the singleton instance (useful for testing)"""
     global _aa_client_instance
+    if _aa_client_instance is not None:
+        _aa_client_instance.close()
     _aa_client_instance = None
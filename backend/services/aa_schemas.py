@@ -0,0 +1,190 @@
+"""
+Typed schemas for AA API responses
+
+Compact slotted dataclasses validated by pydantic-core. Responses can be
+decoded straight from the raw bytes (decode_response), which skips every
+field the app doesn't read instead of materializing it as dicts, or
+converted from an already decoded dict (as_typed). Field names are the
+snake_case forms of the API's camelCase keys.
+
+Every field is optional with the default AATransformer used to apply via
+dict.get(), so partial or sparse payloads decode the same way as before.
+"""
+
+import dataclasses
+from typing import Optional, Dict, Any, List, Type, Union
+
+from pydantic import ConfigDict, TypeAdapter
+from pydantic.alias_generators import to_camel
+from pydantic.dataclasses import dataclass
+
+_CONFIG = ConfigDict(
+    alias_generator=to_camel,
+    populate_by_name=True,
+    extra="ignore",
+    coerce_numbers_to_str=True  # e.g. numeric mobile numbers or ids
+)
+
+
+def _schema(cls):
+    return dataclass(cls, config=_CONFIG, slots=True)
+
+
+def _list():
+    return dataclasses.field(default_factory=list)
+
+
+# -------------------------------
+# PROFILE
+# -------------------------------
+
+@_schema
+class Profile:
+    name: Optional[str] = ""
+    age: Optional[int] = 0
+    email: Optional[str] = ""
+    pan: Optional[str] = ""
+    kyc_completed: Optional[bool] = False
+    mobile: Optional[str] = ""
+    aa_handle: Optional[str] = ""
+    dob: Optional[str] = ""
+    financial_goals: Optional[List[str]] = None
+    risk_tolerance: Optional[str] = "moderate"
+    investment_horizon: Optional[str] = "long-term"
+
+
+# -------------------------------
+# ACCOUNTS
+# -------------------------------
+
+@_schema
+class Account:
+    id: Optional[str] = ""
+    type: Optional[str] = None
+    account_type: Optional[str] = "Savings"
+    fip_name: Optional[str] = "Unknown Bank"
+    ifsc_code: Optional[str] = ""
+    branch: Optional[str] = ""
+    masked_acc_number: Optional[str] = "XXXXXXXX"
+    opening_date: Optional[str] = ""
+    status: Optional[str] = "Active"
+    current_balance: Optional[float] = 0.0
+
+
+@_schema
+class AccountsData:
+    count: Optional[int] = 0
+    accounts: List[Account] = _list()
+
+
+# -------------------------------
+# INVESTMENTS
+# -------------------------------
+
+@_schema
+class Investment:
+    id: Optional[str] = ""
+    type: Optional[str] = ""
+    scheme_name: Optional[str] = ""
+    provider: Optional[str] = ""
+    invested_amount: Optional[float] = 0
+    current_value: Optional[float] = 0
+    returns_percentage: Optional[float] = 0
+    units: Optional[float] = 0
+    quantity: Optional[float] = 0
+    status: Optional[str] = "ACTIVE"
+
+
+@_schema
+class InvestmentsData:
+    count: Optional[int] = 0
+    investments: List[Investment] = _list()
+
+
+# -------------------------------
+# LIABILITIES
+# -------------------------------
+
+@_schema
+class Liability:
+    id: Optional[str] = "XXXX"
+    type: Optional[str] = ""
+    provider: Optional[str] = "Unknown"
+    outstanding_amount: Optional[float] = 0
+    interest_rate: Optional[float] = None
+    tenure: Optional[int] = 0
+    emi_amount: Optional[float] = 0
+
+
+@_schema
+class LiabilitiesData:
+    count: Optional[int] = 0
+    liabilities: List[Liability] = _list()
+
+
+# -------------------------------
+# NET WORTH
+# -------------------------------
+
+@_schema
+class NetWorth:
+    net_worth: Optional[float] = 0
+    breakdown: Optional[Dict[str, Any]] = None
+
+
+AATyped = Union[Profile, AccountsData, InvestmentsData, LiabilitiesData, NetWorth]
+
+# Data schema per AA endpoint
+AA_SCHEMAS: Dict[str, Type] = {
+    "/api/v1/auth/profile": Profile,
+    "/api/v1/accounts": AccountsData,
+    "/api/v1/aggregated/net-worth": NetWorth,
+    "/api/v1/aggregated/investments": InvestmentsData,
+    "/api/v1/aggregated/liabilities": LiabilitiesData,
+}
+
+
+def _envelope(data_type: Type):
+    @dataclass(config=_CONFIG, slots=True)
+    class Envelope:
+        success: Optional[bool] = False
+        data: Optional[data_type] = None
+        error: Optional[str] = None
+    return Envelope
+
+
+# Compiled validators, built once per schema
+_DATA_ADAPTERS = {cls: TypeAdapter(cls) for cls in AA_SCHEMAS.values()}
+_ENVELOPE_ADAPTERS = {endpoint: TypeAdapter(_envelope(cls)) for endpoint, cls in AA_SCHEMAS.items()}
+
+
+def has_schema(endpoint: str) -> bool:
+    return endpoint in AA_SCHEMAS
+
+
+def decode_response(endpoint: str, content: bytes):
+    """
+    Decode a raw AA response body into its typed envelope
+
+    Args:
+        endpoint: AA endpoint path (must have a schema)
+        content: Response body
+
+    Returns:
+        Envelope with success, data (typed, or None) and error
+
+    Raises:
+        ValidationError: If the body isn't valid JSON or doesn't fit the schema
+    """
+    return _ENVELOPE_ADAPTERS[endpoint].validate_json(content)
+
+
+def as_typed(schema: Type, data: Any):
+    """
+    Typed view of an AA payload; dicts (e.g. cached responses) are validated,
+    typed objects pass through
+    """
+    if isinstance(data, schema):
+        return data
+    return _DATA_ADAPTERS[schema].validate_python(data or {})
+
@@ -0,0 +1,152 @@
+"""
+Incremental parser for AA transaction responses.
+
+Splits the data.transactions array out of a response body as the bytes
+arrive and returns its elements in fixed-size batches, so a large response
+never has to be held (or decoded) in full. Everything else in the body
+(success flag, totals, breakdowns) is kept and parsed once the stream ends.
+"""
+
+import codecs
+import json
+import re
+from typing import Optional, Dict, Any, List
+
+# A complete string, a lone quote (string not complete yet), or a structural character
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|"|[{}\[\]:]')
+_SKIP = re.compile(r"[\s,]*")
+
+
+class TransactionStreamParser:
+    """
+    Feed response chunks in; get lists of transaction dicts out.
+    """
+
+    def __init__(self, batch_size: int = 2000, path: tuple = ("data", "transactions")):
+        """
+        Args:
+            batch_size: Transactions per returned batch
+            path: Keys leading to the array to stream
+        """
+        self.batch_size = batch_size
+        self.path = path
+        self.count = 0
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "head"          # head -> array -> tail
+        self._stack: List[list] = []  # [container char, last key] per open container
+        self._key: Optional[str] = None
+        self._head: List[str] = []    # body text before the array (kept for the envelope)
+        self._tail: List[str] = []
+        self._batch: List[Dict[str, Any]] = []
+
+    def feed(self, chunk: bytes) -> List[List[Dict[str, Any]]]:
+        """
+        Consume a chunk of the body
+
+        Returns:
+            Full batches completed by this chunk (possibly none)
+        """
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(chunk)
+        self._pos = 0
+        batches = []
+        while True:
+            if self._state == "head":
+                if not self._scan_head():
+                    break
+            elif self._state == "array":
+                if not self._scan_array(batches):
+                    break
+            else:
+                self._tail.append(self._buffer[self._pos:])
+                self._pos = len(self._buffer)
+                break
+        return batches
+
+    def close(self) -> tuple:
+        """
+        Finish the stream
+
+        Returns:
+            (last partial batch, envelope) where the envelope is the parsed body
+            with the streamed array left empty
+        """
+        self.feed(b"")
+        self._buffer += self._decoder.decode(b"", final=True)
+        if self._state == "array":
+            raise ValueError("Response ended inside the transactions array")
+        if self._state == "head":
+            self._head.append(self._buffer[self._pos:])
+            envelope = json.loads("".join(self._head))
+        else:
+            envelope = json.loads("".join(self._head) + "]" + "".join(self._tail))
+        batch, self._batch = self._batch, []
+        return batch, envelope
+
+    # -------------------------------
+    # HELPERS
+    # -------------------------------
+
+    def _scan_head(self) -> bool:
+        """Walk the body until the target array opens; False if more data is needed"""
+        start = self._pos
+        for match in _TOKEN.finditer(self._buffer, self._pos):
+            token = match.group()
+            if token == '"':
+                # String continues in the next chunk
+                self._head.append(self._buffer[start:match.start()])
+                self._pos = match.start()
+                return False
+            if token[0] == '"':
+                self._key = token
+            elif token == ":":
+                if self._stack and self._stack[-1][0] == "{":
+                    self._stack[-1][1] = json.loads(self._key)
+            elif token in "{[":
+                if token == "[" and self._at_target():
+                    self._head.append(self._buffer[start:match.end()])
+                    self._pos = match.end()
+                    self._state = "array"
+                    return True
+                self._stack.append([token, None])
+            else:
+                self._stack.pop()
+        self._head.append(self._buffer[start:])
+        self._pos = len(self._buffer)
+        return False
+
+    def _at_target(self) -> bool:
+        keys = tuple(frame[1] for frame in self._stack)
+        return all(frame[0] == "{" for frame in self._stack) and keys == self.path
+
+    def _scan_array(self, batches: List[List[Dict[str, Any]]]) -> bool:
+        """Decode array elements; False if more data is needed"""
+        buffer = self._buffer
+        while True:
+            pos = _SKIP.match(buffer, self._pos).end()
+            if pos == len(buffer):
+                self._pos = pos
+                return False
+            if buffer[pos] == "]":
+                self._pos = pos + 1
+                self._state = "tail"
+                return True
+            try:
+                item, end = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element continues in the next chunk
+                self._pos = pos
+                return False
+            if end == len(buffer) and not isinstance(item, (dict, list)):
+                # A bare number/literal may be cut off by the chunk boundary
+                self._pos = pos
+                return False
+            self._pos = end
+            self._batch.append(item)
+            self.count += 1
+            if len(self._batch) >= self.batch_size:
+                batches.append(self._batch)
+                self._batch = []
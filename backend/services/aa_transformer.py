@@ -4,79 +4,94 @@ Data Transformer for AA API Responses
 Transforms Account Aggregator API responses into the internal data format
 used by the application. This provides a clean separation between the AA
 schema and our internal schema.
+
+Profile, accounts, net worth, investments and liabilities are read through
+the typed schemas in aa_schemas: pass the typed object from
+AAClient.get_typed(), or a plain response dict, which is validated first.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 from datetime import datetime
 
+from .aa_schemas import Profile, AccountsData, InvestmentsData, LiabilitiesData, NetWorth, as_typed
+
+
+# Raw AA transaction fields read by transform_transactions
+TRANSACTION_FIELDS = (
+    "date", "category", "merchantName", "amount", "type", "mode",
+    "referenceId", "narration", "currentBalance", "accountId"
+)
+
 
 class AATransformer:
     """Transform AA API responses to internal data structures"""
     
     @staticmethod
-    def transform_profile(aa_data: Dict[str, Any]) -> Dict[str, Any]:
+    def transform_profile(aa_data: Union[Dict[str, Any], Profile]) -> Dict[str, Any]:
         """
         Transform AA profile data to internal USER_PROFILE format
         
         Args:
-            aa_data: Response from /api/v1/auth/profile
+            aa_data: Response from /api/v1/auth/profile (dict or Profile)
             
         Returns:
             Dict matching USER_PROFILE structure
         """
+        profile = as_typed(Profile, aa_data)
         return {
-            "name": aa_data.get("name", ""),
-            "age": aa_data.get("age", 0),
-            "email": aa_data.get("email", ""),
-            "pan": aa_data.get("pan", ""),
-            "kyc_status": "Verified" if aa_data.get("kycCompleted") else "Pending",
-            "mobile": aa_data.get("mobile", ""),
-            "aa_handle": aa_data.get("aaHandle", ""),
-            "dob": aa_data.get("dob", ""),
+            "name": profile.name,
+            "age": profile.age,
+            "email": profile.email,
+            "pan": profile.pan,
+            "kyc_status": "Verified" if profile.kyc_completed else "Pending",
+            "mobile": profile.mobile,
+            "aa_handle": profile.aa_handle,
+            "dob": profile.dob,
             
             # Financial goals - may not be in AA data, use defaults or extract
-            "financial_goals": aa_data.get("financialGoals", [
+            "financial_goals": profile.financial_goals if profile.financial_goals is not None else [
                 "Build emergency fund",
                 "Save for retirement",
                 "Invest regularly"
-            ]),
+            ],
             
-            "risk_tolerance": aa_data.get("riskTolerance", "moderate"),
-            "investment_horizon": aa_data.get("investmentHorizon", "long-term"),
+            "risk_tolerance": profile.risk_tolerance,
+            "investment_horizon": profile.investment_horizon,
         }
     
     @staticmethod
-    def transform_accounts(aa_accounts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def transform_accounts(aa_accounts: Union[Dict[str, Any], AccountsData]) -> List[Dict[str, Any]]:
         """
         Transform AA accounts data to internal bank_accounts format
         
         Args:
-            aa_accounts: Response from /api/v1/accounts
+            aa_accounts: Response from /api/v1/accounts (dict or AccountsData)
             
         Returns:
             List of bank account dicts
         """
-        accounts = aa_accounts.get("accounts", [])
+        accounts = as_typed(AccountsData, aa_accounts).accounts
         transformed = []
         
         for account in accounts:
             # Only process DEPOSIT type accounts (savings/current)
-            if account.get("type") != "DEPOSIT":
+            if account.type != "DEPOSIT":
                 continue
                 
             transformed.append({
-                "account_number": account.get("maskedAccNumber", "XXXXXXXX"),
-                "type": account.get("accountType", "Savings"),
-                "bank_name": account.get("fipName", "Unknown Bank"),
-                "ifsc": account.get("ifscCode", ""),
-                "branch": account.get("branch", ""),
-                "opening_date": account.get("openingDate", ""),
-                "status": account.get("status", "Active"),
+                "account_number": account.masked_acc_number,
+                "type": account.account_type,
+                "bank_name": account.fip_name,
+                "ifsc": account.ifsc_code,
+                "branch": account.branch,
+                "opening_date": account.opening_date,
+                "status": account.status,
                 "balance_details": {
-                    "current_balance": account.get("currentBalance", 0.0),
-                    "available_balance": account.get("currentBalance", 0.0),
-                    "amb": account.get("currentBalance", 0.0),  # Approximate
+                    "current_balance": account.current_balance,
+                    "available_balance": account.current_balance,
+                    "amb": account.current_balance,  # Approximate
                     "min_balance_req": 0.0
                 },
                 "nominee_registered": "Yes"  # Assume yes
@@ -85,24 +100,24 @@ class AATransformer:
         return transformed
     
     @staticmethod
-    def transform_liabilities(aa_liabilities: Dict[str, Any]) -> Dict[str, Any]:
+    def transform_liabilities(aa_liabilities: Union[Dict[str, Any], LiabilitiesData]) -> Dict[str, Any]:
         """
         Transform AA liabilities data to internal format
         
         Args:
-            aa_liabilities: Response from /api/v1/aggregated/liabilities
+            aa_liabilities: Response from /api/v1/aggregated/liabilities (dict or LiabilitiesData)
             
         Returns:
             Dict with 'loans' and 'credit_cards' keys
         """
         # API returns a flat list of liabilities
-        liabilities_list = aa_liabilities.get("liabilities", [])
+        liabilities_list = as_typed(LiabilitiesData, aa_liabilities).liabilities
         
         loans_data = []
         cards_data = []
         
         for item in liabilities_list:
-            l_type = item.get("type", "").upper()
+            l_type = (item.type or "").upper()
             if l_type == "CREDIT_CARD":
                 cards_data.append(item)
             else:
@@ -113,21 +128,21 @@ class AATransformer:
         transformed_loans = []
         for loan in loans_data:
             transformed_loans.append({
-                "type": loan.get("type", "Personal Loan").replace("_", " ").title(),
-                "provider": loan.get("provider", "Unknown"),
-                "account_number": loan.get("id", "XXXX"), # Using ID as account number proxy
-                "sanction_amount": loan.get("outstandingAmount", 0), # Using outstanding as proxy if sanction missing
-                "principal_outstanding": loan.get("outstandingAmount", 0),
-                "interest_rate": loan.get("interestRate", 0),
+                "type": (loan.type or "Personal Loan").replace("_", " ").title(),
+                "provider": loan.provider,
+                "account_number": loan.id, # Using ID as account number proxy
+                "sanction_amount": loan.outstanding_amount, # Using outstanding as proxy if sanction missing
+                "principal_outstanding": loan.outstanding_amount,
+                "interest_rate": loan.interest_rate if loan.interest_rate is not None else 0,
                 "interest_type": "Floating", # Default
-                "tenure_months": loan.get("tenure", 0),
-                "emi_amount": loan.get("emiAmount", 0),
+                "tenure_months": loan.tenure,
+                "emi_amount": loan.emi_amount,
                 "next_emi_date": "", # Missing
                 "repayment_history": "Regular"
             })
         
         # Transform credit cards
-        total_cc_balance = sum(card.get("outstandingAmount", 0) for card in cards_data)
+        total_cc_balance = sum(card.outstanding_amount or 0 for card in cards_data)
         # Total limit not in sample, assume utilization based on some heuristic or just show balance
         # For now, let's assume limit is 2x balance if not provided, or just 0
         total_cc_limit = 0 
@@ -136,11 +151,11 @@ class AATransformer:
         transformed_cards = []
         for card in cards_data:
             transformed_cards.append({
-                "name": f"{card.get('provider', 'Unknown')} Card",
-                "bank": card.get("provider", "Unknown"),
+                "name": f"{card.provider} Card",
+                "bank": card.provider,
                 "type": "Credit Card",
                 "network": "Visa", # Default
-                "card_number_masked": f"XXXX-{card.get('id', 'XXXX')[-4:]}",
+                "card_number_masked": f"XXXX-{(card.id or 'XXXX')[-4:]}",
                 "limits": {
                     "total_limit": 0, # Missing
                     "available_limit": 0, # Missing
@@ -149,18 +164,18 @@ class AATransformer:
                 "billing": {
                     "cycle_date": 15,
                     "payment_due_date": 5,
-                    "last_statement_balance": card.get("outstandingAmount", 0),
-                    "min_amount_due": card.get("outstandingAmount", 0) * 0.05 # Est 5%
+                    "last_statement_balance": card.outstanding_amount,
+                    "min_amount_due": (card.outstanding_amount or 0) * 0.05 # Est 5%
                 },
                 "fees": {
                     "joining_fee": 0,
                     "annual_fee": 0,
-                    "apr": card.get("interestRate", 36.0)
+                    "apr": card.interest_rate if card.interest_rate is not None else 36.0
                 },
                 "rewards": {
                     "points_balance": 0
                 },
-                "current_balance": card.get("outstandingAmount", 0)
+                "current_balance": card.outstanding_amount
             })
         
         return {
@@ -181,45 +196,56 @@ class AATransformer:
             aa_transactions: Response from /api/v1/aggregated/transactions
             
         Returns:
-            pandas DataFrame with transaction history
+            pandas DataFrame with transaction history ('category', 'mode',
+            'type' and 'account' as category dtype)
         """
         transactions = aa_transactions.get("transactions", [])
         
         if not transactions:
             return pd.DataFrame()
         
-        # Transform to list of dicts
-        transformed = []
-        for txn in transactions:
-            transformed.append({
-                "date": txn.get("date", ""),
-                "category": txn.get("category", "Other"),
-                "merchant": txn.get("merchantName", "Unknown"),
-                "amount": txn.get("amount", 0.0) * (-1 if txn.get("type") == "DEBIT" else 1),
-                "type": "debit" if txn.get("type") == "DEBIT" else "credit",
-                "mode": txn.get("mode", "OTHER"),
-                "reference_id": txn.get("referenceId", ""),
-                "narrative": txn.get("narration", ""),
-                "balance_after_txn": txn.get("currentBalance"),
-                "account": txn.get("accountId", "")  # API returns accountId, not account object
-            })
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(transformed)
+        # Let pandas lay out the raw columns in one pass, then fix them up column-wise
+        raw = pd.DataFrame(transactions, columns=list(TRANSACTION_FIELDS), dtype=object)
+        is_debit = (raw["type"] == "DEBIT").to_numpy()
+        amounts = pd.to_numeric(raw["amount"]).fillna(0.0).to_numpy(dtype="float64")
         
-        # Convert date column to datetime
-        if "date" in df.columns:
-            df["date"] = pd.to_datetime(df["date"])
+        df = pd.DataFrame({
+            "date": AATransformer._parse_dates(raw["date"].fillna("").tolist()),
+            "category": raw["category"].fillna("Other").astype("category"),
+            "merchant": raw["merchantName"].fillna("Unknown"),
+            "amount": np.where(is_debit, -amounts, amounts),
+            "type": pd.Categorical.from_codes(np.where(is_debit, 0, 1), categories=["debit", "credit"]),
+            "mode": raw["mode"].fillna("OTHER").astype("category"),
+            "reference_id": raw["referenceId"].fillna(""),
+            "narrative": raw["narration"].fillna(""),
+            "balance_after_txn": pd.to_numeric(raw["currentBalance"]).astype("float64"),
+            "account": raw["accountId"].fillna("").astype("category")  # API returns accountId, not account object
+        })
         
         return df
     
     @staticmethod
-    def transform_investments(aa_investments: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_dates(dates: List[str]) -> pd.DatetimeIndex:
+        """
+        Parse AA ISO 8601 timestamps ("2025-01-15T10:30:00.000Z").
+        When all are UTC ("Z"), numpy's ISO parser is much faster than pandas'
+        offset-aware one; anything else goes through pandas.
+        """
+        if all(d.endswith("Z") for d in dates):
+            try:
+                parsed = np.array([d[:-1] for d in dates], dtype="datetime64[us]")
+                return pd.to_datetime(parsed, utc=True)
+            except ValueError:
+                pass
+        return pd.to_datetime(dates, format="ISO8601")
+    
+    @staticmethod
+    def transform_investments(aa_investments: Union[Dict[str, Any], InvestmentsData]) -> Dict[str, Any]:
         """
         Transform AA investments to internal format
         
         Args:
-            aa_investments: Response from /api/v1/aggregated/investments
+            aa_investments: Response from /api/v1/aggregated/investments (dict or InvestmentsData)
             
         Returns:
             Dict with stocks, mutual_funds, fixed_deposits, etc.
@@ -234,56 +260,56 @@ class AATransformer:
         }
         
         # The API returns a list of investments under the 'investments' key
-        investments_list = aa_investments.get("investments", [])
+        investments_list = as_typed(InvestmentsData, aa_investments).investments
         
         for inv in investments_list:
-            inv_type = inv.get("type", "").upper()
+            inv_type = (inv.type or "").upper()
             
             if inv_type == "MUTUAL_FUNDS":
                 result["mutual_funds"].append({
-                    "ticker": inv.get("id", ""), # Using ID as ticker if ISIN not present
-                    "fund_name": inv.get("schemeName", ""),
-                    "units": inv.get("units", 0), # Note: API sample didn't show units, might need calculation or it's missing
+                    "ticker": inv.id, # Using ID as ticker if ISIN not present
+                    "fund_name": inv.scheme_name,
+                    "units": inv.units, # Note: API sample didn't show units, might need calculation or it's missing
                     "purchase_nav": 0, # Missing in sample
                     "current_nav": 0, # Missing in sample
-                    "current_value": inv.get("currentValue", 0),
-                    "cost_basis": inv.get("investedAmount", 0),
-                    "fund_house": inv.get("provider", ""),
+                    "current_value": inv.current_value,
+                    "cost_basis": inv.invested_amount,
+                    "fund_house": inv.provider,
                     "category": "Mutual Fund",
-                    "returns_pct": inv.get("returnsPercentage", 0)
+                    "returns_pct": inv.returns_percentage
                 })
                 
             elif inv_type == "EQUITIES":
                 result["stocks"].append({
-                    "ticker": inv.get("schemeName", ""), # Using scheme name as ticker/company
-                    "company": inv.get("schemeName", ""),
-                    "quantity": inv.get("quantity", 0), # Missing in sample
+                    "ticker": inv.scheme_name, # Using scheme name as ticker/company
+                    "company": inv.scheme_name,
+                    "quantity": inv.quantity, # Missing in sample
                     "purchase_price": 0, # Missing in sample
                     "current_price": 0, # Missing in sample
-                    "current_value": inv.get("currentValue", 0),
-                    "cost_basis": inv.get("investedAmount", 0),
+                    "current_value": inv.current_value,
+                    "cost_basis": inv.invested_amount,
                     "exchange": "NSE",
-                    "returns_pct": inv.get("returnsPercentage", 0)
+                    "returns_pct": inv.returns_percentage
                 })
                 
             elif inv_type == "PPF":
                 result["ppf"].append({
-                    "account_number": inv.get("id", ""),
-                    "bank_name": inv.get("provider", ""),
-                    "current_value": inv.get("currentValue", 0),
-                    "invested_amount": inv.get("investedAmount", 0),
-                    "returns_pct": inv.get("returnsPercentage", 0),
-                    "status": inv.get("status", "ACTIVE")
+                    "account_number": inv.id,
+                    "bank_name": inv.provider,
+                    "current_value": inv.current_value,
+                    "invested_amount": inv.invested_amount,
+                    "returns_pct": inv.returns_percentage,
+                    "status": inv.status
                 })
                 
             elif inv_type == "FIXED_DEPOSITS":
                 result["fixed_deposits"].append({
-                    "fd_number": inv.get("id", ""),
-                    "bank_name": inv.get("provider", ""),
-                    "principal_amount": inv.get("investedAmount", 0),
-                    "current_value": inv.get("currentValue", 0),
+                    "fd_number": inv.id,
+                    "bank_name": inv.provider,
+                    "principal_amount": inv.invested_amount,
+                    "current_value": inv.current_value,
                     "maturity_amount": 0, # Missing
-                    "interest_rate": inv.get("returnsPercentage", 0), # Using returns as proxy
+                    "interest_rate": inv.returns_percentage, # Using returns as proxy
                     "start_date": "",
                     "maturity_date": "",
                     "payout_type": "Cumulative"
@@ -292,19 +318,21 @@ class AATransformer:
         return result
     
     @staticmethod
-    def transform_net_worth(aa_net_worth: Dict[str, Any]) -> Dict[str, Any]:
+    def transform_net_worth(aa_net_worth: Union[Dict[str, Any], NetWorth]) -> Dict[str, Any]:
         """
         Transform AA net worth data
         
         Args:
-            aa_net_worth: Response from /api/v1/aggregated/net-worth
+            aa_net_worth: Response from /api/v1/aggregated/net-worth (dict or NetWorth)
             
         Returns:
             Dict with net worth breakdown
         """
+        net_worth = as_typed(NetWorth, aa_net_worth)
+        breakdown = net_worth.breakdown or {}
         return {
-            "net_worth": aa_net_worth.get("netWorth", 0),
-            "total_assets": aa_net_worth.get("breakdown", {}).get("assets", {}).get("total", 0),
-            "total_liabilities": aa_net_worth.get("breakdown", {}).get("liabilities", {}).get("total", 0),
-            "breakdown": aa_net_worth.get("breakdown", {})
+            "net_worth": net_worth.net_worth,
+            "total_assets": breakdown.get("assets", {}).get("total", 0),
+            "total_liabilities": breakdown.get("liabilities", {}).get("total", 0),
+            "breakdown": breakdown
         }
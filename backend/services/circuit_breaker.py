@@ -0,0 +1,113 @@
+"""
+Circuit breaker for calls to external services.
+
+After `failure_threshold` consecutive failures the breaker opens and calls fail
+fast for `recovery_timeout` seconds. It then lets a single probe call through
+(half-open): success closes the breaker, failure opens it again.
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit for {name} is open; retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed / open / half-open breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Args:
+            name: Label used in errors and health output
+            failure_threshold: Consecutive failures that open the breaker
+            recovery_timeout: Seconds to stay open before probing
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+        self.stats = {"failures": 0, "successes": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_started = None
+        return self._state
+
+    def before_call(self):
+        """
+        Reserve permission to call the backend.
+
+        Raises:
+            CircuitOpenError: While open, or while a half-open probe is in flight
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN:
+                # One probe at a time; a probe that never reported back expires
+                if self._probe_started is None or now - self._probe_started >= self.recovery_timeout:
+                    self._probe_started = now
+                    return
+                retry_in = self.recovery_timeout - (now - self._probe_started)
+            else:
+                retry_in = self.recovery_timeout - (now - self._opened_at)
+            self.stats["rejected"] += 1
+        raise CircuitOpenError(self.name, max(0.0, retry_in))
+
+    def record_success(self):
+        with self._lock:
+            self.stats["successes"] += 1
+            self._failures = 0
+            self._state = self.CLOSED
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.stats["failures"] += 1
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.stats["opened"] += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            info = {
+                "state": state,
+                "consecutive_failures": self._failures,
+                **self.stats
+            }
+            if state == self.OPEN:
+                info["retry_in_seconds"] = round(max(0.0, self.recovery_timeout - (now - self._opened_at)), 1)
+            return info
@@ -0,0 +1,210 @@
+"""
+Vectorized portfolio valuation and the /api/portfolio payload cache.
+
+Holdings are valued column-wise over a DataFrame (value, gain and gain_pct
+in one pass) instead of per holding in Python. The serialized response is
+cached per (user, data version), so repeat requests for unchanged data skip
+the transform, the valuation and the JSON encoding altogether.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Union
+
+import numpy as np
+import pandas as pd
+
+# Assumed appreciation when a holding has no current price/NAV
+STOCK_FALLBACK_GROWTH = 1.12
+FUND_FALLBACK_GROWTH = 1.08
+
+# Frontend fields per holding on the AA path
+AA_STOCK_FIELDS = ["ticker", "company", "shares", "avgCost", "current", "value", "gain", "gain_pct"]
+AA_FUND_FIELDS = ["name", "category", "units", "purchaseNAV", "currentNAV", "value", "gain", "gain_pct"]
+
+Holdings = Union[pd.DataFrame, List[Dict[str, Any]]]
+
+
+def _column(frame: pd.DataFrame, name: str, default: np.ndarray) -> np.ndarray:
+    """Float column as an array, missing values (or a missing column) taken from default"""
+    if name not in frame:
+        return default
+    values = pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype="float64")
+    return np.where(np.isnan(values), default, values)
+
+
+def value_holdings(
+    holdings: Holdings,
+    units: str,
+    purchase_price: str,
+    current_price: str,
+    fallback_growth: float
+) -> pd.DataFrame:
+    """
+    Value every holding in one vectorized pass
+
+    The current price falls back to purchase price * fallback_growth when
+    missing; a reported current_value wins over units * price, and cost_basis
+    is used when units * purchase price gives no cost (AA payloads report
+    totals, not per-unit prices).
+
+    Args:
+        holdings: DataFrame or list of holding dicts
+        units: Column with the number of units/shares
+        purchase_price: Column with the average purchase price/NAV
+        current_price: Column with the current price/NAV
+        fallback_growth: Multiplier applied to the purchase price when there's no current price
+
+    Returns:
+        Copy of the holdings with 'current', 'value', 'gain' and 'gain_pct' added
+    """
+    frame = pd.DataFrame(holdings).copy()
+    if frame.empty:
+        return frame
+
+    zeros = np.zeros(len(frame))
+    quantity = _column(frame, units, zeros)
+    avg_cost = _column(frame, purchase_price, zeros)
+    current = _column(frame, current_price, avg_cost * fallback_growth)
+
+    value = _column(frame, "current_value", quantity * current)
+    cost = quantity * avg_cost
+    cost = np.where(cost > 0, cost, _column(frame, "cost_basis", cost))
+    gain = value - cost
+
+    frame["current"] = current
+    frame["value"] = value
+    frame["gain"] = gain
+    frame["gain_pct"] = np.divide(gain * 100, cost, out=np.zeros_like(gain), where=cost > 0)
+    return frame
+
+
+def value_stocks(stocks: Holdings) -> pd.DataFrame:
+    """Stock holdings valued, with the frontend's 'shares' and 'avgCost' aliases"""
+    frame = value_holdings(stocks, "quantity", "purchase_price", "current_price", STOCK_FALLBACK_GROWTH)
+    if not frame.empty:
+        frame["shares"] = frame["quantity"]
+        frame["avgCost"] = frame["purchase_price"]
+    return frame
+
+
+def value_funds(funds: Holdings) -> pd.DataFrame:
+    """Mutual fund holdings valued, with the frontend's NAV and 'name' aliases"""
+    frame = value_holdings(funds, "units", "purchase_nav", "current_nav", FUND_FALLBACK_GROWTH)
+    if not frame.empty:
+        frame["currentNAV"] = frame["current"]
+        frame["purchaseNAV"] = frame["purchase_nav"]
+        frame["name"] = frame["fund_name"]
+        frame = frame.drop(columns="current")
+    return frame
+
+
+def _holdings_json(frame: pd.DataFrame, fields: Optional[List[str]] = None) -> str:
+    """Holdings as a JSON array, encoded column-wise by pandas (floats to 10 decimals)"""
+    if frame.empty:
+        return "[]"
+    return (frame[fields] if fields else frame).to_json(orient="records")
+
+
+def serialize_portfolio(
+    stocks: pd.DataFrame,
+    funds: pd.DataFrame,
+    stock_fields: Optional[List[str]] = None,
+    fund_fields: Optional[List[str]] = None,
+    **sections: Any
+) -> bytes:
+    """
+    Serialized /api/portfolio response body
+
+    Args:
+        stocks: Valued stocks (value_stocks)
+        funds: Valued mutual funds (value_funds)
+        stock_fields: Stock fields to include (all if None)
+        fund_fields: Fund fields to include (all if None)
+        **sections: Remaining top-level keys (fixed deposits, cash, ...), JSON-encoded as is
+
+    Returns:
+        UTF-8 JSON body
+    """
+    parts = [
+        '"status":"success"',
+        f'"stocks":{_holdings_json(stocks, stock_fields)}',
+        f'"funds":{_holdings_json(funds, fund_fields)}',
+    ]
+    parts += [f"{json.dumps(key)}:{json.dumps(value, separators=(',', ':'))}" for key, value in sections.items()]
+    return ("{" + ",".join(parts) + "}").encode()
+
+
+# -------------------------------
+# PAYLOAD CACHE
+# -------------------------------
+
+class PortfolioPayloadCache:
+    """
+    LRU cache of serialized portfolio responses keyed by (user, data version).
+    A new data version simply misses; stale versions age out of the LRU.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv("PORTFOLIO_CACHE_MAX_ENTRIES", "256"))
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, user_id: str, data_version: str) -> Optional[bytes]:
+        key = (user_id, data_version)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return payload
+
+    def put(self, user_id: str, data_version: str, payload: bytes) -> bytes:
+        """Store a serialized response; returns it for convenience"""
+        with self._lock:
+            self._entries[(user_id, data_version)] = payload
+            self._entries.move_to_end((user_id, data_version))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self, user_id: Optional[str] = None) -> int:
+        """Drop a user's payloads (all users if none given)"""
+        with self._lock:
+            keys = [key for key in self._entries if user_id is None or key[0] == user_id]
+            for key in keys:
+                del self._entries[key]
+            self.stats["invalidations"] += len(keys)
+            return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0
+            }
+
+
+# Singleton instance
+_portfolio_cache_instance: Optional[PortfolioPayloadCache] = None
+
+
+def get_portfolio_cache() -> PortfolioPayloadCache:
+    """
+    Get or create the singleton portfolio payload cache
+
+    Returns:
+        PortfolioPayloadCache instance
+    """
+    global _portfolio_cache_instance
+
+    if _portfolio_cache_instance is None:
+        _portfolio_cache_instance = PortfolioPayloadCache()
+    return _portfolio_cache_instance
@@ -0,0 +1,101 @@
+"""
+Request coalescing ("singleflight").
+
+Concurrent callers asking for the same key share one in-flight call: the
+first caller runs it, the others wait and receive the same result or the
+same exception.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicates identical concurrent calls, from threads (do) or from
+    coroutines on one event loop (do_async).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "executed": 0, "deduplicated": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn() unless an identical call is in flight; then share its outcome"""
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["executed"] += 1
+            else:
+                self.stats["deduplicated"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant: coroutines on the same loop share one awaited call"""
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self.stats["calls"] += 1
+            future = self._async_calls.get(loop_key)
+            leader = future is None
+            if leader:
+                future = self._async_calls[loop_key] = asyncio.get_running_loop().create_future()
+                self.stats["executed"] += 1
+            else:
+                self.stats["deduplicated"] += 1
+
+        if not leader:
+            # shield: a cancelled follower must not cancel the shared call
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure isn't logged by asyncio
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._calls) + len(self._async_calls)
+        return stats
@@ -0,0 +1,222 @@
+"""
+Bulk export of a user's transaction history.
+
+History is read in fixed-size DataFrame chunks, from the AA API (streamed
+responses, a window of rows at a time, nothing cached) or from an in-memory
+frame such as the mock history, and encoded chunk by chunk as NDJSON, CSV
+or Parquet. Text formats can be gzipped on the fly. Memory use follows the
+chunk size, not the length of the history.
+"""
+
+import os
+import zlib
+from datetime import date, timedelta
+from typing import Optional, Iterator, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .transaction_store import TRANSACTION_COLUMNS
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+# Rows per streamed AA request; each request is parsed in EXPORT_CHUNK_ROWS batches
+EXPORT_AA_WINDOW_ROWS = int(os.getenv("EXPORT_AA_WINDOW_ROWS", "50000"))
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+EXPORT_COMPRESSIONS = ("gzip", "none")
+
+CATEGORICAL_COLUMNS = ("category", "type", "mode", "account")
+
+
+def check_export(fmt: str, compression: str):
+    """
+    Raises:
+        ValueError: For an unknown format or compression, or Parquet without pyarrow
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}' (expected one of: {', '.join(EXPORT_FORMATS)})")
+    if compression not in EXPORT_COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}' (expected one of: {', '.join(EXPORT_COMPRESSIONS)})")
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export needs the 'pyarrow' package; use format=ndjson or csv, or install pyarrow")
+
+
+def export_filename(fmt: str, compression: str) -> str:
+    """Download name, e.g. transactions.ndjson.gz (Parquet compresses internally)"""
+    suffix = ".gz" if compression == "gzip" and fmt != "parquet" else ""
+    return f"transactions.{fmt}{suffix}"
+
+
+# -------------------------------
+# SOURCES
+# -------------------------------
+
+def aa_chunks(
+    client,
+    user_id: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    category: Optional[str] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    window_rows: int = EXPORT_AA_WINDOW_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Every AA transaction in the range, as DataFrame chunks of up to chunk_rows
+
+    Args:
+        client: AAClient
+        user_id: User's _id
+        start: Inclusive start date (all history if None)
+        end: Inclusive end date (defaults to today, so the window stays put while paging)
+        category: Only this category
+        chunk_rows: Rows per yielded chunk
+        window_rows: Rows per streamed request
+    """
+    to_date = (end or date.today()).isoformat()
+    from_date = start.isoformat() if start else None
+    offset = 0
+    while True:
+        received = 0
+        for chunk in client.stream_transactions(
+            user_id, from_date, to_date, category, limit=window_rows, offset=offset, batch_size=chunk_rows
+        ):
+            received += len(chunk)
+            yield chunk
+        if received < window_rows:
+            return
+        offset += received
+
+
+def frame_chunks(
+    df: pd.DataFrame,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    category: Optional[str] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """Rows of an in-memory frame in the range, in chunks of up to chunk_rows"""
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= (df["date"] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (df["date"] < pd.Timestamp(end) + timedelta(days=1)).to_numpy()
+    if category:
+        mask &= (df["category"] == category).to_numpy()
+    rows = np.flatnonzero(mask)
+    for offset in range(0, len(rows), chunk_rows):
+        yield df.iloc[rows[offset:offset + chunk_rows]]
+
+
+# -------------------------------
+# ENCODERS
+# -------------------------------
+
+def _normalize(chunk: pd.DataFrame) -> pd.DataFrame:
+    """TRANSACTION_COLUMNS only, timestamps without a timezone (UTC for AA data)"""
+    chunk = chunk.reindex(columns=TRANSACTION_COLUMNS)
+    dates = pd.to_datetime(chunk["date"])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+    return chunk.assign(date=dates)
+
+
+def _ndjson(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    for chunk in chunks:
+        chunk = _normalize(chunk)
+        chunk = chunk.assign(date=np.datetime_as_string(chunk["date"].to_numpy(dtype="datetime64[s]"), unit="s"))
+        text = chunk.to_json(orient="records", lines=True)
+        yield (text if text.endswith("\n") else text + "\n").encode()
+
+
+def _csv(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    header = True
+    for chunk in chunks:
+        yield _normalize(chunk).to_csv(index=False, header=header, date_format="%Y-%m-%dT%H:%M:%S").encode()
+        header = False
+    if header:
+        yield (",".join(TRANSACTION_COLUMNS) + "\n").encode()
+
+
+class _Sink:
+    """Write-only file object whose contents are drained after every row group"""
+
+    def __init__(self):
+        self.parts = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def _parquet(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """One row group per chunk, zstd-compressed by the Parquet writer itself"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("date", pa.timestamp("us")),
+        ("category", pa.string()),
+        ("merchant", pa.string()),
+        ("amount", pa.float64()),
+        ("type", pa.string()),
+        ("mode", pa.string()),
+        ("reference_id", pa.string()),
+        ("narrative", pa.string()),
+        ("balance_after_txn", pa.float64()),
+        ("account", pa.string()),
+    ])
+    sink = _Sink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            # Per-chunk categoricals would give each row group a different dictionary type
+            chunk = _normalize(chunk).astype({column: object for column in CATEGORICAL_COLUMNS})
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+
+def _gzip(parts: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for part in parts:
+        data = compressor.compress(part)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def encode_chunks(chunks: Iterable[pd.DataFrame], fmt: str, compression: str = "gzip") -> Iterator[bytes]:
+    """
+    Encode DataFrame chunks into the export body, one piece per chunk
+
+    Args:
+        chunks: Transaction chunks (aa_chunks / frame_chunks)
+        fmt: 'ndjson', 'csv' or 'parquet' (see check_export)
+        compression: 'gzip' or 'none'; ignored for Parquet, which is compressed internally
+
+    Yields:
+        Body bytes
+    """
+    if fmt == "parquet":
+        return _parquet(chunks)
+    parts = _ndjson(chunks) if fmt == "ndjson" else _csv(chunks)
+    return _gzip(parts) if compression == "gzip" else parts
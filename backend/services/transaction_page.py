@@ -0,0 +1,137 @@
+"""
+Paging and serialization for /api/transactions.
+
+Pages are ordered newest first and addressed by an opaque keyset cursor
+(the last row's date and key), so fetching page N doesn't re-read pages
+1..N-1 and rows arriving in the meantime don't shift later pages. Bodies are
+encoded column-wise by pandas straight from the typed columns, instead of
+boxing every cell into a Python object first.
+"""
+
+import base64
+import json
+import os
+from datetime import date, timedelta
+from typing import Optional, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .transaction_store import TRANSACTION_COLUMNS
+
+DEFAULT_PAGE_SIZE = int(os.getenv("TRANSACTIONS_PAGE_SIZE", "500"))
+MAX_PAGE_SIZE = int(os.getenv("TRANSACTIONS_MAX_PAGE_SIZE", "5000"))
+
+# (date as "YYYY-MM-DDTHH:MM:SS", row key) of the last row on the previous page
+Cursor = Tuple[str, str]
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Validate a comma-separated field projection
+
+    Returns:
+        Requested fields in TRANSACTION_COLUMNS order (all if fields is empty)
+
+    Raises:
+        ValueError: On unknown fields
+    """
+    if not fields:
+        return list(TRANSACTION_COLUMNS)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(TRANSACTION_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [name for name in TRANSACTION_COLUMNS if name in requested]
+
+
+def encode_cursor(cursor: Optional[Cursor]) -> Optional[str]:
+    if cursor is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(list(cursor), separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """
+    Raises:
+        ValueError: If the cursor wasn't issued by encode_cursor
+    """
+    if not cursor:
+        return None
+    try:
+        when, key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(when), str(key)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def page_frame(
+    df: pd.DataFrame,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    category: Optional[str] = None,
+    after: Optional[Cursor] = None,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE
+) -> Tuple[pd.DataFrame, Optional[Cursor]]:
+    """
+    One page of an in-memory transaction frame (e.g. the mock history),
+    ordered by date then reference_id, newest first
+
+    Args:
+        df: Frame with TRANSACTION_COLUMNS
+        start: Inclusive start date
+        end: Inclusive end date
+        category: Only this category
+        after: Cursor of the previous page
+        limit: Page size (None: every remaining row)
+
+    Returns:
+        (page, cursor of the next page or None on the last page)
+    """
+    if df.empty:
+        return df, None
+
+    dates = df["date"]
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= (dates >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (dates < pd.Timestamp(end) + timedelta(days=1)).to_numpy()
+    if category:
+        mask &= (df["category"] == category).to_numpy()
+    if after is not None:
+        when = pd.Timestamp(after[0])
+        mask &= ((dates < when) | ((dates == when) & (df["reference_id"] < after[1]))).to_numpy()
+
+    selected = df[mask]
+    order = np.lexsort((selected["reference_id"].to_numpy(), selected["date"].to_numpy()))[::-1]
+    page = selected.iloc[order[:limit]]
+    if limit is None or len(order) <= limit:
+        return page, None
+    last = page.iloc[-1]
+    return page, (last["date"].strftime("%Y-%m-%dT%H:%M:%S"), last["reference_id"])
+
+
+def serialize_page(page: pd.DataFrame, fields: List[str], next_cursor: Optional[Cursor]) -> bytes:
+    """
+    Response body for one page: dates as YYYY-MM-DD, missing values as null
+
+    Args:
+        page: Page from page_frame or TransactionStore.page
+        fields: Projected fields (parse_fields)
+        next_cursor: Cursor of the next page
+
+    Returns:
+        UTF-8 JSON body
+    """
+    if page.empty:
+        rows = "[]"
+    else:
+        out = page[fields]
+        if "date" in fields:
+            out = out.assign(date=np.datetime_as_string(page["date"].to_numpy(dtype="datetime64[s]"), unit="D"))
+        rows = out.to_json(orient="records")
+    return (
+        f'{{"status":"success","count":{len(page)},"transactions":{rows},'
+        f'"next_cursor":{json.dumps(encode_cursor(next_cursor))}}}'
+    ).encode()
@@ -0,0 +1,382 @@
+"""
+Local Transaction Store
+
+Keeps a per-user copy of AA transactions in SQLite so date-range queries are
+answered locally. Syncs are incremental: each account has a high-water mark
+(latest transaction date seen) and only the window after the oldest mark is
+fetched again, deduplicated on referenceId (falling back to the AA id). Syncs
+read live API data (never the response cache), and marks only move once a
+sync has read its whole window.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+
+import pandas as pd
+import logging
+
+from .aa_transformer import AATransformer
+
+logger = logging.getLogger(__name__)
+
+# Columns returned by query(); same as AATransformer.transform_transactions
+TRANSACTION_COLUMNS = [
+    "date", "category", "merchant", "amount", "type", "mode",
+    "reference_id", "narrative", "balance_after_txn", "account"
+]
+
+
+class TransactionStore:
+    """
+    SQLite-backed transaction store with delta sync from the AA API
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        initial_days: Optional[int] = None,
+        sync_interval: Optional[float] = None,
+        overlap_days: int = 1
+    ):
+        """
+        Initialize Transaction Store
+
+        Args:
+            db_path: SQLite file (defaults to env var TRANSACTION_STORE_DB)
+            initial_days: History fetched on a user's first sync
+            sync_interval: Minimum seconds between syncs of the same user
+            overlap_days: Days re-fetched before the high-water mark, for
+                          transactions posted late with an earlier date
+        """
+        self.db_path = db_path or os.getenv("TRANSACTION_STORE_DB", "data/transactions.db")
+        self.initial_days = initial_days or int(os.getenv("TRANSACTION_STORE_INITIAL_DAYS", "90"))
+        self.sync_interval = sync_interval if sync_interval is not None else float(os.getenv("TRANSACTION_STORE_SYNC_SECONDS", "300"))
+        self.overlap_days = overlap_days
+
+        self._local = threading.local()
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"syncs": 0, "fetched": 0, "inserted": 0, "queries": 0}
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS transactions (
+                    user_id TEXT NOT NULL,
+                    txn_key TEXT NOT NULL,
+                    account TEXT,
+                    date TEXT NOT NULL,
+                    category TEXT,
+                    merchant TEXT,
+                    amount REAL,
+                    type TEXT,
+                    mode TEXT,
+                    reference_id TEXT,
+                    narrative TEXT,
+                    balance_after_txn REAL,
+                    PRIMARY KEY (user_id, txn_key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions (user_id, date);
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    user_id TEXT NOT NULL,
+                    account TEXT NOT NULL,
+                    high_water TEXT NOT NULL,
+                    PRIMARY KEY (user_id, account)
+                );
+                CREATE TABLE IF NOT EXISTS sync_runs (
+                    user_id TEXT PRIMARY KEY,
+                    synced_at REAL NOT NULL,
+                    window_start TEXT NOT NULL
+                );
+            """)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._user_locks.setdefault(user_id, threading.Lock())
+
+    # -------------------------------
+    # SYNC
+    # -------------------------------
+
+    def sync(self, user_id: str, force: bool = False, client=None) -> Dict[str, Any]:
+        """
+        Fetch transactions newer than the user's high-water marks
+
+        Args:
+            user_id: User's _id
+            force: Sync even if the last sync is recent
+            client: AAClient to use (defaults to the singleton)
+
+        Returns:
+            Dict with fetched / inserted counts and the fetched window
+        """
+        with self._user_lock(user_id):
+            conn = self._conn()
+            last = conn.execute(
+                "SELECT synced_at, window_start FROM sync_runs WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if last and not force and time.time() - last[0] < self.sync_interval:
+                return {"skipped": True, "fetched": 0, "inserted": 0}
+
+            today = datetime.now().date()
+            marks = conn.execute(
+                "SELECT MIN(high_water) FROM sync_state WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+            if marks:
+                start = datetime.fromisoformat(marks).date() - timedelta(days=self.overlap_days)
+            else:
+                start = today - timedelta(days=self.initial_days)
+            if last:
+                # An account with no recent activity must not drag the window back
+                start = max(start, datetime.fromtimestamp(last[0]).date() - timedelta(days=self.overlap_days))
+
+            if client is None:
+                from .aa_client import get_aa_client
+                client = get_aa_client()
+
+            # Pages come newest first, so marks are only stored once the whole
+            # window has been read; a sync that fails partway is retried in full
+            fetched = inserted = 0
+            marks: Dict[str, str] = {}
+            for page in client.iter_transactions(
+                user_id, from_date=start.isoformat(), to_date=today.isoformat(), fresh=True
+            ):
+                raw = page.get("transactions", [])
+                if not raw:
+                    continue
+                fetched += len(raw)
+                page_inserted, page_marks = self._upsert(conn, user_id, raw)
+                inserted += page_inserted
+                for account, mark in page_marks.items():
+                    marks[account] = max(mark, marks.get(account, mark))
+
+            window_start = min(start, datetime.fromisoformat(last[1]).date()) if last else start
+            with conn:
+                conn.executemany(
+                    """INSERT INTO sync_state (user_id, account, high_water) VALUES (?, ?, ?)
+                       ON CONFLICT(user_id, account) DO UPDATE SET high_water = MAX(high_water, excluded.high_water)""",
+                    [(user_id, account, mark) for account, mark in marks.items()]
+                )
+                conn.execute(
+                    """INSERT INTO sync_runs (user_id, synced_at, window_start) VALUES (?, ?, ?)
+                       ON CONFLICT(user_id) DO UPDATE SET synced_at = excluded.synced_at,
+                                                          window_start = excluded.window_start""",
+                    (user_id, time.time(), window_start.isoformat())
+                )
+
+            self.stats["syncs"] += 1
+            self.stats["fetched"] += fetched
+            self.stats["inserted"] += inserted
+            logger.info(f"Synced {user_id}: {fetched} fetched, {inserted} new since {start}")
+            return {"skipped": False, "from": start.isoformat(), "fetched": fetched, "inserted": inserted}
+
+    def _upsert(self, conn: sqlite3.Connection, user_id: str, raw: List[Dict[str, Any]]) -> Tuple[int, Dict[str, str]]:
+        """
+        Insert a page of raw AA transactions (rows already stored are kept)
+
+        Returns:
+            (rows inserted, latest transaction date per account in the page)
+        """
+        df = AATransformer.transform_transactions({"transactions": raw})
+        if df["date"].dt.tz is not None:
+            df["date"] = df["date"].dt.tz_localize(None)
+        df["date"] = df["date"].dt.strftime("%Y-%m-%dT%H:%M:%S")
+        df["txn_key"] = [t.get("referenceId") or t.get("id") or "" for t in raw]
+        df = df[df["txn_key"] != ""]
+
+        rows = list(zip(
+            [user_id] * len(df), df["txn_key"], df["account"], df["date"], df["category"], df["merchant"],
+            df["amount"], df["type"], df["mode"], df["reference_id"], df["narrative"],
+            df["balance_after_txn"].astype(object).where(df["balance_after_txn"].notna(), None)
+        ))
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                """INSERT OR IGNORE INTO transactions
+                   (user_id, txn_key, account, date, category, merchant, amount, type, mode,
+                    reference_id, narrative, balance_after_txn)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            inserted = conn.total_changes - before
+        marks = df.groupby("account", observed=True)["date"].max()
+        return inserted, {str(account): mark for account, mark in marks.items()}
+
+    # -------------------------------
+    # QUERIES
+    # -------------------------------
+
+    def query(
+        self,
+        user_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Stored transactions in a date range (newest first)
+
+        Args:
+            user_id: User's _id
+            start: Inclusive start (datetime or date)
+            end: Inclusive end; a bare date covers the whole day
+            category: Only this category
+
+        Returns:
+            DataFrame with TRANSACTION_COLUMNS ('date' as datetime64)
+        """
+        where, params = self._where(user_id, start, end, category)
+        sql = f"SELECT {', '.join(TRANSACTION_COLUMNS)} FROM transactions WHERE {where} ORDER BY date DESC"
+
+        df = pd.read_sql_query(sql, self._conn(), params=params)
+        df["date"] = pd.to_datetime(df["date"])
+        self.stats["queries"] += 1
+        return df
+
+    def page(
+        self,
+        user_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        category: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
+        limit: Optional[int] = 500
+    ) -> Tuple[pd.DataFrame, Optional[Tuple[str, str]]]:
+        """
+        One page of stored transactions, newest first (keyset pagination on
+        date, then txn_key)
+
+        Args:
+            user_id: User's _id
+            start: Inclusive start (datetime or date)
+            end: Inclusive end; a bare date covers the whole day
+            category: Only this category
+            after: (date, txn_key) of the last row of the previous page
+            limit: Page size (None: every remaining row)
+
+        Returns:
+            (DataFrame with TRANSACTION_COLUMNS, (date, txn_key) of the page's
+            last row if more rows follow, else None)
+        """
+        where, params = self._where(user_id, start, end, category)
+        if after is not None:
+            where += " AND (date < ? OR (date = ? AND txn_key < ?))"
+            params += [after[0], after[0], after[1]]
+        sql = (f"SELECT {', '.join(TRANSACTION_COLUMNS)}, txn_key FROM transactions WHERE {where} "
+               f"ORDER BY date DESC, txn_key DESC")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        df = pd.read_sql_query(sql, self._conn(), params=params)
+        next_key = None
+        if limit is not None and len(df) > limit:
+            df = df.iloc[:limit]
+            next_key = (df["date"].iloc[-1], df["txn_key"].iloc[-1])
+        df = df.drop(columns="txn_key")
+        df["date"] = pd.to_datetime(df["date"])
+        self.stats["queries"] += 1
+        return df, next_key
+
+    @staticmethod
+    def _where(user_id: str, start, end, category: Optional[str]) -> Tuple[str, List[Any]]:
+        where = "user_id = ?"
+        params: List[Any] = [user_id]
+        if start is not None:
+            where += " AND date >= ?"
+            params.append(start.strftime("%Y-%m-%dT%H:%M:%S") if isinstance(start, datetime) else start.isoformat())
+        if end is not None:
+            where += " AND date <= ?"
+            params.append(end.strftime("%Y-%m-%dT%H:%M:%S") if isinstance(end, datetime) else f"{end.isoformat()}T23:59:59")
+        if category:
+            where += " AND category = ?"
+            params.append(category)
+        return where, params
+
+    def covers(self, user_id: str, start: datetime) -> bool:
+        """True if synced history reaches back to start"""
+        row = self._conn().execute("SELECT window_start FROM sync_runs WHERE user_id = ?", (user_id,)).fetchone()
+        return bool(row) and datetime.fromisoformat(row[0]).date() <= (start.date() if isinstance(start, datetime) else start)
+
+    def get_transactions(self, user_id: str, start: datetime, end: Optional[datetime] = None,
+                         category: Optional[str] = None) -> pd.DataFrame:
+        """
+        Sync if needed, then query. History older than what has been synced is
+        back-filled once (the next sync widens the stored window).
+        """
+        self.refresh(user_id, start)
+        return self.query(user_id, start, end, category)
+
+    def refresh(self, user_id: str, start: datetime):
+        """Back-fill history back to start if it isn't stored yet, then sync"""
+        if not self.covers(user_id, start):
+            self._backfill(user_id, start)
+        self.sync(user_id)
+
+    def _backfill(self, user_id: str, start: datetime):
+        from .aa_client import get_aa_client
+        start_date = start.date() if isinstance(start, datetime) else start
+        with self._user_lock(user_id):
+            conn = self._conn()
+            row = conn.execute("SELECT window_start FROM sync_runs WHERE user_id = ?", (user_id,)).fetchone()
+            if row is None:
+                return  # first sync fetches the initial window
+            window_start = datetime.fromisoformat(row[0]).date()
+            if window_start <= start_date:
+                return
+            # Older history only: high-water marks are left to sync
+            for page in get_aa_client().iter_transactions(
+                user_id, from_date=start_date.isoformat(), to_date=window_start.isoformat(), fresh=True
+            ):
+                if page.get("transactions"):
+                    self._upsert(conn, user_id, page["transactions"])
+            with conn:
+                conn.execute("UPDATE sync_runs SET window_start = ? WHERE user_id = ?", (start_date.isoformat(), user_id))
+
+    def expire(self, user_id: Optional[str] = None) -> None:
+        """Make the next read sync again (all users if none given)"""
+        with self._conn() as conn:
+            if user_id:
+                conn.execute("UPDATE sync_runs SET synced_at = 0 WHERE user_id = ?", (user_id,))
+            else:
+                conn.execute("UPDATE sync_runs SET synced_at = 0")
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        users, rows = conn.execute("SELECT COUNT(DISTINCT user_id), COUNT(*) FROM transactions").fetchone()
+        return {**self.stats, "users": users, "rows": rows, "db_path": self.db_path}
+
+
+# Singleton instance
+_transaction_store_instance: Optional[TransactionStore] = None
+
+
+def get_transaction_store() -> TransactionStore:
+    """
+    Get or create the singleton transaction store
+
+    Returns:
+        TransactionStore instance
+    """
+    global _transaction_store_instance
+
+    if _transaction_store_instance is None:
+        _transaction_store_instance = TransactionStore()
+
+    return _transaction_store_instance
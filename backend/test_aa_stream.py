@@ -0,0 +1,101 @@
+"""
+Test script for the streamed AA transaction parser
+Verifies that the transactions and the envelope come out the same no matter
+where the chunk boundaries fall (inside strings, escapes, multi-byte UTF-8
+characters or numbers).
+"""
+import json
+import os
+import random
+import sys
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from services.aa_stream import TransactionStreamParser
+
+BODY = {
+    "success": True,
+    "meta": {"transactions": ["not", "this", "one"], "note": "brackets ] [ { } and \"quotes\" in a string"},
+    "data": {
+        "summary": {"count": 7},
+        "transactions": [
+            {"amount": 1250.5, "narrative": "UPI/₹ café payment", "category": "Food"},
+            {"amount": -42, "narrative": "escaped \\\" quote and \\\\ backslash", "tags": ["a", "b"]},
+            {"amount": 1e3, "narrative": "emoji 🍕 and é", "nested": {"transactions": [1, 2]}},
+            {"amount": 0.125, "narrative": "", "category": None},
+            {"amount": 99999, "narrative": "plain"},
+            {"amount": 7, "narrative": "]}"},
+            {"amount": 123456789, "narrative": "last"},
+        ],
+        "total": 123456789
+    },
+    "pagination": {"offset": 0, "limit": 7}
+}
+
+
+def _parse(chunks, batch_size=3):
+    parser = TransactionStreamParser(batch_size=batch_size)
+    batches = []
+    for chunk in chunks:
+        batches.extend(parser.feed(chunk))
+    last, envelope = parser.close()
+    if last:
+        batches.append(last)
+    return batches, envelope, parser.count
+
+
+def test_chunk_boundaries():
+    print("\n--- Testing chunk boundaries ---")
+    raw = json.dumps(BODY, ensure_ascii=False).encode("utf-8")
+    expected_envelope = json.loads(raw)
+    expected = expected_envelope["data"]["transactions"]
+    expected_envelope["data"]["transactions"] = []
+
+    splits = [[raw]] + [
+        [raw[i:i + size] for i in range(0, len(raw), size)] for size in range(1, 17)
+    ]
+    rng = random.Random(7)
+    for _ in range(50):
+        cuts = sorted(rng.sample(range(1, len(raw)), 12))
+        splits.append([raw[a:b] for a, b in zip([0] + cuts, cuts + [len(raw)])])
+
+    for chunks in splits:
+        batches, envelope, count = _parse(chunks)
+        items = [item for batch in batches for item in batch]
+        assert items == expected and count == len(expected), f"Wrong transactions with {len(chunks)} chunks"
+        assert [len(batch) for batch in batches] == [3, 3, 1], f"Batch sizes {[len(batch) for batch in batches]}"
+        assert envelope == expected_envelope, f"Wrong envelope with {len(chunks)} chunks: {envelope}"
+
+    print(f"   PASS: {len(splits)} different splits give identical results")
+
+
+def test_edge_bodies():
+    print("\n--- Testing bodies without data / truncated bodies ---")
+    error_body = {"success": False, "error": "User not found"}
+    batches, envelope, count = _parse([json.dumps(error_body).encode()])
+    assert not batches and envelope == error_body and count == 0, f"Error body parsed as {batches}, {envelope}"
+
+    batches, envelope, _ = _parse([b'{"data": {"transactions": []}, "total": 0}'])
+    assert not batches and envelope == {"data": {"transactions": []}, "total": 0}, \
+        f"Empty array parsed as {batches}, {envelope}"
+
+    raw = json.dumps(BODY).encode()
+    cut = raw.index(b'"plain"')
+    try:
+        _parse([raw[:cut]])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Truncated body was accepted")
+
+    print("   PASS: Envelope-only, empty and truncated bodies handled")
+
+
+if __name__ == "__main__":
+    print("Starting AA Stream Parser Tests...")
+
+    test_chunk_boundaries()
+    test_edge_bodies()
+
+    print("\nTests Completed.")
@@ -0,0 +1,83 @@
+"""
+Test script for the AA circuit breaker
+Verifies the closed -> open -> half-open -> closed/open transitions.
+"""
+import os
+import sys
+import time
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def _rejects(breaker: CircuitBreaker) -> bool:
+    try:
+        breaker.before_call()
+        return False
+    except CircuitOpenError:
+        return True
+
+
+def test_opens_after_threshold():
+    print("\n--- Testing closed -> open ---")
+    breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=60)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.record_success()   # a success resets the consecutive count
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED, f"Opened early ({breaker.snapshot()})"
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN, f"Not open after 3 failures ({breaker.snapshot()})"
+    assert _rejects(breaker)
+    snapshot = breaker.snapshot()
+    assert snapshot["opened"] == 1 and snapshot["rejected"] == 1, f"Unexpected snapshot {snapshot}"
+    assert "retry_in_seconds" in snapshot
+
+    print("   PASS: Opens on consecutive failures only, then fails fast")
+
+
+def test_half_open_probe():
+    print("\n--- Testing open -> half-open ---")
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN, f"Still {breaker.state} after the recovery timeout"
+
+    breaker.before_call()   # the probe
+    assert _rejects(breaker), "A second call got through while the probe was in flight"
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED, f"Successful probe left the breaker {breaker.state}"
+    assert not _rejects(breaker)
+
+    print("   PASS: One probe at a time; success closes the breaker")
+
+
+def test_failed_probe_reopens():
+    print("\n--- Testing half-open -> open ---")
+    breaker = CircuitBreaker("test", failure_threshold=5, recovery_timeout=0.05)
+    for _ in range(5):
+        breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_failure()   # one failed probe is enough, below the threshold
+    assert breaker.state == CircuitBreaker.OPEN, f"Failed probe left the breaker {breaker.state}"
+    assert _rejects(breaker)
+    assert breaker.snapshot()["opened"] == 2, f"Unexpected snapshot {breaker.snapshot()}"
+
+    print("   PASS: Failed probe reopens the breaker")
+
+
+if __name__ == "__main__":
+    print("Starting Circuit Breaker Tests...")
+
+    test_opens_after_threshold()
+    test_half_open_probe()
+    test_failed_probe_reopens()
+
+    print("\nTests Completed.")
@@ -0,0 +1,102 @@
+"""
+Test script for the notification stores
+Verifies read cursors, ring-buffer eviction and that concurrent readers never
+receive the same notification twice, for the in-memory and SQLite backends.
+"""
+import os
+import sys
+import tempfile
+import threading
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from agent.notification_store import InMemoryNotificationStore, SQLiteNotificationStore
+
+
+def _stores(max_per_user: int = 50):
+    tmp = tempfile.mkdtemp()
+    return [
+        ("memory", InMemoryNotificationStore(max_per_user=max_per_user)),
+        ("sqlite", SQLiteNotificationStore(os.path.join(tmp, "notifications.db"), max_per_user=max_per_user)),
+    ]
+
+
+def _contents(messages):
+    return [m["content"] for m in messages]
+
+
+def test_cursors():
+    print("\n--- Testing read cursors ---")
+    for name, store in _stores():
+        for n in range(3):
+            store.add("u1", "Topic", f"message {n}")
+        store.add("u2", "Topic", "other user")
+
+        peeked = store.get_unread("u1", mark_read=False)
+        first = store.get_unread("u1")
+        second = store.get_unread("u1")
+        store.add("u1", "Topic", "message 3")
+        third = store.get_unread("u1")
+        since = store.get_since("u1", first[0]["seq"])
+
+        assert len(peeked) == 3, f"{name}: peek returned {peeked}"
+        assert _contents(first) == ["message 0", "message 1", "message 2"], f"{name}: first read returned {first}"
+        assert not second and _contents(third) == ["message 3"], f"{name}: cursor didn't advance"
+        assert _contents(since) == ["message 1", "message 2", "message 3"], f"{name}: get_since returned {since}"
+        assert store.unread_count("u2") == 1, f"{name}: users share a cursor"
+
+        store.mark_read("u1", 1)   # never moves backwards
+        assert not store.get_unread("u1"), f"{name}: mark_read moved the cursor back"
+
+        print(f"   PASS ({name}): Cursors advance per user and never move back")
+
+
+def test_eviction():
+    print("\n--- Testing ring buffer eviction ---")
+    for name, store in _stores(max_per_user=5):
+        for n in range(12):
+            store.add("u1", "Topic", f"message {n}")
+        kept = _contents(store.get_unread("u1"))
+        assert kept == [f"message {n}" for n in range(7, 12)], f"{name}: kept {kept}"
+
+        print(f"   PASS ({name}): Only the newest 5 are kept")
+
+
+def test_concurrent_readers():
+    print("\n--- Testing concurrent readers ---")
+    for name, store in _stores(max_per_user=500):
+        received = []
+        lock = threading.Lock()
+
+        def reader():
+            for _ in range(50):
+                messages = store.get_unread("u1")
+                with lock:
+                    received.extend(m["seq"] for m in messages)
+
+        def writer():
+            for n in range(300):
+                store.add("u1", "Topic", f"message {n}")
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        received.extend(m["seq"] for m in store.get_unread("u1"))
+
+        assert len(received) == 300 and len(set(received)) == 300, \
+            f"{name}: {len(received)} deliveries, {len(set(received))} distinct"
+
+        print(f"   PASS ({name}): Every notification delivered exactly once")
+
+
+if __name__ == "__main__":
+    print("Starting Notification Store Tests...")
+
+    test_cursors()
+    test_eviction()
+    test_concurrent_readers()
+
+    print("\nTests Completed.")
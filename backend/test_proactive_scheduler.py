@@ -0,0 +1,68 @@
+"""
+Test script for the proactive scheduler triggers
+Verifies cron parsing, minute matching and that triggers fire once per slot.
+"""
+import os
+import sys
+from datetime import datetime
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from agent.proactive_scheduler import CronTrigger, IntervalTrigger
+
+
+def test_cron_parsing():
+    print("\n--- Testing CronTrigger parsing ---")
+    minute, hour, dom, month, dow = CronTrigger("*/15 9-17 1,15 * 1-5")._allowed
+    assert minute == {0, 15, 30, 45}
+    assert hour == set(range(9, 18))
+    assert dom == {1, 15}
+    assert month == set(range(1, 13))
+    assert dow == {1, 2, 3, 4, 5}
+
+    for bad in ["* * * *", "60 * * * *", "* 24 * * *", "0 0 0 * *", "*/0 * * * *", "0 0 * * 7"]:
+        try:
+            CronTrigger(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} was accepted")
+
+    print("   PASS: Fields parsed, invalid expressions rejected")
+
+
+def test_cron_matching():
+    print("\n--- Testing CronTrigger matching ---")
+    weekly = CronTrigger("0 18 * * 0")   # Sundays 18:00
+    sunday = datetime(2026, 10, 18, 18, 0)
+    assert weekly.matches(sunday)
+    assert not weekly.matches(sunday.replace(minute=1))
+    assert not weekly.matches(datetime(2026, 10, 19, 18, 0))   # Monday
+    assert CronTrigger("30 9 * * 1").matches(datetime(2026, 10, 19, 9, 30))
+
+    print("   PASS: Day-of-week 0 is Sunday, minutes match exactly")
+
+
+def test_trigger_firing():
+    print("\n--- Testing trigger firing ---")
+    daily = CronTrigger("0 9 * * *")
+    nine = datetime(2026, 10, 19, 9, 0).timestamp()
+    fired = [daily.is_due(nine + offset) for offset in (-60, 0, 20, 59, 60)]
+    assert fired == [False, True, False, False, False], f"Cron fired {fired}"
+    assert daily.is_due(nine + 24 * 3600), "Cron didn't fire the next day"
+
+    interval = IntervalTrigger(10)
+    fired = [interval.is_due(t) for t in (0, 5, 10, 11, 45, 49, 50)]
+    assert fired == [False, False, True, False, True, False, True], f"Interval fired {fired}"
+
+    print("   PASS: Once per matching minute; missed intervals don't burst")
+
+
+if __name__ == "__main__":
+    print("Starting Proactive Scheduler Tests...")
+
+    test_cron_parsing()
+    test_cron_matching()
+    test_trigger_firing()
+
+    print("\nTests Completed.")
@@ -0,0 +1,115 @@
+"""
+Test script for AA request coalescing
+Verifies that identical concurrent calls share one execution (threads and
+coroutines), including its exception, and that distinct keys don't.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add current directory to path
+sys.path.append(os.getcwd())
+
+from services.singleflight import SingleFlight
+
+
+def test_threads_coalesce():
+    print("\n--- Testing thread coalescing ---")
+    flight = SingleFlight()
+    executions = []
+    release = threading.Event()
+
+    def fetch():
+        executions.append(1)
+        release.wait(2)
+        return {"rows": 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(executions) == 1, f"{len(executions)} executions"
+    assert results == [{"rows": 42}] * 8, f"Results {results}"
+    stats = flight.get_stats()
+    assert stats["executed"] == 1 and stats["deduplicated"] == 7 and stats["in_flight"] == 0, \
+        f"Unexpected stats {stats}"
+
+    # Once finished, the next call runs again
+    flight.do("key", fetch)
+    assert len(executions) == 2, "Result was cached after the call finished"
+
+    print("   PASS: 8 concurrent callers, 1 execution")
+
+
+def test_errors_and_keys():
+    print("\n--- Testing shared errors and distinct keys ---")
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(2)
+        raise RuntimeError("backend down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("bad", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    threads.append(threading.Thread(target=lambda: flight.do("other", lambda: None)))
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["backend down"] * 4, f"Errors {errors}"
+    assert flight.get_stats()["executed"] == 2, f"Unexpected stats {flight.get_stats()}"
+
+    print("   PASS: Followers receive the leader's exception; other keys run separately")
+
+
+def test_async_coalesce():
+    print("\n--- Testing coroutine coalescing ---")
+    flight = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return "payload"
+
+    async def main():
+        callers = [asyncio.create_task(flight.do_async("key", fetch)) for _ in range(5)]
+        # A cancelled follower must not cancel the shared call
+        await asyncio.sleep(0.01)
+        callers[-1].cancel()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(executions) == 1, f"{len(executions)} executions"
+    assert results[:4] == ["payload"] * 4, f"Results {results}"
+    assert isinstance(results[4], asyncio.CancelledError), f"Cancelled follower got {results[4]!r}"
+
+    print("   PASS: 5 concurrent coroutines, 1 execution")
+
+
+if __name__ == "__main__":
+    print("Starting SingleFlight Tests...")
+
+    test_threads_coalesce()
+    test_errors_and_keys()
+    test_async_coalesce()
+
+    print("\nTests Completed.")